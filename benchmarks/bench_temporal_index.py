@@ -0,0 +1,64 @@
+# benchmarks/bench_temporal_index.py
+"""Benchmark: alive-particle queries with and without the TemporalIndex.
+
+Builds a long clip of staggered short fountain bursts (the generator's
+default ``birth_end=0.5`` emitter, repeated every ``spacing`` seconds) and
+times single-time evaluation via a full scan versus the index.
+
+Run with ``PYTHONPATH=src python benchmarks/bench_temporal_index.py``.
+"""
+
+import time
+
+import numpy as np
+
+from sim.particles import FountainSimulator, evaluate_births
+
+
+def build_clip(num_emitters: int, particles_per_emitter: int, spacing: float) -> FountainSimulator:
+    """Create a simulator with staggered fountain bursts."""
+    sim = FountainSimulator(gravity=9.81, water_level=0.0)
+    for k in range(num_emitters):
+        sim.add_conical_fountain(
+            num_particles=particles_per_emitter,
+            apex_x=0.0, apex_y=1.5, apex_z=14.0,
+            cone_height=2.0, cone_angle_rad=np.radians(30.0), base_radius=1.75,
+            speed_min=3.0, speed_max=8.0,
+            birth_start=k * spacing, birth_end=k * spacing + 0.5,
+            size_min=0.01, size_max=0.03,
+            seed_offset=k * particles_per_emitter,
+        )
+    return sim
+
+
+def time_queries(sim: FountainSimulator, times: np.ndarray, use_index: bool) -> float:
+    """Return mean seconds per single-time evaluation."""
+    index = sim.index if use_index else None
+    start = time.perf_counter()
+    for t in times:
+        evaluate_births(sim.births, float(t), sim.gravity, sim.water_level, index)
+    return (time.perf_counter() - start) / len(times)
+
+
+def main() -> None:
+    """Print query cost for growing clip lengths at constant alive density."""
+    print(f"{'emitters':>8} {'births':>10} {'alive':>8} {'build ms':>9} {'scan ms':>9} {'index ms':>9} {'speedup':>8}")
+    for num_emitters in (10, 50, 200, 800):
+        sim = build_clip(num_emitters, particles_per_emitter=5_000, spacing=2.0)
+        start = time.perf_counter()
+        _ = sim.index
+        build = time.perf_counter() - start
+
+        clip_end = num_emitters * 2.0
+        times = np.linspace(0.0, clip_end, 50)
+        alive = np.mean([sim.index.alive_count(float(t)) for t in times])
+        scan = time_queries(sim, times, use_index=False)
+        indexed = time_queries(sim, times, use_index=True)
+        print(
+            f"{num_emitters:>8} {len(sim.births):>10} {alive:>8.0f} {build * 1e3:>9.1f} "
+            f"{scan * 1e3:>9.2f} {indexed * 1e3:>9.2f} {scan / indexed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
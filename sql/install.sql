@@ -66,6 +66,11 @@ CREATE TABLE IF NOT EXISTS `render_jobs` (
   `gravity` float NOT NULL DEFAULT 9.81 COMMENT 'Gravity (m/s²)',
   `water_level` float NOT NULL DEFAULT 0.0 COMMENT 'Collision plane Y coordinate',
   `preset_id` int(11) DEFAULT NULL COMMENT 'Texture preset for all particles in this job',
+  `generation_mode` enum('stored','procedural') NOT NULL DEFAULT 'stored' COMMENT 'stored: particle_births rows; procedural: job_emitters definitions',
+  `lod_mode` enum('off','drop','merge') NOT NULL DEFAULT 'off' COMMENT 'Screen-space LOD for sub-pixel particles',
+  `lod_min_pixels` float NOT NULL DEFAULT 0.5 COMMENT 'Projected radius (pixels) below which LOD applies',
+  `births_validation` enum('unchecked','valid','invalid') NOT NULL DEFAULT 'unchecked' COMMENT 'Birth-level validation verdict; valid jobs skip per-frame validation',
+  `births_count` int(10) unsigned DEFAULT NULL COMMENT 'Births of the job once completely written; NULL while they are written',
   `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
   `status` enum('pending','in progress','completed','error') DEFAULT 'pending',
   PRIMARY KEY (`job_id`),
@@ -108,11 +113,29 @@ CREATE TABLE IF NOT EXISTS `particle_births` (
   `impact_time` float DEFAULT NULL,
   PRIMARY KEY (`birth_id`),
   UNIQUE KEY `job_particle` (`job_id`,`particle_id`),
+  KEY `job_alive` (`job_id`,`birth_time`,`impact_time`) COMMENT 'Alive-window filter of get_particles_at_time',
   KEY `texture_id` (`texture_id`),
   CONSTRAINT `pb_job_fk` FOREIGN KEY (`job_id`) REFERENCES `render_jobs` (`job_id`) ON DELETE CASCADE,
   CONSTRAINT `pb_texture_fk` FOREIGN KEY (`texture_id`) REFERENCES `textures` (`texture_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
+-- --------------------------------------------------------
+-- Table: job_emitters (procedural jobs: births regenerated on demand)
+-- --------------------------------------------------------
+CREATE TABLE IF NOT EXISTS `job_emitters` (
+  `job_id` int(11) NOT NULL,
+  `emitter_index` int(11) NOT NULL,
+  `emitter_type` varchar(64) NOT NULL DEFAULT 'conical_fountain',
+  `first_particle_id` int(11) NOT NULL,
+  `num_particles` int(11) NOT NULL,
+  `gravity` double NOT NULL COMMENT 'Exact value used at generation (impact times depend on it)',
+  `water_level` double NOT NULL COMMENT 'Exact value used at generation',
+  `params` longtext NOT NULL COMMENT 'JSON emitter definition',
+  `checksum` char(64) NOT NULL COMMENT 'SHA-256 of the generated births',
+  PRIMARY KEY (`job_id`, `emitter_index`),
+  CONSTRAINT `je_job_fk` FOREIGN KEY (`job_id`) REFERENCES `render_jobs` (`job_id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
 -- --------------------------------------------------------
 -- Table: simulation_metrics
 -- --------------------------------------------------------
@@ -1,8 +1,9 @@
 # src/generator.py
 """Particle generation entry point.
 
-Creates a fountain simulation, stores birth records in the database,
-ensures texture presets exist, and optionally runs validation.
+Creates a fountain simulation, stores birth records (or, for procedural
+jobs, only the emitter definition) in the database, ensures texture
+presets exist, and optionally runs validation.
 """
 
 import asyncio
@@ -12,9 +13,14 @@ import numpy as np
 from DBCore import create_database_provider
 from dotenv import load_dotenv
 
-from sim.particles import FountainSimulator
+from sim.anomaly import detect_anomalies
+from sim.metrics import MetricsAccumulator, accumulate_frames
+from sim.parallel import MIN_SHARD_SIZE, add_emitter_parallel, default_workers, iter_emitter_parallel
+from sim.particles import BirthsChecksum, ConicalFountain, FountainSimulator, ParticleBirthArray, evaluate_births_at_times
+from sim.temporal import TemporalIndex
+from sim.timeline import Timeline, compute_timeline, frame_times
 from sim.validator import PhysicsValidator
-from storage.cluster import ClusterManager
+from storage.cluster import ClusterManager, metrics_rows
 
 
 class SimpleConfig:
@@ -31,6 +37,62 @@ class SimpleConfig:
         self.db_database = kwargs.get("db_database")
 
 
+def _validate_chunk(
+    validator: PhysicsValidator,
+    chunk: ParticleBirthArray,
+    sample_frames: range,
+    fps: int,
+    gravity: float,
+    water_level: float,
+) -> tuple[set[int], set[int]]:
+    """Validate one chunk of births at the sampled frames.
+
+    A frame is valid when every chunk is valid at that frame, so callers
+    union the results over all chunks.
+
+    Returns:
+        (frames_with_particles, failed_frames)
+    """
+    seen, failed = set(), set()
+    times = [frame / fps for frame in sample_frames]
+    for state in evaluate_births_at_times(chunk, times, gravity, water_level):
+        if not len(state):
+            continue
+        frame = round(state.time * fps)
+        seen.add(frame)
+        valid, errors = validator.validate_columns(state.position, state.velocity, state.size, state.particle_id)
+        if not valid:
+            failed.add(frame)
+            print(f"  Frame {frame}: validation failed.")
+            for err in errors:
+                print(f"    Particle {err['particle_id']}: {err['errors']}")
+    return seen, failed
+
+
+def _report_birth_errors(errors: list[dict], limit: int = 10) -> None:
+    """Print the first birth validation errors."""
+    for err in errors[:limit]:
+        print(f"    Particle {err['particle_id']}: {err['errors']}")
+    if len(errors) > limit:
+        print(f"    ... and {len(errors) - limit} more invalid births.")
+
+
+async def _record_births_validation(cluster: ClusterManager, job_id: int, invalid_births: int) -> None:
+    """Store the job's birth validation verdict (render skips per-frame checks for valid jobs)."""
+    verdict = "invalid" if invalid_births else "valid"
+    await cluster.set_births_validation(job_id, verdict)
+    print(f"Validated births: {invalid_births} invalid, job marked '{verdict}'.")
+
+
+def _report_anomalies(metrics: list[dict]) -> None:
+    """Print the frames the rolling anomaly detectors flag in a metrics series."""
+    for name, result in detect_anomalies(metrics).items():
+        if len(result):
+            frames = ", ".join(str(i + 1) for i in result.indices[:10].tolist())
+            more = f" (+{len(result) - 10} more)" if len(result) > 10 else ""
+            print(f"  {name}: {len(result)} flagged frame(s): {frames}{more}")
+
+
 async def main() -> None:
     """Generate particles and store in database."""
     load_dotenv()
@@ -49,7 +111,10 @@ async def main() -> None:
     db = create_database_provider(config)
     await db.initialize()
 
-    cluster = ClusterManager(db)
+    # Precision of particle positions, velocities and sizes held in memory;
+    # float32 matches the FLOAT columns births are stored in.
+    precision = os.getenv("PRECISION", "float64").lower()
+    cluster = ClusterManager(db, precision=precision)
 
     # Simulation parameters from environment or defaults
     num_particles = int(os.getenv("NUM_PARTICLES", 10000))
@@ -95,9 +160,34 @@ async def main() -> None:
     # Job name
     job_name = f"Fountain_{num_particles}p_{num_frames}f_{fps}fps"
 
+    # Jobs larger than one chunk are generated, validated and inserted chunk by
+    # chunk so memory stays bounded regardless of particle count.
+    chunk_size = int(os.getenv("CHUNK_SIZE", 1_000_000))
+    streaming = num_particles > chunk_size
+    run_validation = os.getenv("RUN_VALIDATION", "true").lower() in ("true", "1", "yes")
+    sample_interval = max(1, num_frames // 20)
+    sample_frames = range(1, num_frames+1, sample_interval)
+    store_timeline = os.getenv("STORE_TIMELINE", "true").lower() in ("true", "1", "yes")
+    # Full metrics evaluate every frame; they include the timeline columns.
+    store_metrics = os.getenv("STORE_METRICS", "false").lower() in ("true", "1", "yes")
+    store_timeline = store_timeline and not store_metrics
+
+    # Procedural jobs store only the emitter definition; render nodes
+    # regenerate the births and verify them against the checksum.
+    generation_mode = os.getenv("GENERATION_MODE", "stored").lower()
+    procedural = generation_mode == "procedural"
+    chunked = streaming or procedural
+
+    # Seeds are sharded across processes when the job is large enough to pay
+    # for the pool; output is identical to serial generation.
+    workers = int(os.getenv("GEN_WORKERS", 0)) or default_workers()
+    parallel = workers > 1 and num_particles >= 2 * MIN_SHARD_SIZE
+
     # Create simulator and generate particles
-    sim = FountainSimulator(gravity=gravity, water_level=water_level)
-    sim.add_conical_fountain(
+    # Procedural checksums cover float64 births, so those jobs are generated
+    # in float64 and render nodes convert after verifying.
+    sim = FountainSimulator(gravity=gravity, water_level=water_level, precision="float64" if procedural else precision)
+    emitter = ConicalFountain(
         num_particles=num_particles,
         apex_x=apex_x, apex_y=apex_y, apex_z=apex_z,
         cone_height=cone_height,
@@ -112,7 +202,14 @@ async def main() -> None:
         texture=texture_name,
         seed_offset=seed_offset,
     )
-    print(f"Generated {len(sim.particles)} particles.")
+    if chunked:
+        print(f"Streaming {num_particles} particles in chunks of {chunk_size}.")
+    elif parallel:
+        add_emitter_parallel(sim, emitter, workers)
+        print(f"Generated {len(sim.particles)} particles on {workers} workers.")
+    else:
+        sim.add_emitter(emitter)
+        print(f"Generated {len(sim.particles)} particles.")
 
     # Create job with preset_id
     width = int(os.getenv("RENDER_WIDTH", 1920))
@@ -129,38 +226,106 @@ async def main() -> None:
         gravity=gravity,
         water_level=water_level,
         preset_id=preset_id,
+        generation_mode=generation_mode,
+        lod_mode=os.getenv("LOD_MODE", "off").lower(),
+        lod_min_pixels=float(os.getenv("LOD_MIN_PIXELS", 0.5)),
     )
-    print(f"Job created with ID {job_id}")
+    print(f"Job created with ID {job_id} ({generation_mode})")
+
+    validator = PhysicsValidator()
+    if chunked:
+        # Insert (or hash) and validate each chunk while it is in memory
+        done = 0
+        checksum = BirthsChecksum()
+        times = frame_times(num_frames, fps)
+        timeline = Timeline.zeros(times)
+        accumulators = [MetricsAccumulator(gravity) for _ in times] if store_metrics else []
+        seen_frames: set[int] = set()
+        failed_frames: set[int] = set()
+        invalid_births = 0
+        if parallel:
+            chunks = iter_emitter_parallel(sim, emitter, chunk_size, workers)
+        else:
+            chunks = sim.iter_emitter(emitter, chunk_size)
+        for chunk in chunks:
+            if procedural:
+                checksum.update(chunk)
+            else:
+                await cluster.insert_particle_births(job_id, chunk)
+            done += len(chunk)
+            if store_timeline:
+                timeline += compute_timeline(chunk, times, gravity)
+            if store_metrics:
+                accumulate_frames(accumulators, chunk, times, gravity, water_level, index=TemporalIndex.from_births(chunk))
+            if run_validation:
+                _, errors = validator.validate_births(chunk, gravity, water_level)
+                invalid_births += len(errors)
+                _report_birth_errors(errors)
+                seen, failed = _validate_chunk(validator, chunk, sample_frames, fps, gravity, water_level)
+                seen_frames |= seen
+                failed_frames |= failed
+            print(f"  {'Generated' if procedural else 'Inserted'} {done}/{num_particles} birth records.")
+        if procedural:
+            await cluster.insert_job_emitter(job_id, 0, emitter, 0, gravity, water_level, checksum.hexdigest())
+            print(f"Stored emitter definition (checksum {checksum.hexdigest()[:16]}).")
+        await cluster.complete_births(job_id)
+        if store_timeline:
+            metrics = timeline.to_metrics()
+            await cluster.upsert_simulation_metrics(job_id, metrics)
+            print(f"Stored analytic timeline for {num_frames} frames.")
+            _report_anomalies(metrics)
+        if store_metrics:
+            metrics = metrics_rows(times, accumulators)
+            await cluster.upsert_simulation_metrics(job_id, metrics)
+            print(f"Stored metrics for {num_frames} frames.")
+            _report_anomalies(metrics)
+        if run_validation:
+            await _record_births_validation(cluster, job_id, invalid_births)
+            valid_count = len(seen_frames - failed_frames)
+            print(f"Validated {len(sample_frames)} frames, {valid_count} passed.")
+    else:
+        # Insert particle births
+        await cluster.insert_particle_births(job_id, sim.births)
+        await cluster.complete_births(job_id)
+        print(f"Inserted {len(sim.births)} birth records.")
 
-    # Insert frames
+        # Per-frame alive count and energy curves, without evaluating frames
+        if store_timeline:
+            timeline = await cluster.store_job_timeline(job_id, sim.births)
+            print(f"Stored analytic timeline for {num_frames} frames.")
+            _report_anomalies(timeline.to_metrics())
+        if store_metrics:
+            metrics = await cluster.store_job_metrics(job_id, sim.births)
+            print(f"Stored metrics for {num_frames} frames.")
+            _report_anomalies(metrics)
+
+        # Optional validation
+        if run_validation:
+            _, errors = validator.validate_births(sim.births, gravity, water_level)
+            _report_birth_errors(errors)
+            await _record_births_validation(cluster, job_id, len(errors))
+
+            print("Running validation on sampled frames...")
+            valid_count = 0
+            sample_times = [frame / fps for frame in sample_frames]
+            async for state in cluster.iter_frame_states(job_id, sample_times):
+                if not len(state):
+                    continue
+                frame = round(state.time * fps)
+                valid, errors = validator.validate_columns(state.position, state.velocity, state.size, state.particle_id)
+                if valid:
+                    valid_count += 1
+                else:
+                    print(f"  Frame {frame}: validation failed.")
+                    for err in errors:
+                        print(f"    Particle {err['particle_id']}: {err['errors']}")
+            print(f"Validated {len(sample_frames)} frames, {valid_count} passed.")
+
+    # Frames are inserted last: render nodes pick up pending frames, and
+    # only then may they load (and keep) the job's births.
     await cluster.insert_frames(job_id, num_frames)
     print(f"Inserted {num_frames} frames.")
 
-    # Insert particle births
-    await cluster.insert_particle_births(job_id, sim.particles)
-    print(f"Inserted {len(sim.particles)} birth records.")
-
-    # Optional validation
-    if os.getenv("RUN_VALIDATION", "true").lower() in ("true", "1", "yes"):
-        print("Running validation on sampled frames...")
-        validator = PhysicsValidator()
-        sample_interval = max(1, num_frames // 20)
-        sample_frames = range(1, num_frames+1, sample_interval)
-        valid_count = 0
-        for frame in sample_frames:
-            t = frame / fps
-            particles = await cluster.get_particles_at_time(job_id, t)
-            if not particles:
-                continue
-            valid, errors = validator.validate_frame(particles)
-            if valid:
-                valid_count += 1
-            else:
-                print(f"  Frame {frame}: validation failed.")
-                for err in errors:
-                    print(f"    Particle {err['particle_id']}: {err['errors']}")
-        print(f"Validated {len(sample_frames)} frames, {valid_count} passed.")
-
     # Mark job as ready for rendering
     await cluster.update_job_status(job_id, "pending")
     print(f"Job {job_id} is ready for rendering.")
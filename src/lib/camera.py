@@ -0,0 +1,91 @@
+# src/lib/camera.py
+"""Camera frustum culling for particle frames.
+
+Particles outside the camera's view volume still cost POV-Ray parse and
+bounding time. The frustum is tested on whole frames at once so culling can
+run in the particle query path, before any scene objects are built.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from sim.particles import FrameState
+
+# POV-Ray's default perspective camera: right <4/3, 0, 0>, up <0, 1, 0>,
+# direction <0, 0, 1>, i.e. a horizontal angle of 2 * atan(2/3).
+POV_DEFAULT_ANGLE = math.degrees(2.0 * math.atan(2.0 / 3.0))
+POV_DEFAULT_ASPECT = 4.0 / 3.0
+
+
+@dataclass(frozen=True)
+class CameraFrustum:
+    """Perspective view volume of a look_at camera.
+
+    angle is the full horizontal field of view in degrees (POV-Ray's camera
+    ``angle``); aspect is width / height of the image plane (the length of
+    POV-Ray's ``right`` vector).
+    """
+
+    location: tuple[float, float, float]
+    look_at: tuple[float, float, float]
+    angle: float = POV_DEFAULT_ANGLE
+    aspect: float = POV_DEFAULT_ASPECT
+    sky: tuple[float, float, float] = (0.0, 1.0, 0.0)
+
+    def basis(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Unit (right, up, forward) vectors of the camera."""
+        forward = np.asarray(self.look_at, dtype=np.float64) - np.asarray(self.location, dtype=np.float64)
+        norm = np.linalg.norm(forward)
+        if norm == 0:
+            raise ValueError("Camera location and look_at must differ")
+        forward /= norm
+        right = np.cross(np.asarray(self.sky, dtype=np.float64), forward)
+        norm = np.linalg.norm(right)
+        if norm == 0:
+            raise ValueError("Camera looks along the sky vector")
+        right /= norm
+        up = np.cross(forward, right)
+        return right, up, forward
+
+    def visible(self, position: np.ndarray, radius: np.ndarray) -> np.ndarray:
+        """Boolean mask of spheres (centres (n, 3), radii (n,)) that touch the frustum.
+
+        The test is conservative: a sphere is kept unless it lies entirely
+        behind the camera or entirely outside one of the four side planes.
+        """
+        right, up, forward = self.basis()
+        d = position - np.asarray(self.location, dtype=np.float64)
+        x, y, z = d @ right, d @ up, d @ forward
+
+        tan_h = math.tan(math.radians(self.angle) / 2.0)
+        tan_v = tan_h / self.aspect
+        # Distance to a side plane through the apex is (|x| - z tan) / sqrt(1 + tan^2)
+        return (
+            (z > -radius)
+            & (np.abs(x) <= z * tan_h + radius * math.sqrt(1.0 + tan_h * tan_h))
+            & (np.abs(y) <= z * tan_v + radius * math.sqrt(1.0 + tan_v * tan_v))
+        )
+
+
+@dataclass
+class CullStats:
+    """Particles kept and culled for one frame."""
+
+    kept: int = 0
+    culled: int = 0
+
+    @property
+    def total(self) -> int:
+        """Particles tested."""
+        return self.kept + self.culled
+
+
+def cull_frame(state: FrameState, frustum: CameraFrustum) -> tuple[FrameState, CullStats]:
+    """Drop particles outside the frustum; returns the visible state and counters."""
+    if not len(state):
+        return state, CullStats()
+    mask = frustum.visible(state.position, state.size)
+    kept = int(np.count_nonzero(mask))
+    return state.take(mask), CullStats(kept=kept, culled=len(state) - kept)
@@ -0,0 +1,172 @@
+# src/lib/lod.py
+"""Screen-space level of detail for particle frames.
+
+Distant particles can project to a fraction of a pixel, yet each still costs
+a full sphere in the .pov file. This stage sits between
+ClusterManager.get_particles_at_time and build_scene: it computes the
+projected radius of every particle and either drops the sub-pixel ones or
+merges them, per screen cell and depth slice, into fewer larger spheres.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from lib.camera import CameraFrustum
+
+LOD_MODES = ("off", "drop", "merge")
+
+# Merged particles share a screen cell of this many pixels and a depth slice
+# of this relative thickness.
+DEFAULT_CELL_PIXELS = 2.0
+_DEPTH_SLICE = math.log1p(0.1)
+
+
+@dataclass
+class LodStats:
+    """How much a frame shrank under LOD."""
+
+    spheres_in: int = 0
+    spheres_out: int = 0
+    dropped: int = 0
+    merged: int = 0     # sub-pixel particles absorbed into clusters
+    clusters: int = 0   # spheres those clusters became
+
+    @property
+    def saved_fraction(self) -> float:
+        """Fraction of spheres (and so of the particle part of the scene) removed."""
+        return 1.0 - self.spheres_out / self.spheres_in if self.spheres_in else 0.0
+
+
+def projected_radius(
+    position: np.ndarray,
+    size: np.ndarray,
+    camera: CameraFrustum,
+    image_width: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return (radius in pixels, screen coordinates (n, 2) in pixels) per particle.
+
+    Particles at or behind the camera plane get an infinite radius so they are
+    never treated as sub-pixel.
+    """
+    right, up, forward = camera.basis()
+    d = position - np.asarray(camera.location, dtype=np.float64)
+    x, y, z = d @ right, d @ up, d @ forward
+    focal = (image_width / 2.0) / math.tan(math.radians(camera.angle) / 2.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(z > 0, focal / z, np.inf)
+        radius = np.where(z > 0, size * scale, np.inf)
+        screen = np.column_stack([x * scale, y * scale])
+    return radius, screen
+
+
+def _merge_groups(
+    screen: np.ndarray,
+    depth: np.ndarray,
+    texture_code: np.ndarray,
+    cell_pixels: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Group particles by texture, screen cell and depth slice.
+
+    Returns (group index per particle, member count per group).
+    """
+    keys = np.column_stack([
+        texture_code,
+        np.floor(screen / cell_pixels).astype(np.int64),
+        np.floor(np.log(depth) / _DEPTH_SLICE).astype(np.int64),
+    ])
+    _, inverse, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    return inverse.ravel(), counts
+
+
+def apply_lod(
+    particles: list[dict[str, Any]],
+    camera: CameraFrustum,
+    image_width: int,
+    min_pixels: float,
+    mode: str = "drop",
+    cell_pixels: float = DEFAULT_CELL_PIXELS,
+) -> tuple[list[dict[str, Any]], LodStats]:
+    """Drop or merge particles whose projected radius is below min_pixels.
+
+    In "merge" mode sub-pixel particles that share a texture, a screen cell of
+    cell_pixels and a depth slice become one sphere at their area-weighted
+    centre, with the combined projected area (radius sqrt(sum r^2)). Lone
+    sub-pixel particles are kept as they are.
+
+    Returns:
+        (particles, stats)
+    """
+    if mode not in LOD_MODES:
+        raise ValueError(f"Unknown LOD mode '{mode}'")
+    stats = LodStats(spheres_in=len(particles), spheres_out=len(particles))
+    if mode == "off" or not particles:
+        return particles, stats
+
+    position = np.array([[p["position_x"], p["position_y"], p["position_z"]] for p in particles], dtype=np.float64)
+    size = np.array([p["size"] for p in particles], dtype=np.float64)
+    radius, screen = projected_radius(position, size, camera, image_width)
+    small = radius < min_pixels
+
+    if mode == "drop":
+        kept = [p for p, s in zip(particles, small.tolist(), strict=True) if not s]
+        stats.dropped = len(particles) - len(kept)
+        stats.spheres_out = len(kept)
+        return kept, stats
+
+    small_idx = np.flatnonzero(small)
+    if not len(small_idx):
+        return particles, stats
+    texture_key = "texture_name" if "texture_name" in particles[0] else "texture"
+    names: dict[str, int] = {}
+    codes = np.array([names.setdefault(particles[i][texture_key], len(names)) for i in small_idx.tolist()])
+    velocity = np.array(
+        [[particles[i]["velocity_x"], particles[i]["velocity_y"], particles[i]["velocity_z"]] for i in small_idx.tolist()],
+        dtype=np.float64,
+    )
+    depth = (position[small_idx] - np.asarray(camera.location, dtype=np.float64)) @ camera.basis()[2]
+    group, counts = _merge_groups(screen[small_idx], depth, codes, cell_pixels)
+
+    # Lone particles stay untouched; only real clusters are merged.
+    lone = counts[group] == 1
+    keep = ~small
+    keep[small_idx[lone]] = True
+    out = [p for p, k in zip(particles, keep.tolist(), strict=True) if k]
+
+    members = ~lone
+    g = group[members]
+    num_groups = len(counts)
+    area = size[small_idx][members] ** 2
+    weight = np.bincount(g, weights=area, minlength=num_groups)
+    centre = np.column_stack([
+        np.bincount(g, weights=area * position[small_idx][members][:, k], minlength=num_groups) for k in range(3)
+    ])
+    mean_velocity = np.column_stack([
+        np.bincount(g, weights=area * velocity[members][:, k], minlength=num_groups) for k in range(3)
+    ])
+    first_id = np.full(num_groups, np.iinfo(np.int64).max)
+    ids = np.array([particles[i]["particle_id"] for i in small_idx[members].tolist()], dtype=np.int64)
+    np.minimum.at(first_id, g, ids)
+    first_member = np.full(num_groups, len(particles))
+    np.minimum.at(first_member, g, small_idx[members])
+
+    for k in np.flatnonzero(counts > 1).tolist():
+        w = weight[k]
+        cx, cy, cz = (centre[k] / w).tolist()
+        vx, vy, vz = (mean_velocity[k] / w).tolist()
+        out.append({
+            "particle_id": int(first_id[k]),
+            "position_x": cx, "position_y": cy, "position_z": cz,
+            "velocity_x": vx, "velocity_y": vy, "velocity_z": vz,
+            "size": math.sqrt(w),
+            texture_key: particles[int(first_member[k])][texture_key],
+            "status": "alive",
+            "merged_count": int(counts[k]),
+        })
+
+    stats.merged = int(np.count_nonzero(members))
+    stats.clusters = int(np.count_nonzero(counts > 1))
+    stats.spheres_out = len(out)
+    return out, stats
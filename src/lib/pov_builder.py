@@ -1,7 +1,12 @@
 # src/lib/pov_builder.py
 """Build POV-Ray scenes using Vapory objects and output .pov files for the cluster."""
 
-from vapory import Background, Camera, Finish, LightSource, Pigment, Scene, Sphere, Texture
+from vapory import Background, Camera, Finish, LightSource, Pigment, Scene, Sphere, SphereSweep, Texture
+
+# How particles with a sub-frame "trail" are drawn: as plain spheres at the
+# frame position, as one sphere_sweep along the trail, or as one translucent
+# ghost sphere per sub-frame sample.
+MOTION_BLUR_MODES = ("off", "sweep", "ghost")
 
 
 def build_texture(preset: dict) -> Texture:
@@ -30,6 +35,35 @@ def build_particle_sphere(particle: dict, preset: dict) -> Sphere:
     return Sphere([x, y, z], size, texture)
 
 
+def build_particle_trail(particle: dict, preset: dict) -> SphereSweep | Sphere:
+    """Build a linear sphere_sweep through the particle's sub-frame trail.
+
+    Repeated consecutive points (samples clamped to the birth) are dropped;
+    a trail that collapses to a single point becomes a plain sphere.
+    """
+    points = [p for i, p in enumerate(particle["trail"]) if i == 0 or p != particle["trail"][i - 1]]
+    if len(points) < 2:
+        return build_particle_sphere(particle, preset)
+    size = particle["size"]
+    # Explicit commas: without them POV-Ray can read "radius <next centre" as a comparison.
+    args = ['linear_spline', len(points)]
+    for point in points:
+        args += [',', point, ',', size]
+    return SphereSweep(*args, build_texture(preset))
+
+
+def build_particle_ghosts(particle: dict, preset: dict) -> list[Sphere]:
+    """Build one translucent sphere per sub-frame sample of the particle's trail.
+
+    Each ghost carries 1/k of the preset's opacity, so the exposure a trail
+    of k samples leaves in the image matches one sphere at the same place.
+    """
+    trail = particle["trail"]
+    opacity = (1.0 - preset.get("pigment_t", 0.0)) / len(trail)
+    texture = build_texture({**preset, "pigment_t": 1.0 - opacity})
+    return [Sphere(point, particle["size"], texture) for point in trail]
+
+
 def build_scene(
     particles: list,
     preset: dict,
@@ -37,8 +71,21 @@ def build_scene(
     look_at: list | None = None,
     light_pos: list | None = None,
     background_color: list | None = None,
+    camera_angle: float | None = None,
+    aspect_ratio: float | None = None,
+    motion_blur: str = "off",
 ) -> Scene:
-    """Build a complete POV-Ray scene with particles."""
+    """Build a complete POV-Ray scene with particles.
+
+    camera_angle (horizontal degrees) and aspect_ratio pin the camera's field
+    of view, so it matches the CameraFrustum used to cull the particles.
+    Without them POV-Ray's default camera is used.
+
+    motion_blur ("sweep" or "ghost") draws particles that carry a "trail" of
+    sub-frame positions as trails; the rest stay plain spheres.
+    """
+    if motion_blur not in MOTION_BLUR_MODES:
+        raise ValueError(f"Unknown motion blur mode '{motion_blur}'")
     if camera_pos is None:
         camera_pos = [0, 2.5, -3]
     if look_at is None:
@@ -48,9 +95,21 @@ def build_scene(
     if background_color is None:
         background_color = [0.1, 0.1, 0.1]
 
-    spheres = [build_particle_sphere(p, preset) for p in particles]
+    spheres = []
+    for p in particles:
+        if motion_blur == "sweep" and "trail" in p:
+            spheres.append(build_particle_trail(p, preset))
+        elif motion_blur == "ghost" and "trail" in p:
+            spheres.extend(build_particle_ghosts(p, preset))
+        else:
+            spheres.append(build_particle_sphere(p, preset))
     light = LightSource(light_pos, 'color', [1, 1, 1])
-    camera = Camera('location', camera_pos, 'look_at', look_at)
+    camera_args = ['location', camera_pos]
+    if aspect_ratio is not None:
+        camera_args += ['right', [aspect_ratio, 0, 0]]
+    if camera_angle is not None:
+        camera_args += ['angle', camera_angle]
+    camera = Camera(*camera_args, 'look_at', look_at)
     background = Background(background_color)
     return Scene(camera, objects=[light, *spheres], atmospheric=[background])
 
@@ -17,9 +17,12 @@ from pathlib import Path
 from DBCore import create_database_provider
 from dotenv import load_dotenv
 
-from lib.pov_builder import build_scene, write_pov_file
+from lib.camera import POV_DEFAULT_ANGLE, POV_DEFAULT_ASPECT, CameraFrustum
+from lib.lod import apply_lod
+from lib.pov_builder import MOTION_BLUR_MODES, build_scene, write_pov_file
 from sim.validator import PhysicsValidator
 from storage.cluster import ClusterManager
+from storage.shared_births import SharedBirthsCache
 
 
 class SimpleConfig:
@@ -93,8 +96,8 @@ async def _fetch_next_frame(cluster: ClusterManager, job_id: int | None=None) ->
     return None
 
 async def _get_job_details(cluster: ClusterManager, job_id: int) -> dict | None:
-    """Fetch job details (fps, width, height, quality, antialias, antialias_depth)."""
-    rows = await cluster.db.fetch_all('\n        SELECT fps, width, height, quality, antialias, antialias_depth\n        FROM render_jobs\n        WHERE job_id = %s\n        ', (job_id,))
+    """Fetch job details (fps, width, height, quality, antialias, antialias_depth, LOD settings, births validation verdict)."""
+    rows = await cluster.db.fetch_all('\n        SELECT fps, width, height, quality, antialias, antialias_depth, lod_mode, lod_min_pixels, births_validation\n        FROM render_jobs\n        WHERE job_id = %s\n        ', (job_id,))
     return rows[0] if rows else None
 
 async def _get_texture_code(cluster: ClusterManager, job_id: int) -> str:
@@ -108,6 +111,20 @@ async def _get_texture_code(cluster: ClusterManager, job_id: int) -> str:
         return 'texture { pigment { rgb <1,1,1> } }'
     return ''
 
+def _camera_angle() -> float | None:
+    """Horizontal camera angle from CAMERA_ANGLE, or None for POV-Ray's default."""
+    angle = os.getenv('CAMERA_ANGLE')
+    return float(angle) if angle else None
+
+def _frame_camera(camera_pos: list, look_at: list, angle: float | None) -> CameraFrustum:
+    """Camera used for frustum culling and LOD projection.
+
+    It is the camera the scene is rendered with: POV-Ray's default camera
+    (right <4/3,0,0>, stretched to the image) with the CAMERA_ANGLE override,
+    so culling and LOD never change the picture.
+    """
+    return CameraFrustum(location=tuple(camera_pos), look_at=tuple(look_at), angle=POV_DEFAULT_ANGLE if angle is None else angle, aspect=POV_DEFAULT_ASPECT)
+
 async def _render_single_frame(cluster: ClusterManager, template_path: Path, frame_id: int, job_id: int) -> bool:
     """Render a single frame using Vapory scene builder."""
     job = await _get_job_details(cluster, job_id)
@@ -117,12 +134,36 @@ async def _render_single_frame(cluster: ClusterManager, template_path: Path, fra
         return False
     fps = job['fps']
     t = frame_id / fps
-    particles = await cluster.get_particles_at_time(job_id, t)
-    if particles:
+    camera_pos = [0, 2.5, -3]
+    look_at = [0, 2.5, 0]
+    if os.getenv('CAMERA_POS'):
+        camera_pos = [float(x) for x in os.getenv('CAMERA_POS').split(',')]
+    if os.getenv('LOOK_AT'):
+        look_at = [float(x) for x in os.getenv('LOOK_AT').split(',')]
+    cull = os.getenv('CULL_FRUSTUM', 'false').lower() in ('true', '1', 'yes')
+    lod_mode = job.get('lod_mode') or 'off'
+    angle = _camera_angle()
+    camera = _frame_camera(camera_pos, look_at, angle) if cull or lod_mode != 'off' else None
+    query = {'frustum': camera} if cull else {}
+    motion_blur = os.getenv('MOTION_BLUR', 'off').lower()
+    if motion_blur not in MOTION_BLUR_MODES:
+        raise ValueError(f"Unknown MOTION_BLUR '{motion_blur}'")
+    if motion_blur != 'off':
+        query['shutter'] = float(os.getenv('SHUTTER', 0.5)) / fps
+        query['samples'] = int(os.getenv('MOTION_BLUR_SAMPLES', 4))
+    particles = await cluster.get_particles_at_time(job_id, t, **query)
+    if cull:
+        stats = cluster.last_cull_stats
+        print(f'Frame {frame_id}: frustum kept {stats.kept}, culled {stats.culled} particles.')
+    # Births validated at generation time cover every frame of the job
+    if particles and job.get('births_validation') != 'valid':
         validator = PhysicsValidator()
         valid, errors = validator.validate_frame(particles)
         if not valid:
             print(f'Frame {frame_id}: validation failed. Errors: {errors}')
+    if lod_mode != 'off':
+        particles, lod = apply_lod(particles, camera, job['width'], job.get('lod_min_pixels') or 0.5, lod_mode)
+        print(f'Frame {frame_id}: LOD {lod_mode} {lod.spheres_in} -> {lod.spheres_out} spheres ({lod.dropped} dropped, {lod.merged} merged into {lod.clusters}, scene {lod.saved_fraction:.0%} smaller).')
     preset = await cluster.get_preset_for_job(job_id)
     if not preset:
         print(f'Frame {frame_id}: no preset found for job {job_id}. Using fallback.')
@@ -134,13 +175,8 @@ async def _render_single_frame(cluster: ClusterManager, template_path: Path, fra
     base_name = template_path.stem
     pov_file = output_dir / f'{base_name}_frame-{frame_id:04d}.pov'
     png_file = output_dir / f'{base_name}_frame-{frame_id:04d}.png'
-    camera_pos = [0, 2.5, -3]
-    look_at = [0, 2.5, 0]
-    if os.getenv('CAMERA_POS'):
-        camera_pos = [float(x) for x in os.getenv('CAMERA_POS').split(',')]
-    if os.getenv('LOOK_AT'):
-        look_at = [float(x) for x in os.getenv('LOOK_AT').split(',')]
-    scene = build_scene(particles=particles, preset=preset, camera_pos=camera_pos, look_at=look_at, light_pos=[1500, 2500, -2500], background_color=[0.1, 0.1, 0.1])
+    camera_fov = {} if angle is None else {'camera_angle': angle}
+    scene = build_scene(particles=particles, preset=preset, camera_pos=camera_pos, look_at=look_at, light_pos=[1500, 2500, -2500], background_color=[0.1, 0.1, 0.1], motion_blur=motion_blur, **camera_fov)
     write_pov_file(scene=scene, output_path=str(pov_file), width=job['width'], height=job['height'], quality=job['quality'], antialiasing=job['antialias'] == 'on')
     ret = await run_povray(pov_file, png_file, width=job['width'], height=job['height'], quality=job['quality'], antialias=job['antialias'] == 'on', antialias_depth=job['antialias_depth'])
     if ret == 0:
@@ -181,7 +217,12 @@ async def main() -> None:
     config = SimpleConfig(provider_type=backend, db_host=os.getenv('DB_HOST'), db_port=int(os.getenv('DB_PORT', 3306)), db_user=os.getenv('DB_USER'), db_password=os.getenv('DB_PASSWORD'), db_database=os.getenv('DB_DATABASE'), sqlite_driver=os.getenv('SQLITE_DRIVER', 'apsw') if backend == 'sqlite' else None, db_path=os.getenv('DB_PATH') if backend == 'sqlite' else None)
     db = create_database_provider(config)
     await db.initialize()
-    cluster = ClusterManager(db)
+    shared_births = SharedBirthsCache() if os.getenv('SHARED_BIRTHS', 'false').lower() in ('true', '1', 'yes') else None
+    if shared_births is not None:
+        orphans = shared_births.remove_orphans()
+        if orphans:
+            print(f'Removed {len(orphans)} orphaned shared births segment(s).')
+    cluster = ClusterManager(db, precision=os.getenv('PRECISION', 'float64').lower(), shared_births=shared_births, births_bundle_dir=os.getenv('BIRTHS_BUNDLE_DIR') or None, births_cache_bytes=int(float(os.getenv('BIRTHS_CACHE_MB', 0)) * 2**20))
     await cluster.insert_node_info(status='active', role='render')
     template = Path(os.getenv('TEMPLATE_FILE', 'scenes/NewBegining.pov'))
     if not template.exists():
@@ -192,6 +233,11 @@ async def main() -> None:
     except KeyboardInterrupt:
         print('Shutting down...')
     finally:
+        if shared_births is not None:
+            shared_births.close()
+        if cluster.births_cache is not None:
+            stats = cluster.births_cache.stats
+            print(f'Births cache: {stats.hits} hits, {stats.misses} misses, {stats.evictions} evictions.')
         await db.close()
 
 def main_sync() -> None:
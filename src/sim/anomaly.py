@@ -0,0 +1,224 @@
+# src/sim/anomaly.py
+"""Vectorized anomaly detectors for simulation_metrics series.
+
+Each detector takes a whole series (one value per sampled time, in time
+order) and scores every point with rolling pandas/NumPy window operations;
+there is no per-point Python loop, so a job's full metrics series is
+checked in milliseconds. A detector returns the scores of all points and
+the indices whose score reaches its threshold.
+
+    energy_mad       rolling median / MAD of total_energy (robust)
+    energy_zscore    z-score of total_energy against the preceding window
+    count_jump       particle_count steps unlike the neighbouring steps
+    momentum_drift   momentum rate of change unlike the neighbouring rates
+
+A faulty point moves only the two steps next to it, while emission starting
+or stopping and particles hitting the water bend a series over many steps.
+Every scale is therefore floored by the nearby steps of the series, so a
+clean job scores low; emission lasting only a few sampled times can still
+look like a fault.
+"""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# Scales a median absolute deviation to a standard deviation for normal data.
+MAD_TO_STD = 1.4826
+# Scales a mean absolute deviation to a standard deviation for normal data.
+MEAN_ABS_TO_STD = 1.2533
+
+DEFAULT_WINDOW = 15
+DEFAULT_THRESHOLD = 8.0
+
+# Fraction of the largest nearby step that floors a detector's scale. Where
+# a series bends (emission starting or stopping, first impacts) a point lies
+# up to a few steps from its centred median.
+STEP_FLOOR = 0.5
+
+
+@dataclass
+class AnomalyResult:
+    """Output of one detector over a series."""
+
+    detector: str
+    scores: np.ndarray      # one per point; 0 where the window is too short
+    indices: np.ndarray     # positions (int64) whose |score| >= threshold
+    threshold: float
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+
+def _typical_step(values: pd.Series) -> float:
+    """Mean absolute value scaled to a standard deviation for normal data."""
+    mean = values.abs().mean()
+    return float(MEAN_ABS_TO_STD * mean) if np.isfinite(mean) else 0.0
+
+
+def _nearby_steps(steps: np.ndarray, window: int) -> np.ndarray:
+    """STEP_FLOOR times the largest |step| within half a window of each point, skipping the three closest.
+
+    steps[i] is the change from point i - 1 to point i. A fault at one point
+    moves only the steps next to it (i and i + 1), so it cannot raise its
+    own floor, while emission starting or stopping and particles hitting
+    the water change many consecutive steps and raise the floor around them.
+    """
+    half = max(window // 2, 2)
+    magnitude = pd.Series(np.abs(np.asarray(steps, dtype=np.float64)))
+    before = magnitude.shift(2).rolling(half - 1, min_periods=1).max().to_numpy()
+    after = magnitude.shift(-half).rolling(half - 1, min_periods=1).max().to_numpy()
+    return STEP_FLOOR * np.nan_to_num(np.fmax(before, after), nan=0.0)
+
+
+def _result(detector: str, scores: np.ndarray, threshold: float) -> AnomalyResult:
+    scores = np.where(np.isnan(scores), 0.0, scores)
+    return AnomalyResult(detector, scores, np.flatnonzero(np.abs(scores) >= threshold), threshold)
+
+
+def _scaled(deviation: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """Deviation / scale; a zero scale gives +-inf for any deviation, a NaN scale NaN."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zero = np.where(deviation == 0, 0.0, np.copysign(np.inf, deviation))
+        return np.where(np.isnan(scale), np.nan, np.where(scale > 0, deviation / scale, zero))
+
+
+def rolling_mad_scores(
+    values: np.ndarray,
+    window: int = DEFAULT_WINDOW,
+    rel_floor: float = 1e-6,
+    abs_floor: float = 0.0,
+    steps: np.ndarray | None = None,
+) -> np.ndarray:
+    """Robust score of each point against the centred rolling median and MAD.
+
+    Between births and impacts the metrics are smooth or constant (total
+    energy is conserved in flight), so the local MAD often collapses to
+    zero, and where emission starts or stops or the first particles hit the
+    water the median lags behind the bends of the series. The scale is
+    therefore floored by the nearby steps of the series (see _nearby_steps;
+    steps defaults to the differences of values), at the mean absolute
+    residual over the whole series, at rel_floor * |median| and at abs_floor.
+    """
+    s = pd.Series(np.asarray(values, dtype=np.float64))
+    if steps is None:
+        steps = s.diff().to_numpy()
+    median = s.rolling(window, center=True, min_periods=1).median()
+    residual = (s - median).abs()
+    mad = residual.rolling(window, center=True, min_periods=1).median().to_numpy()
+    floor = np.maximum(np.maximum(_typical_step(residual), rel_floor * median.abs().to_numpy()), abs_floor)
+    floor = np.maximum(floor, _nearby_steps(steps, window))
+    return _scaled((s - median).to_numpy(), np.maximum(MAD_TO_STD * mad, floor))
+
+
+def energy_mad(
+    energy: np.ndarray,
+    window: int = DEFAULT_WINDOW,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> AnomalyResult:
+    """Flag total energies far from the rolling median, in units of MAD."""
+    return _result("energy_mad", rolling_mad_scores(energy, window), threshold)
+
+
+def energy_zscore(
+    energy: np.ndarray,
+    window: int = DEFAULT_WINDOW,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> AnomalyResult:
+    """Flag total energies whose z-score against the preceding window is large.
+
+    The window excludes the point itself so a spike does not inflate its own
+    baseline; the first points (fewer than 2 predecessors) score 0. The
+    standard deviation is floored at the mean absolute step of the series,
+    since energy is constant between births and impacts, and by the nearby
+    steps, since the preceding window lags behind where energy starts to
+    rise or fall.
+    """
+    s = pd.Series(np.asarray(energy, dtype=np.float64))
+    previous = s.shift(1).rolling(window, min_periods=2)
+    scale = np.fmax(previous.std().to_numpy(), _typical_step(s.diff().abs()))
+    scale = np.fmax(scale, np.sqrt(window) * _nearby_steps(s.diff().to_numpy(), window))
+    scale[np.isnan(previous.mean().to_numpy())] = np.nan
+    return _result("energy_zscore", _scaled((s - previous.mean()).to_numpy(), scale), threshold)
+
+
+def count_jump(
+    counts: np.ndarray,
+    window: int = DEFAULT_WINDOW,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> AnomalyResult:
+    """Flag steps in particle_count unlike the steps around them.
+
+    The score of point i is that of the step from i - 1 to i; steady emission
+    and draining ramps give steady steps and score low. Scales are floored
+    at one particle and by the nearby steps, so emission starting or
+    stopping and the first impacts are not jumps.
+    """
+    steps = np.diff(np.asarray(counts, dtype=np.float64), prepend=np.nan)
+    scores = np.zeros(len(steps))
+    if len(steps) > 1:
+        scores[1:] = rolling_mad_scores(steps[1:], window, rel_floor=0.0, abs_floor=1.0, steps=steps[1:])
+    return _result("count_jump", scores, threshold)
+
+
+def momentum_drift(
+    times: np.ndarray,
+    momentum: np.ndarray,
+    window: int = DEFAULT_WINDOW,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> AnomalyResult:
+    """Flag changes in momentum rate (dp/dt, (n, 3) momentum) unlike the neighbouring rates.
+
+    Gravity and emission change momentum smoothly, so the rate drifts slowly;
+    the score of point i is the largest per-axis robust score of the rate
+    over the interval ending at i.
+    """
+    momentum = np.asarray(momentum, dtype=np.float64).reshape(len(times), 3)
+    scores = np.zeros(len(times))
+    if len(times) > 1:
+        rate = np.diff(momentum, axis=0) / np.diff(np.asarray(times, dtype=np.float64))[:, np.newaxis]
+        axis_scores = np.column_stack([rolling_mad_scores(rate[:, k], window) for k in range(3)])
+        scores[1:] = np.nan_to_num(axis_scores, nan=0.0)[np.arange(len(rate)), np.abs(axis_scores).argmax(axis=1)]
+    return _result("momentum_drift", scores, threshold)
+
+
+def metrics_frame(metrics: pd.DataFrame | Sequence[Mapping[str, Any]]) -> pd.DataFrame:
+    """simulation_metrics rows (or a DataFrame of them) as a DataFrame sorted by time."""
+    frame = metrics if isinstance(metrics, pd.DataFrame) else pd.DataFrame.from_records(list(metrics))
+    if "time" in frame:
+        frame = frame.sort_values("time", kind="stable").reset_index(drop=True)
+    return frame
+
+
+def detect_anomalies(
+    metrics: pd.DataFrame | Sequence[Mapping[str, Any]],
+    window: int = DEFAULT_WINDOW,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> dict[str, AnomalyResult]:
+    """Run every detector whose columns are present over a metrics series.
+
+    metrics holds simulation_metrics rows; they are ordered by time and the
+    returned indices refer to that order. Detectors are keyed by name.
+    """
+    frame = metrics_frame(metrics)
+    results = {}
+    if not len(frame):
+        return results
+    if "total_energy" in frame:
+        energy = frame["total_energy"].to_numpy(dtype=np.float64)
+        results["energy_mad"] = energy_mad(energy, window, threshold)
+        results["energy_zscore"] = energy_zscore(energy, window, threshold)
+    if "particle_count" in frame:
+        results["count_jump"] = count_jump(frame["particle_count"].to_numpy(dtype=np.float64), window, threshold)
+    momentum_columns = ["momentum_x", "momentum_y", "momentum_z"]
+    if "time" in frame and all(c in frame for c in momentum_columns):
+        results["momentum_drift"] = momentum_drift(
+            frame["time"].to_numpy(dtype=np.float64),
+            frame[momentum_columns].to_numpy(dtype=np.float64),
+            window,
+            threshold,
+        )
+    return results
@@ -0,0 +1,181 @@
+# src/sim/metrics.py
+"""Streaming frame metrics.
+
+PhysicsValidator.compute_metrics needs every particle of a frame at once.
+MetricsAccumulator produces the same metrics dict from chunks of particles:
+it keeps running minima/maxima, sums for the energies, momentum and centre
+of mass, and a Welford mean/variance of the speed. Memory stays bounded
+by the chunk size, and accumulators built over disjoint shards (e.g. one
+per worker) merge into the result for the whole set. accumulate_frames
+feeds one accumulator per frame time from batched frame evaluation, so a
+whole job's metrics need no per-frame records.
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+
+from sim.particles import ParticleBirthArray, evaluate_births_at_times
+from sim.temporal import TemporalIndex
+
+
+class MetricsAccumulator:
+    """Running aggregate of particle states for compute_metrics-style metrics.
+
+    Mass is the particle size, as in PhysicsValidator.compute_metrics.
+    """
+
+    def __init__(self, gravity: float = 9.81):
+        self.gravity = gravity
+        self.count = 0
+        self.nan_count = 0
+        self.inf_count = 0
+        self.pos_min = np.full(3, np.inf)
+        self.pos_max = np.full(3, -np.inf)
+        self.max_speed = -np.inf
+        # Welford / Chan running mean and sum of squared deviations of speed
+        self.speed_mean = 0.0
+        self.speed_m2 = 0.0
+        self.kinetic_energy = 0.0
+        self.potential_energy = 0.0
+        self.momentum = np.zeros(3)
+        self.mass = 0.0
+        self.mass_position = np.zeros(3)
+
+    def update(self, position: np.ndarray, velocity: np.ndarray, size: np.ndarray) -> None:
+        """Add a chunk of particles given as (n, 3) position/velocity and (n,) size."""
+        n = len(size)
+        if not n:
+            return
+        pos = np.asarray(position, dtype=np.float64)
+        vel = np.asarray(velocity, dtype=np.float64)
+        mass = np.asarray(size, dtype=np.float64)
+
+        # Column-wise: reductions along axis 0 of (n, 3) arrays are slow
+        speed2 = vel[:, 0] ** 2 + vel[:, 1] ** 2 + vel[:, 2] ** 2
+        speed = np.sqrt(speed2)
+        mean = np.mean(speed)
+        deviation = speed - mean
+        self._add_speed(n, mean, deviation @ deviation, np.max(speed))
+
+        if not (np.isfinite(pos).all() and np.isfinite(vel).all()):
+            self.nan_count += int(np.isnan(pos).sum() + np.isnan(vel).sum())
+            self.inf_count += int(np.isinf(pos).sum() + np.isinf(vel).sum())
+        columns = np.ascontiguousarray(pos.T)
+        self.pos_min = np.minimum(self.pos_min, columns.min(axis=1))
+        self.pos_max = np.maximum(self.pos_max, columns.max(axis=1))
+        # Mass-weighted sums as dot products
+        self.kinetic_energy += 0.5 * (mass @ speed2)
+        self.potential_energy += self.gravity * (mass @ pos[:, 1])
+        self.momentum = self.momentum + mass @ vel
+        self.mass += np.sum(mass)
+        self.mass_position = self.mass_position + mass @ pos
+
+    def update_particles(self, particles: Sequence[Mapping[str, Any]]) -> None:
+        """Add a chunk of particle records (dicts or ParticleState)."""
+        if not particles:
+            return
+        pos = np.array([[p["position_x"], p["position_y"], p["position_z"]] for p in particles], dtype=np.float64)
+        vel = np.array([[p["velocity_x"], p["velocity_y"], p["velocity_z"]] for p in particles], dtype=np.float64)
+        sizes = np.array([p["size"] for p in particles], dtype=np.float64)
+        self.update(pos, vel, sizes)
+
+    def update_state(self, state) -> None:
+        """Add the particles of a FrameState."""
+        self.update(state.position, state.velocity, state.size)
+
+    def merge(self, other: "MetricsAccumulator") -> "MetricsAccumulator":
+        """Fold in an accumulator built over a disjoint set of particles; returns self."""
+        if other.gravity != self.gravity:
+            raise ValueError("Accumulators must use the same gravity")
+        if not other.count:
+            return self
+        self._add_speed(other.count, other.speed_mean, other.speed_m2, other.max_speed)
+        self.nan_count += other.nan_count
+        self.inf_count += other.inf_count
+        self.pos_min = np.minimum(self.pos_min, other.pos_min)
+        self.pos_max = np.maximum(self.pos_max, other.pos_max)
+        self.kinetic_energy += other.kinetic_energy
+        self.potential_energy += other.potential_energy
+        self.momentum = self.momentum + other.momentum
+        self.mass += other.mass
+        self.mass_position = self.mass_position + other.mass_position
+        return self
+
+    def result(self) -> dict[str, Any]:
+        """Metrics of everything added so far, keyed as in compute_metrics."""
+        if not self.count:
+            return {
+                "particle_count": 0,
+                "nan_count": 0,
+                "inf_count": 0,
+                "kinetic_energy": 0.0,
+                "potential_energy": 0.0,
+                "total_energy": 0.0,
+                "momentum_x": 0.0, "momentum_y": 0.0, "momentum_z": 0.0,
+                "avg_velocity": 0.0, "max_velocity": 0.0,
+            }
+
+        com = self.mass_position / self.mass if self.mass > 0 else np.zeros(3)
+        return {
+            "particle_count": self.count,
+            "min_x": float(self.pos_min[0]),
+            "max_x": float(self.pos_max[0]),
+            "min_y": float(self.pos_min[1]),
+            "max_y": float(self.pos_max[1]),
+            "min_z": float(self.pos_min[2]),
+            "max_z": float(self.pos_max[2]),
+            "avg_velocity": float(self.speed_mean),
+            "max_velocity": float(self.max_speed),
+            "velocity_std": float(np.sqrt(self.speed_m2 / self.count)),
+            "kinetic_energy": float(self.kinetic_energy),
+            "potential_energy": float(self.potential_energy),
+            "total_energy": float(self.kinetic_energy + self.potential_energy),
+            "momentum_x": float(self.momentum[0]),
+            "momentum_y": float(self.momentum[1]),
+            "momentum_z": float(self.momentum[2]),
+            "center_of_mass_x": float(com[0]),
+            "center_of_mass_y": float(com[1]),
+            "center_of_mass_z": float(com[2]),
+            "nan_count": self.nan_count,
+            "inf_count": self.inf_count,
+        }
+
+    # --------------------------------------------------------------------------
+    # Helper Methods
+    # --------------------------------------------------------------------------
+
+    def _add_speed(self, n: int, mean: float, m2: float, max_speed: float) -> None:
+        """Combine speed statistics of n more particles (Chan et al. parallel update)."""
+        total = self.count + n
+        if self.count:
+            delta = mean - self.speed_mean
+            self.speed_mean += delta * n / total
+            self.speed_m2 += m2 + delta * delta * self.count * n / total
+        else:
+            self.speed_mean, self.speed_m2 = float(mean), float(m2)
+        self.max_speed = float(np.maximum(self.max_speed, max_speed))
+        self.count = total
+
+
+def accumulate_frames(
+    accumulators: Sequence[MetricsAccumulator],
+    births: ParticleBirthArray,
+    times: np.ndarray,
+    gravity: float,
+    water_level: float,
+    index: TemporalIndex | None = None,
+) -> None:
+    """Add the births alive at each time to that time's accumulator.
+
+    Frames are evaluated in batches (evaluate_births_at_times). Births may
+    be passed in chunks, one call per chunk with the same accumulators.
+    """
+    if len(accumulators) != len(times):
+        raise ValueError("Need one accumulator per time")
+    if not len(births):
+        return
+    states = evaluate_births_at_times(births, times, gravity, water_level, index=index)
+    for acc, state in zip(accumulators, states, strict=True):
+        acc.update_state(state)
@@ -5,11 +5,20 @@ No numerical integration. No environmental forces.
 Deterministic, reproducible, and frame-rate independent.
 """
 
-from dataclasses import dataclass
-from typing import Any
+import hashlib
+import json
+import shutil
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field, replace
+from itertools import repeat
+from pathlib import Path
+from typing import Any, ClassVar, overload
 
 import numpy as np
 
+from sim.temporal import TemporalIndex
+
 # ----------------------------------------------------------------------------
 # Deterministic stateless RNG (splitmix64)
 # ----------------------------------------------------------------------------
@@ -27,13 +36,31 @@ def rng_float(seed: int, idx: int, min_val: float, max_val: float) -> float:
     return min_val + (h / 2**64) * (max_val - min_val)
 
 
+def _splitmix64_array(x: np.ndarray) -> np.ndarray:
+    """Vectorized splitmix64 over uint64 arrays (wrap-around arithmetic)."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def rng_float_array(seeds: np.ndarray, idx: int, min_val: float, max_val: float) -> np.ndarray:
+    """Batched rng_float: one value per seed, bit-for-bit identical to the scalar version."""
+    # int64 -> uint64 reinterprets negative seeds as two's complement, which is
+    # exactly what the scalar version's 64-bit masking does.
+    x = np.asarray(seeds, dtype=np.int64).astype(np.uint64) + np.uint64(idx)
+    h = _splitmix64_array(np.atleast_1d(x))
+    return min_val + (h.astype(np.float64) / 2.0**64) * (max_val - min_val)
+
+
 # ----------------------------------------------------------------------------
 # Particle Birth Record
 # ----------------------------------------------------------------------------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ParticleBirth:
     """Immutable initial conditions for a single particle."""
+
     particle_id: int
     birth_time: float
     x0: float
@@ -48,6 +75,703 @@ class ParticleBirth:
     impact_time: float | None = None  # absolute time of death (if computed)
 
 
+# ----------------------------------------------------------------------------
+# Particle State Record
+# ----------------------------------------------------------------------------
+
+_STATE_FIELDS = (
+    "particle_id",
+    "position_x", "position_y", "position_z",
+    "velocity_x", "velocity_y", "velocity_z",
+    "size", "texture_name", "status", "trail",
+)
+_STATE_KEYS = frozenset(_STATE_FIELDS)
+
+
+class ParticleState(Mapping):
+    """State of one alive particle at time t, as a compact read-only mapping.
+
+    Slotted, so a record takes a fraction of the memory of the equivalent
+    dict. It is a Mapping with the keys of
+    ``FrameState.to_dicts(texture_key="texture_name")``, the format
+    PhysicsValidator, lib.lod and lib.pov_builder consume, and compares
+    equal to those dicts; unknown keys raise KeyError. ``trail`` is only a
+    key when set. The fields are also attributes, which cannot be
+    assigned or deleted.
+    """
+
+    __slots__ = _STATE_FIELDS
+
+    def __init__(
+        self,
+        particle_id: int,
+        position_x: float,
+        position_y: float,
+        position_z: float,
+        velocity_x: float,
+        velocity_y: float,
+        velocity_z: float,
+        size: float,
+        texture_name: str,
+        status: str = "alive",
+        trail: list[list[float]] | None = None,
+    ):
+        # The slot descriptors bypass __setattr__ (and are quicker than
+        # object.__setattr__, which matters for frames of millions of records)
+        _set_particle_id(self, particle_id)
+        _set_position_x(self, position_x)
+        _set_position_y(self, position_y)
+        _set_position_z(self, position_z)
+        _set_velocity_x(self, velocity_x)
+        _set_velocity_y(self, velocity_y)
+        _set_velocity_z(self, velocity_z)
+        _set_size(self, size)
+        _set_texture_name(self, texture_name)
+        _set_status(self, status)
+        _set_trail(self, trail)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"ParticleState is read-only, cannot set {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"ParticleState is read-only, cannot delete {name!r}")
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        return ParticleState, tuple(getattr(self, name) for name in _STATE_FIELDS)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _STATE_KEYS and (key != "trail" or self.trail is not None):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _STATE_KEYS and (key != "trail" or self.trail is not None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_STATE_FIELDS if self.trail is not None else _STATE_FIELDS[:-1])
+
+    def __len__(self) -> int:
+        return len(_STATE_FIELDS) if self.trail is not None else len(_STATE_FIELDS) - 1
+
+    def __repr__(self) -> str:
+        return f"ParticleState({', '.join(f'{k}={self[k]!r}' for k in self)})"
+
+
+(
+    _set_particle_id,
+    _set_position_x, _set_position_y, _set_position_z,
+    _set_velocity_x, _set_velocity_y, _set_velocity_z,
+    _set_size, _set_texture_name, _set_status, _set_trail,
+) = (getattr(ParticleState, name).__set__ for name in _STATE_FIELDS)
+
+
+# ----------------------------------------------------------------------------
+# Columnar Birth Store
+# ----------------------------------------------------------------------------
+
+# Storage precision of the per-particle state columns (position, velocity,
+# size). Birth and impact times stay float64 in every mode, so which particles
+# are alive at t never depends on the precision.
+PRECISIONS: dict[str, type[np.floating]] = {"float64": np.float64, "float32": np.float32}
+
+
+def state_dtype(precision: str) -> np.dtype:
+    """Return the NumPy dtype of the state columns for a precision name."""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}', expected one of {sorted(PRECISIONS)}")
+    return np.dtype(PRECISIONS[precision])
+
+
+@dataclass
+class ParticleBirthArray:
+    """Structure-of-arrays store of particle births.
+
+    One NumPy column per ParticleBirth field. Textures are categorical:
+    ``texture_code`` indexes into ``textures``. A NaN ``impact_time`` means
+    the particle never hits the water plane (``None`` in ParticleBirth).
+    """
+
+    particle_id: np.ndarray
+    birth_time: np.ndarray
+    x0: np.ndarray
+    y0: np.ndarray
+    z0: np.ndarray
+    vx0: np.ndarray
+    vy0: np.ndarray
+    vz0: np.ndarray
+    size: np.ndarray
+    texture_code: np.ndarray
+    seed: np.ndarray
+    impact_time: np.ndarray
+    textures: list[str] = field(default_factory=list)
+
+    FLOAT_COLUMNS: ClassVar[tuple[str, ...]] = (
+        "birth_time", "x0", "y0", "z0", "vx0", "vy0", "vz0", "size", "impact_time",
+    )
+    COLUMNS: ClassVar[tuple[str, ...]] = ("particle_id", *FLOAT_COLUMNS[:-1], "texture_code", "seed", "impact_time")
+    STATE_COLUMNS: ClassVar[tuple[str, ...]] = ("x0", "y0", "z0", "vx0", "vy0", "vz0", "size")
+    # Version of the on-disk bundle written by save
+    BUNDLE_FORMAT: ClassVar[int] = 1
+
+    @classmethod
+    def empty(cls, precision: str = "float64") -> "ParticleBirthArray":
+        """Return a store with zero births."""
+        dtype = state_dtype(precision)
+        return cls(
+            particle_id=np.empty(0, dtype=np.int64),
+            texture_code=np.empty(0, dtype=np.int32),
+            seed=np.empty(0, dtype=np.int64),
+            **{
+                name: np.empty(0, dtype=dtype if name in cls.STATE_COLUMNS else np.float64)
+                for name in cls.FLOAT_COLUMNS
+            },
+        )
+
+    @classmethod
+    def from_births(cls, births: Iterable[ParticleBirth]) -> "ParticleBirthArray":
+        """Build a columnar store from ParticleBirth records."""
+        births = list(births)
+        textures: dict[str, int] = {}
+        codes = [textures.setdefault(b.texture, len(textures)) for b in births]
+        return cls(
+            particle_id=np.array([b.particle_id for b in births], dtype=np.int64),
+            texture_code=np.array(codes, dtype=np.int32),
+            seed=np.array([b.seed for b in births], dtype=np.int64),
+            textures=list(textures),
+            **{
+                name: np.array(
+                    [np.nan if getattr(b, name) is None else getattr(b, name) for b in births],
+                    dtype=np.float64,
+                )
+                for name in cls.FLOAT_COLUMNS
+            },
+        )
+
+    @classmethod
+    def concat(cls, parts: Iterable["ParticleBirthArray"]) -> "ParticleBirthArray":
+        """Concatenate stores, merging their texture tables.
+
+        All-empty input keeps the precision of the first part.
+        """
+        parts = list(parts)
+        precision = parts[0].precision if parts else "float64"
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty(precision)
+        if len(parts) == 1:
+            return parts[0]
+
+        textures: dict[str, int] = {}
+        codes = []
+        for p in parts:
+            remap = np.array([textures.setdefault(name, len(textures)) for name in p.textures], dtype=np.int32)
+            codes.append(remap[p.texture_code] if len(remap) else p.texture_code)
+        return cls(
+            texture_code=np.concatenate(codes),
+            textures=list(textures),
+            **{
+                name: np.concatenate([getattr(p, name) for p in parts])
+                for name in cls.COLUMNS if name != "texture_code"
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.particle_id)
+
+    @property
+    def precision(self) -> str:
+        """Precision name of the state columns ("float64" or "float32")."""
+        return self.x0.dtype.name
+
+    def astype(self, precision: str) -> "ParticleBirthArray":
+        """Return the births with state columns in the given precision.
+
+        Returns self when nothing needs converting; otherwise only the state
+        columns are copied.
+        """
+        dtype = state_dtype(precision)
+        if all(getattr(self, name).dtype == dtype for name in self.STATE_COLUMNS):
+            return self
+        return replace(self, **{name: getattr(self, name).astype(dtype) for name in self.STATE_COLUMNS})
+
+    def take(self, index: np.ndarray | slice) -> "ParticleBirthArray":
+        """Return the births selected by an index array, mask or slice."""
+        return ParticleBirthArray(
+            textures=self.textures,
+            **{name: getattr(self, name)[index] for name in self.COLUMNS},
+        )
+
+    def birth(self, i: int) -> ParticleBirth:
+        """Materialise a single ParticleBirth record."""
+        impact_time = self.impact_time[i]
+        return ParticleBirth(
+            particle_id=int(self.particle_id[i]),
+            birth_time=float(self.birth_time[i]),
+            x0=float(self.x0[i]), y0=float(self.y0[i]), z0=float(self.z0[i]),
+            vx0=float(self.vx0[i]), vy0=float(self.vy0[i]), vz0=float(self.vz0[i]),
+            size=float(self.size[i]),
+            texture=self.textures[self.texture_code[i]],
+            seed=int(self.seed[i]),
+            impact_time=None if np.isnan(impact_time) else float(impact_time),
+        )
+
+    def to_births(self) -> list[ParticleBirth]:
+        """Materialise every birth as a ParticleBirth record."""
+        # Columns are converted with tolist() once rather than per element.
+        impact = [None if v != v else v for v in self.impact_time.tolist()]  # NaN -> None
+        return [
+            ParticleBirth(*row)
+            for row in zip(
+                self.particle_id.tolist(), self.birth_time.tolist(),
+                self.x0.tolist(), self.y0.tolist(), self.z0.tolist(),
+                self.vx0.tolist(), self.vy0.tolist(), self.vz0.tolist(),
+                self.size.tolist(),
+                [self.textures[c] for c in self.texture_code.tolist()],
+                self.seed.tolist(), impact,
+                strict=True,
+            )
+        ]
+
+    @property
+    def texture(self) -> np.ndarray:
+        """Texture name per birth (object array, decoded from the codes)."""
+        return np.array(self.textures, dtype=object)[self.texture_code]
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes held by the column arrays."""
+        return sum(getattr(self, name).nbytes for name in self.COLUMNS)
+
+    def save(self, path: str | Path) -> Path:
+        """Write the births as a bundle directory: one ``<column>.npy`` per column plus ``meta.json``.
+
+        The bundle is written to a uniquely named temporary sibling and
+        renamed into place, so readers and concurrent writers (possibly on
+        other hosts sharing the directory) never see or remove a partial
+        bundle. Raises FileExistsError if path already exists.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent))
+        try:
+            for name in self.COLUMNS:
+                np.save(tmp / f"{name}.npy", getattr(self, name), allow_pickle=False)
+            meta = {"format": self.BUNDLE_FORMAT, "count": len(self), "textures": self.textures}
+            (tmp / "meta.json").write_text(json.dumps(meta))
+            # rename() replaces an empty directory on POSIX
+            if path.exists():
+                raise FileExistsError(f"Births bundle already exists: {path}")
+            try:
+                tmp.rename(path)
+            except OSError as e:
+                if path.exists():
+                    raise FileExistsError(f"Births bundle already exists: {path}") from e
+                raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True) -> "ParticleBirthArray":
+        """Open a bundle written by save.
+
+        With mmap the columns are read-only memory maps, so pages are read
+        lazily as frames touch them; otherwise they are read into memory.
+        """
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        if meta.get("format") != cls.BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported births bundle format {meta.get('format')!r} in {path}")
+        columns = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None, allow_pickle=False)
+            for name in cls.COLUMNS
+        }
+        if any(len(values) != meta["count"] for values in columns.values()):
+            raise ValueError(f"Births bundle {path} has columns of inconsistent length")
+        return cls(textures=meta["textures"], **columns)
+
+
+class ParticleBirthView(Sequence[ParticleBirth]):
+    """Read-only list-like view that materialises ParticleBirth records lazily."""
+
+    def __init__(self, births: ParticleBirthArray):
+        self._births = births
+
+    def __len__(self) -> int:
+        return len(self._births)
+
+    @overload
+    def __getitem__(self, index: int) -> ParticleBirth: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[ParticleBirth]: ...
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._births.birth(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("particle index out of range")
+        return self._births.birth(index)
+
+    def __iter__(self) -> Iterator[ParticleBirth]:
+        for i in range(len(self)):
+            yield self._births.birth(i)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ParticleBirthView({len(self)} births)"
+
+
+class BirthsChecksum:
+    """Incremental SHA-256 over births in row order.
+
+    Rows are hashed as packed little-endian records, so the digest does not
+    depend on how the births were chunked. Every numeric column is covered;
+    the texture is part of the emitter definition and is not hashed.
+    """
+
+    RECORD_DTYPE: ClassVar[np.dtype] = np.dtype([
+        (name, "<i8" if name in ("particle_id", "seed") else "<f8")
+        for name in ParticleBirthArray.COLUMNS if name != "texture_code"
+    ])
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+        self.count = 0
+
+    def update(self, births: ParticleBirthArray) -> None:
+        """Feed the next births (in particle order)."""
+        records = np.empty(len(births), dtype=self.RECORD_DTYPE)
+        for name in self.RECORD_DTYPE.names:
+            records[name] = getattr(births, name)
+        self._hash.update(records.tobytes())
+        self.count += len(births)
+
+    def hexdigest(self) -> str:
+        """Return the digest of everything fed so far."""
+        return self._hash.hexdigest()
+
+    @classmethod
+    def of(cls, births: ParticleBirthArray) -> str:
+        """Digest of a single array of births."""
+        checksum = cls()
+        checksum.update(births)
+        return checksum.hexdigest()
+
+
+# ----------------------------------------------------------------------------
+# Frame State (alive particles at time t)
+# ----------------------------------------------------------------------------
+
+@dataclass
+class FrameState:
+    """Alive particle states at absolute time t, as columns.
+
+    ``position`` and ``velocity`` are (n, 3) arrays; ``texture_code`` indexes
+    ``textures`` exactly as in ParticleBirthArray. ``trail``, when present,
+    holds (n, k, 3) sub-frame positions ordered oldest first (see
+    shutter_offsets); its last sample is ``position``.
+    """
+
+    time: float
+    particle_id: np.ndarray
+    position: np.ndarray
+    velocity: np.ndarray
+    size: np.ndarray
+    texture_code: np.ndarray
+    textures: list[str] = field(default_factory=list)
+    trail: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.particle_id)
+
+    def take(self, index: np.ndarray | slice) -> "FrameState":
+        """Return the particles selected by an index array, mask or slice."""
+        return FrameState(
+            time=self.time,
+            particle_id=self.particle_id[index],
+            position=self.position[index],
+            velocity=self.velocity[index],
+            size=self.size[index],
+            texture_code=self.texture_code[index],
+            textures=self.textures,
+            trail=None if self.trail is None else self.trail[index],
+        )
+
+    def to_dicts(self, texture_key: str = "texture") -> list[dict[str, Any]]:
+        """Expand into the per-particle dict format used by the dict APIs.
+
+        With a trail each dict also gets ``"trail"``: a list of [x, y, z].
+        """
+        names = [self.textures[c] for c in self.texture_code.tolist()]
+        dicts = [
+            {
+                "particle_id": pid,
+                "position_x": x, "position_y": y, "position_z": z,
+                "velocity_x": vx, "velocity_y": vy, "velocity_z": vz,
+                "size": size,
+                texture_key: name,
+                "status": "alive",
+            }
+            for pid, (x, y, z), (vx, vy, vz), size, name in zip(
+                self.particle_id.tolist(),
+                self.position.tolist(),
+                self.velocity.tolist(),
+                self.size.tolist(),
+                names,
+                strict=True,
+            )
+        ]
+        if self.trail is not None:
+            for d, trail in zip(dicts, self.trail.tolist(), strict=True):
+                d["trail"] = trail
+        return dicts
+
+    def to_states(self) -> list[ParticleState]:
+        """Expand into ParticleState records (texture under "texture_name")."""
+        n = len(self)
+        columns = [
+            self.particle_id.tolist(),
+            *self.position.T.tolist(),
+            *self.velocity.T.tolist(),
+            self.size.tolist(),
+            [self.textures[c] for c in self.texture_code.tolist()],
+            repeat("alive", n),
+            repeat(None, n) if self.trail is None else self.trail.tolist(),
+        ]
+        return list(map(ParticleState, *columns))  # stops at the bounded columns
+
+
+def impact_times(y0: np.ndarray, vy0: np.ndarray, gravity: float, water_level: float) -> np.ndarray:
+    """Time after birth at which each trajectory reaches the water plane.
+
+    NaN marks particles that never hit; particles born at or below the
+    water level get 0 (born dead).
+    """
+    # Quadratic: -0.5*g*t^2 + vy0*t + (y0 - water_level) = 0
+    a = -0.5 * gravity
+    b = vy0
+    c = y0 - water_level
+    disc = b * b - 4 * a * c
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sqrt_disc = np.sqrt(disc)
+        t1 = (-b + sqrt_disc) / (2 * a)
+        t2 = (-b - sqrt_disc) / (2 * a)
+    t1 = np.where(t1 > 0, t1, np.inf)
+    t2 = np.where(t2 > 0, t2, np.inf)
+    impact = np.minimum(t1, t2)
+    impact[np.isinf(impact) | (disc < 0)] = np.nan  # never hits
+    impact[y0 <= water_level] = 0.0  # born dead
+    return impact
+
+
+def shutter_offsets(shutter: float, samples: int) -> np.ndarray:
+    """Return sample offsets back from the frame time across an open shutter.
+
+    The samples run from ``shutter`` seconds before the frame to the frame
+    itself (offset 0), oldest first.
+    """
+    if samples < 1:
+        raise ValueError(f"samples must be at least 1, got {samples}")
+    if shutter < 0:
+        raise ValueError(f"shutter must be non-negative, got {shutter}")
+    return np.linspace(shutter, 0.0, samples) if samples > 1 else np.zeros(1)
+
+
+def evaluate_indices(
+    births: ParticleBirthArray,
+    idx: np.ndarray,
+    t: float,
+    gravity: float,
+    water_level: float,
+    offsets: np.ndarray | None = None,
+) -> FrameState:
+    """Evaluate the births at idx (already known to be alive) at time t.
+
+    The state is computed in the precision of the births' state columns.
+    With offsets (see shutter_offsets) the sub-frame positions at t - offset
+    are evaluated in the same pass and returned as the state's trail.
+    """
+    dt = (t - births.birth_time[idx]).astype(births.x0.dtype, copy=False)
+    vx0, vy0, vz0 = births.vx0[idx], births.vy0[idx], births.vz0[idx]
+    x = births.x0[idx] + vx0 * dt
+    y = births.y0[idx] + vy0 * dt - 0.5 * gravity * dt * dt
+    z = births.z0[idx] + vz0 * dt
+
+    # Safety check (should never be below water if impact_time correct)
+    keep = y > water_level
+    if not keep.all():
+        idx, dt, x, y, z = idx[keep], dt[keep], x[keep], y[keep], z[keep]
+        vx0, vy0, vz0 = vx0[keep], vy0[keep], vz0[keep]
+
+    trail = None
+    if offsets is not None:
+        # Samples before a particle's birth are clamped to its birth position.
+        sub = np.maximum(dt[:, np.newaxis] - offsets, 0.0).astype(dt.dtype, copy=False)
+        trail = np.stack((
+            births.x0[idx, np.newaxis] + vx0[:, np.newaxis] * sub,
+            births.y0[idx, np.newaxis] + vy0[:, np.newaxis] * sub - 0.5 * gravity * sub * sub,
+            births.z0[idx, np.newaxis] + vz0[:, np.newaxis] * sub,
+        ), axis=-1)
+
+    return FrameState(
+        time=t,
+        particle_id=births.particle_id[idx],
+        position=np.column_stack((x, y, z)),
+        velocity=np.column_stack((vx0, vy0 - gravity * dt, vz0)),
+        size=births.size[idx],
+        texture_code=births.texture_code[idx],
+        textures=births.textures,
+        trail=trail,
+    )
+
+
+def evaluate_births(
+    births: ParticleBirthArray,
+    t: float,
+    gravity: float,
+    water_level: float,
+    index: TemporalIndex | None = None,
+    offsets: np.ndarray | None = None,
+) -> FrameState:
+    """Evaluate alive births at absolute time t with the ballistic equations.
+
+    With a TemporalIndex only the alive candidates are touched; without one
+    the alive mask is computed over every birth. offsets adds sub-frame
+    trails for motion blur (see evaluate_indices).
+    """
+    if index is not None:
+        idx = index.query(t)
+    else:
+        # NaN impact_time (never hits) compares False, so those stay alive.
+        idx = np.flatnonzero((t >= births.birth_time) & ~(t >= births.impact_time))
+    return evaluate_indices(births, idx, t, gravity, water_level, offsets)
+
+
+# Upper bound on (candidate births x sample times) pairs evaluated at once by
+# evaluate_births_at_times; keeps the transient mask/pair arrays to ~100 MB.
+_MAX_BATCH_ELEMENTS = 1 << 21
+_TIME_CHUNK = 64
+
+
+def _window_candidates(
+    births: ParticleBirthArray,
+    t_lo: float,
+    t_hi: float,
+    index: TemporalIndex | None = None,
+) -> np.ndarray:
+    """Indices of births alive at some point in [t_lo, t_hi]."""
+    if index is not None:
+        return index.candidates(t_lo, t_hi)
+    return np.flatnonzero((births.birth_time <= t_hi) & ~(births.impact_time <= t_lo))
+
+
+def _evaluate_time_chunk(
+    births: ParticleBirthArray,
+    candidates: np.ndarray,
+    times: np.ndarray,
+    gravity: float,
+    water_level: float,
+) -> list[FrameState]:
+    """Evaluate candidate births at several times with one broadcast."""
+    t = times[:, np.newaxis]
+    alive = (t >= births.birth_time[candidates]) & ~(t >= births.impact_time[candidates])
+    rows, cols = np.nonzero(alive)  # row-major: grouped by time, ascending index
+    idx = candidates[cols]
+
+    dt = (times[rows] - births.birth_time[idx]).astype(births.x0.dtype, copy=False)
+    vx0, vy0, vz0 = births.vx0[idx], births.vy0[idx], births.vz0[idx]
+    x = births.x0[idx] + vx0 * dt
+    y = births.y0[idx] + vy0 * dt - 0.5 * gravity * dt * dt
+    z = births.z0[idx] + vz0 * dt
+
+    keep = y > water_level
+    if not keep.all():
+        rows, idx, dt, x, y, z = rows[keep], idx[keep], dt[keep], x[keep], y[keep], z[keep]
+        vx0, vy0, vz0 = vx0[keep], vy0[keep], vz0[keep]
+
+    position = np.column_stack((x, y, z))
+    velocity = np.column_stack((vx0, vy0 - gravity * dt, vz0))
+    bounds = np.searchsorted(rows, np.arange(len(times) + 1))
+    states = []
+    for r in range(len(times)):
+        sl = slice(bounds[r], bounds[r + 1])
+        states.append(FrameState(
+            time=float(times[r]),
+            particle_id=births.particle_id[idx[sl]],
+            position=position[sl],
+            velocity=velocity[sl],
+            size=births.size[idx[sl]],
+            texture_code=births.texture_code[idx[sl]],
+            textures=births.textures,
+        ))
+    return states
+
+
+def evaluate_births_at_times(
+    births: ParticleBirthArray,
+    times: Iterable[float],
+    gravity: float,
+    water_level: float,
+    max_elements: int = _MAX_BATCH_ELEMENTS,
+    index: TemporalIndex | None = None,
+) -> Iterator[FrameState]:
+    """Evaluate births at many sample times, yielding one FrameState per time.
+
+    Times are processed in chunks: each chunk selects the births alive anywhere
+    in its time window once, then broadcasts candidates x times so that the
+    pair count stays under ``max_elements``. Results match evaluate_births.
+    Passing a TemporalIndex makes the per-chunk candidate selection scale with
+    the alive set instead of the job size.
+    """
+    times = np.asarray(times if isinstance(times, np.ndarray) else list(times), dtype=np.float64).ravel()
+    k = _TIME_CHUNK
+    i = 0
+    while i < len(times):
+        chunk = times[i:i + k]
+        candidates = _window_candidates(births, chunk.min(), chunk.max(), index)
+        if len(chunk) > 1 and len(candidates) * len(chunk) > max_elements:
+            k = max(1, max_elements // max(1, len(candidates)))
+            chunk = times[i:i + k]
+            candidates = _window_candidates(births, chunk.min(), chunk.max(), index)
+        yield from _evaluate_time_chunk(births, candidates, chunk, gravity, water_level)
+        i += len(chunk)
+        k = min(_TIME_CHUNK, k * 2)
+
+
+# ----------------------------------------------------------------------------
+# Emitter Definitions
+# ----------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ConicalFountain:
+    """Parameters of a conical fountain emitter (see add_conical_fountain).
+
+    Particle i of the emitter depends only on ``seed_offset + i``, so any
+    index range can be generated independently.
+    """
+
+    num_particles: int
+    apex_x: float
+    apex_y: float
+    apex_z: float
+    cone_height: float
+    cone_angle_rad: float
+    base_radius: float
+    speed_min: float
+    speed_max: float
+    birth_start: float
+    birth_end: float
+    size_min: float
+    size_max: float
+    texture: str = "WaterTexture"
+    seed_offset: int = 0
+
+
 # ----------------------------------------------------------------------------
 # Fountain Simulator (V1)
 # ----------------------------------------------------------------------------
@@ -55,32 +779,79 @@ class ParticleBirth:
 class FountainSimulator:
     """Deterministic fountain particle generator.
 
-    Produces ParticleBirth records for a conical fountain.
+    Produces ParticleBirth records for a conical fountain. Births are always
+    generated in float64 (so they are identical in every precision) and then
+    stored with their state columns in ``precision``.
     """
 
-    def __init__(self, gravity: float = 9.81, water_level: float = 0.0):
+    def __init__(self, gravity: float = 9.81, water_level: float = 0.0, precision: str = "float64"):
         self.gravity = gravity
         self.water_level = water_level
-        self._particles: list[ParticleBirth] = []
+        self.precision = state_dtype(precision).name
+        self._births = ParticleBirthArray.empty(self.precision)
+        self._index: TemporalIndex | None = None
         self._next_id = 0
 
     def _compute_impact_time(self, y0: float, vy0: float) -> float | None:
         """Solve for relative impact time when particle hits water plane."""
-        if y0 <= self.water_level:
-            return 0.0  # born dead
-
-        # Quadratic: -0.5*g*t^2 + vy0*t + (y0 - water_level) = 0
-        a = -0.5 * self.gravity
-        b = vy0
-        c = y0 - self.water_level
-        disc = b * b - 4 * a * c
-        if disc < 0:
-            return None  # never hits
-        sqrt_disc = np.sqrt(disc)
-        t1 = (-b + sqrt_disc) / (2 * a)
-        t2 = (-b - sqrt_disc) / (2 * a)
-        roots = [r for r in (t1, t2) if r > 0]
-        return min(roots) if roots else None
+        impact = self._compute_impact_times(np.array([y0], dtype=np.float64), np.array([vy0], dtype=np.float64))[0]
+        return None if np.isnan(impact) else float(impact)
+
+    def _compute_impact_times(self, y0: np.ndarray, vy0: np.ndarray) -> np.ndarray:
+        """Vectorized _compute_impact_time; NaN marks particles that never hit."""
+        return impact_times(y0, vy0, self.gravity, self.water_level)
+
+    def _conical_fountain_columns(
+        self,
+        seeds: np.ndarray,
+        apex_x: float,
+        apex_y: float,
+        apex_z: float,
+        cone_height: float,
+        cone_angle_rad: float,
+        base_radius: float,
+        speed_min: float,
+        speed_max: float,
+        birth_start: float,
+        birth_end: float,
+        size_min: float,
+        size_max: float,
+    ) -> dict[str, np.ndarray]:
+        """Compute birth columns for a batch of seeds in array operations.
+
+        Mirrors the per-particle draw order (RNG indices 0-7) so the output is
+        identical to evaluating each seed on its own.
+        """
+        birth_time = rng_float_array(seeds, 0, birth_start, birth_end)
+        height = rng_float_array(seeds, 1, 0.0, cone_height)
+        angle = rng_float_array(seeds, 2, 0.0, 2.0 * np.pi)
+        radius_factor = rng_float_array(seeds, 3, 0.0, 1.0)
+        radius = base_radius * (1.0 - height / cone_height) * radius_factor
+
+        x0 = apex_x + radius * np.cos(angle)
+        y0 = apex_y + height
+        z0 = apex_z + radius * np.sin(angle)
+
+        vel_angle = rng_float_array(seeds, 4, -cone_angle_rad, cone_angle_rad)
+        vel_mag = rng_float_array(seeds, 5, speed_min, speed_max)
+        az_angle = rng_float_array(seeds, 6, 0.0, 2.0 * np.pi)
+
+        vx0 = vel_mag * np.cos(vel_angle) * np.cos(az_angle)
+        vy0 = vel_mag * np.sin(vel_angle)
+        vz0 = vel_mag * np.cos(vel_angle) * np.sin(az_angle)
+
+        size = rng_float_array(seeds, 7, size_min, size_max)
+
+        impact_time = birth_time + self._compute_impact_times(y0, vy0)
+
+        return {
+            "birth_time": birth_time,
+            "x0": x0, "y0": y0, "z0": z0,
+            "vx0": vx0, "vy0": vy0, "vz0": vz0,
+            "size": size,
+            "seed": np.asarray(seeds, dtype=np.int64),
+            "impact_time": impact_time,
+        }
 
     def add_conical_fountain(
         self,
@@ -104,86 +875,125 @@ class FountainSimulator:
 
         All particles are born with uniform random distribution within the cone.
         """
-        for i in range(num_particles):
-            seed = seed_offset + i
-
-            # Deterministic random values
-            birth_time = rng_float(seed, 0, birth_start, birth_end)
-            height = rng_float(seed, 1, 0.0, cone_height)
-            angle = rng_float(seed, 2, 0.0, 2.0 * np.pi)
-            radius_factor = rng_float(seed, 3, 0.0, 1.0)
-            radius = base_radius * (1.0 - height / cone_height) * radius_factor
-
-            x0 = apex_x + radius * np.cos(angle)
-            y0 = apex_y + height
-            z0 = apex_z + radius * np.sin(angle)
-
-            vel_angle = rng_float(seed, 4, -cone_angle_rad, cone_angle_rad)
-            vel_mag = rng_float(seed, 5, speed_min, speed_max)
-            az_angle = rng_float(seed, 6, 0.0, 2.0 * np.pi)
-
-            vx0 = vel_mag * np.cos(vel_angle) * np.cos(az_angle)
-            vy0 = vel_mag * np.sin(vel_angle)
-            vz0 = vel_mag * np.cos(vel_angle) * np.sin(az_angle)
-
-            size = rng_float(seed, 7, size_min, size_max)
-
-            impact_rel = self._compute_impact_time(y0, vy0)
-            impact_time = birth_time + impact_rel if impact_rel is not None else None
-
-            birth = ParticleBirth(
-                particle_id=self._next_id,
-                birth_time=birth_time,
-                x0=x0, y0=y0, z0=z0,
-                vx0=vx0, vy0=vy0, vz0=vz0,
-                size=size,
-                texture=texture,
-                seed=seed,
-                impact_time=impact_time,
-            )
-            self._particles.append(birth)
-            self._next_id += 1
+        self.add_emitter(ConicalFountain(
+            num_particles,
+            apex_x, apex_y, apex_z,
+            cone_height, cone_angle_rad, base_radius,
+            speed_min, speed_max,
+            birth_start, birth_end,
+            size_min, size_max,
+            texture, seed_offset,
+        ))
+
+    def emit(self, emitter: ConicalFountain, start: int, stop: int, first_id: int) -> ParticleBirthArray:
+        """Generate births for emitter particle indices [start, stop).
+
+        Particle ids are assigned consecutively from first_id. Nothing is
+        stored on the simulator.
+        """
+        seeds = emitter.seed_offset + np.arange(start, stop, dtype=np.int64)
+        cols = self._conical_fountain_columns(
+            seeds,
+            emitter.apex_x, emitter.apex_y, emitter.apex_z,
+            emitter.cone_height, emitter.cone_angle_rad, emitter.base_radius,
+            emitter.speed_min, emitter.speed_max,
+            emitter.birth_start, emitter.birth_end,
+            emitter.size_min, emitter.size_max,
+        )
+        return ParticleBirthArray(
+            particle_id=first_id + np.arange(len(seeds), dtype=np.int64),
+            texture_code=np.zeros(len(seeds), dtype=np.int32),
+            textures=[emitter.texture],
+            **cols,
+        ).astype(self.precision)
+
+    def add_emitter(self, emitter: ConicalFountain) -> None:
+        """Generate all births of an emitter and store them."""
+        first_id = self.reserve_ids(emitter.num_particles)
+        self.extend(self.emit(emitter, 0, emitter.num_particles, first_id))
+
+    def reserve_ids(self, count: int) -> int:
+        """Reserve count consecutive particle ids and return the first one."""
+        first_id = self._next_id
+        self._next_id += count
+        return first_id
+
+    def extend(self, births: ParticleBirthArray) -> None:
+        """Append births (with ids from reserve_ids) to the store."""
+        if len(births):
+            self._births = ParticleBirthArray.concat([self._births, births.astype(self.precision)])
+        self._index = None
+
+    def iter_emitter(self, emitter: ConicalFountain, chunk_size: int) -> Iterator[ParticleBirthArray]:
+        """Yield an emitter's births in chunks of at most chunk_size, without storing them.
+
+        Chunk k covers seeds ``seed_offset + [k * chunk_size, (k + 1) * chunk_size)``,
+        so the output is identical to add_emitter regardless of chunk size, and
+        memory stays bounded by one chunk. Particle ids are reserved up front.
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        first_id = self.reserve_ids(emitter.num_particles)
+        return self._iter_chunks(emitter, chunk_size, first_id)
+
+    def _iter_chunks(self, emitter: ConicalFountain, chunk_size: int, first_id: int) -> Iterator[ParticleBirthArray]:
+        for start in range(0, emitter.num_particles, chunk_size):
+            stop = min(start + chunk_size, emitter.num_particles)
+            yield self.emit(emitter, start, stop, first_id + start)
+
+    @property
+    def index(self) -> TemporalIndex:
+        """Temporal index over the current births (built on first use)."""
+        if self._index is None:
+            self._index = TemporalIndex.from_births(self._births)
+        return self._index
+
+    def evaluate_at_time_arrays(self, t: float) -> FrameState:
+        """Return alive particle states at absolute time t as columns."""
+        return evaluate_births(self._births, t, self.gravity, self.water_level, self.index)
+
+    def evaluate_subframes(self, t: float, shutter: float, samples: int) -> FrameState:
+        """Return alive particle states at t with samples sub-frame positions each.
+
+        The trail spans [t - shutter, t]; particles are those alive at t.
+        """
+        offsets = shutter_offsets(shutter, samples)
+        return evaluate_births(self._births, t, self.gravity, self.water_level, self.index, offsets)
+
+    def evaluate_at_times(self, ts: Iterable[float], max_elements: int = _MAX_BATCH_ELEMENTS) -> Iterator[FrameState]:
+        """Yield alive particle states for each time in ts, evaluated in batches."""
+        return evaluate_births_at_times(self._births, ts, self.gravity, self.water_level, max_elements, self.index)
 
     def evaluate_at_time(self, t: float) -> list[dict[str, Any]]:
         """Return list of alive particle states at absolute time t."""
-        states = []
-        for b in self._particles:
-            # Not yet born
-            if t < b.birth_time:
-                continue
-            # Dead by impact
-            if b.impact_time is not None and t >= b.impact_time:
-                continue
-
-            dt = t - b.birth_time
-            x = b.x0 + b.vx0 * dt
-            y = b.y0 + b.vy0 * dt - 0.5 * self.gravity * dt * dt
-            z = b.z0 + b.vz0 * dt
-
-            # Safety check (should never be below water if impact_time correct)
-            if y <= self.water_level:
-                continue
-
-            states.append({
-                'particle_id': b.particle_id,
-                'position_x': float(x),
-                'position_y': float(y),
-                'position_z': float(z),
-                'velocity_x': float(b.vx0),
-                'velocity_y': float(b.vy0 - self.gravity * dt),
-                'velocity_z': float(b.vz0),
-                'size': float(b.size),
-                'texture': b.texture,
-                'status': 'alive',
-            })
-        return states
+        return self.evaluate_at_time_arrays(t).to_dicts()
+
+    @property
+    def births(self) -> ParticleBirthArray:
+        """Return the columnar birth store."""
+        return self._births
+
+    @births.setter
+    def births(self, births: ParticleBirthArray) -> None:
+        self._births = births.astype(self.precision)
+        self._index = None
+        self._next_id = int(births.particle_id.max()) + 1 if len(births) else 0
+
+    def save_births(self, path: str | Path) -> Path:
+        """Write the current births as a bundle directory (see ParticleBirthArray.save)."""
+        return self._births.save(path)
+
+    def load_births(self, path: str | Path, mmap: bool = True) -> None:
+        """Replace the births with a bundle directory, memory-mapped by default."""
+        self.births = ParticleBirthArray.load(path, mmap)
 
     @property
-    def particles(self) -> list[ParticleBirth]:
-        """Return the list of particle births."""
-        return self._particles
+    def particles(self) -> ParticleBirthView:
+        """Return a lazy list-like view of the particle births."""
+        return ParticleBirthView(self._births)
 
     def clear(self) -> None:
         """Clear all particles and reset ID counter."""
-        self._particles = []
+        self._births = ParticleBirthArray.empty(self.precision)
+        self._index = None
         self._next_id = 0
@@ -0,0 +1,135 @@
+# src/sim/sweep.py
+"""Incremental sweep-line evaluation for sequential frame rendering.
+
+Frames are mostly requested in increasing time order. Instead of
+recomputing the alive set from scratch for every frame, the sweep keeps
+it between calls and applies only the birth and impact events that
+happened since the previous time.
+"""
+
+import numpy as np
+
+from sim.particles import FrameState, ParticleBirthArray, evaluate_indices
+from sim.temporal import TemporalIndex
+
+
+class SweepEvaluator:
+    """Stateful evaluator that advances an alive set through time.
+
+    Births are consumed from a birth-sorted event queue. The alive set is a
+    few runs, each ordered by impact time, so the impacts of a step are a
+    prefix cut of every run. The births of a step form a new run, and a run
+    is merged into the previous one once that is no longer larger (like a
+    binary counter), so there are O(log alive) runs and a birth takes part
+    in O(log alive) merges. A step therefore costs O(events) amortised plus
+    one copy of the alive indices, with no sort of the whole alive set.
+
+    Moving backwards in time (or the first call) falls back to a
+    random-access TemporalIndex query.
+    """
+
+    def __init__(
+        self,
+        births: ParticleBirthArray,
+        gravity: float,
+        water_level: float,
+        index: TemporalIndex | None = None,
+    ):
+        self.births = births
+        self.gravity = gravity
+        self.water_level = water_level
+        self._index = index
+
+        self._birth_order = np.argsort(births.birth_time, kind="stable")
+        self._sorted_birth = births.birth_time[self._birth_order]
+
+        self._time: float | None = None
+        self._next_birth = 0
+        # (indices, impact times) per run, both ordered by impact time;
+        # NaN (never hits) sorts last
+        self._runs: list[tuple[np.ndarray, np.ndarray]] = []
+
+        self.births_applied = 0
+        self.impacts_applied = 0
+        self.resets = 0
+
+    @property
+    def index(self) -> TemporalIndex:
+        """Index used for random-access fallbacks (built on first use)."""
+        if self._index is None:
+            self._index = TemporalIndex.from_births(self.births)
+        return self._index
+
+    @property
+    def time(self) -> float | None:
+        """Time of the current alive set, or None before the first call."""
+        return self._time
+
+    def reset(self, t: float) -> None:
+        """Rebuild the alive set at time t from the index."""
+        self._runs = []
+        self._push_run(self.index.query(t))
+        self._next_birth = int(np.searchsorted(self._sorted_birth, t, side="right"))
+        self._time = t
+        self.resets += 1
+
+    def _push_run(self, idx: np.ndarray) -> None:
+        """Add births as a new run, ordered by impact time."""
+        if len(idx):
+            impact = self.births.impact_time[idx]
+            order = np.argsort(impact, kind="stable")
+            self._runs.append((idx[order], impact[order]))
+        self._merge_runs()
+
+    def _merge_runs(self) -> None:
+        """Merge runs until their sizes strictly decrease, so there are O(log alive) of them."""
+        runs: list[tuple[np.ndarray, np.ndarray]] = []
+        for run in self._runs:
+            runs.append(run)
+            while len(runs) > 1 and len(runs[-2][0]) <= len(runs[-1][0]):
+                (idx_a, impact_a), (idx_b, impact_b) = runs.pop(-2), runs.pop()
+                impact = np.concatenate((impact_a, impact_b))
+                # Stable sort of two sorted runs is a linear merge (timsort)
+                order = np.argsort(impact, kind="stable")
+                runs.append((np.concatenate((idx_a, idx_b))[order], impact[order]))
+        self._runs = runs
+
+    def _advance_to(self, t: float) -> None:
+        hi = int(np.searchsorted(self._sorted_birth, t, side="right"))
+        if hi > self._next_birth:
+            self._push_run(self._birth_order[self._next_birth:hi])
+            self.births_applied += hi - self._next_birth
+            self._next_birth = hi
+
+        # Everything with impact <= t is a prefix of each run (NaN never expires).
+        runs = []
+        for idx, impact in self._runs:
+            cut = int(np.searchsorted(impact, t, side="right"))
+            self.impacts_applied += cut
+            if cut < len(idx):
+                runs.append((idx[cut:], impact[cut:]))
+        self._runs = runs
+        self._merge_runs()
+        self._time = t
+
+    def alive_indices(self, t: float) -> np.ndarray:
+        """Move the sweep to t and return the indices of alive births.
+
+        The indices come in no particular order (grouped by run, each run
+        ordered by impact time); sort them if the order matters.
+        """
+        if self._time is None or t < self._time:
+            self.reset(t)
+        else:
+            self._advance_to(t)
+        if not self._runs:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([idx for idx, _ in self._runs])
+
+    def evaluate(self, t: float, offsets: np.ndarray | None = None) -> FrameState:
+        """Move the sweep to t and evaluate positions for the alive set only.
+
+        Particles come in the order of alive_indices; offsets adds sub-frame
+        trails (see evaluate_indices).
+        """
+        return evaluate_indices(self.births, self.alive_indices(t), t, self.gravity, self.water_level, offsets)
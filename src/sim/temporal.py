@@ -0,0 +1,87 @@
+# src/sim/temporal.py
+"""Temporal interval index over particle lifetimes.
+
+A particle is alive on [birth_time, impact_time). The index answers
+"which particles are alive at t" without scanning every birth, so the
+cost of a query scales with the alive set instead of the job size.
+"""
+
+import numpy as np
+
+# Relative/absolute slack on lifetime windows. The final alive test is exact,
+# the window only has to be a superset despite birth + life rounding.
+_WINDOW_SLACK = 1e-9
+
+
+class TemporalIndex:
+    """Sorted-array index over [birth_time, impact_time) intervals.
+
+    Mortal particles are bucketed into lifetime classes (powers of two). Inside
+    a class births are sorted, and anything alive at t must be born within
+    (t - max_lifetime, t], which is a contiguous slice found by binary search.
+    Because lifetimes within a class differ by at most 2x, at most about half of
+    each slice is dead, so a query costs O(classes * log n + k).
+
+    Particles that never hit (NaN impact_time) are kept in their own
+    birth-sorted class; born-dead particles (impact == birth) are dropped.
+    """
+
+    def __init__(self, birth_time: np.ndarray, impact_time: np.ndarray):
+        self.size = len(birth_time)
+        self._birth_time = birth_time
+        self._impact_time = impact_time
+
+        never = np.isnan(impact_time)
+        with np.errstate(invalid="ignore"):
+            lifetime = impact_time - birth_time
+            mortal = np.flatnonzero(~never & (lifetime > 0))
+
+        self._immortal = self._sorted_by_birth(np.flatnonzero(never))
+        self._immortal_birth = birth_time[self._immortal]
+
+        # (sorted birth times, indices, max lifetime) per lifetime class
+        self._classes: list[tuple[np.ndarray, np.ndarray, float]] = []
+        if len(mortal):
+            life = lifetime[mortal]
+            cls = np.floor(np.log2(life)).astype(np.int64)
+            order = np.lexsort((birth_time[mortal], cls))
+            mortal, cls, life = mortal[order], cls[order], life[order]
+            bounds = np.flatnonzero(np.diff(cls)) + 1
+            for idx, lives in zip(np.split(mortal, bounds), np.split(life, bounds), strict=True):
+                max_life = float(lives.max())
+                max_life += max_life * _WINDOW_SLACK + _WINDOW_SLACK
+                self._classes.append((birth_time[idx], idx, max_life))
+
+    @classmethod
+    def from_births(cls, births) -> "TemporalIndex":
+        """Build an index from a ParticleBirthArray (or anything with the same columns)."""
+        return cls(births.birth_time, births.impact_time)
+
+    def _sorted_by_birth(self, idx: np.ndarray) -> np.ndarray:
+        return idx[np.argsort(self._birth_time[idx], kind="stable")]
+
+    @property
+    def num_classes(self) -> int:
+        """Number of lifetime classes (excluding never-hitting particles)."""
+        return len(self._classes)
+
+    def candidates(self, t_lo: float, t_hi: float) -> np.ndarray:
+        """Sorted indices of particles alive at some time in [t_lo, t_hi]."""
+        parts = []
+        for births, idx, max_life in self._classes:
+            lo = np.searchsorted(births, t_lo - max_life, side="left")
+            hi = np.searchsorted(births, t_hi, side="right")
+            cand = idx[lo:hi]
+            parts.append(cand[self._impact_time[cand] > t_lo])
+        parts.append(self._immortal[:np.searchsorted(self._immortal_birth, t_hi, side="right")])
+        out = np.concatenate(parts)
+        out.sort()
+        return out
+
+    def query(self, t: float) -> np.ndarray:
+        """Sorted indices of particles alive at time t (birth <= t < impact)."""
+        return self.candidates(t, t)
+
+    def alive_count(self, t: float) -> int:
+        """Number of particles alive at time t."""
+        return len(self.query(t))
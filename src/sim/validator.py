@@ -7,10 +7,30 @@ This module provides pure functions (no I/O) to:
 - Detect anomalies (spikes, divergence)
 """
 
+import math
+from collections.abc import Mapping, Sequence
+from operator import itemgetter
 from typing import Any
 
 import numpy as np
 
+from sim.metrics import MetricsAccumulator
+from sim.particles import ParticleBirthArray, impact_times
+
+REQUIRED_KEYS = (
+    "particle_id", "position_x", "position_y", "position_z",
+    "velocity_x", "velocity_y", "velocity_z", "size", "texture_name",
+)
+NUMERIC_KEYS = REQUIRED_KEYS[1:8]
+MAX_SPEED = 1000.0  # m/s
+_numeric_values = itemgetter(*NUMERIC_KEYS)
+
+BIRTH_KEYS = ("birth_time", "x0", "y0", "z0", "vx0", "vy0", "vz0", "size")
+# Stored births go through FLOAT columns, so impact times are compared at
+# float32 resolution.
+IMPACT_RTOL = 1e-6
+IMPACT_ATOL = 1e-6
+
 
 class PhysicsValidator:
     """Pure physics validation for a frame (list of particle states).
@@ -27,20 +47,12 @@ class PhysicsValidator:
         """
         errors = []
 
-        required = [
-            "particle_id", "position_x", "position_y", "position_z",
-            "velocity_x", "velocity_y", "velocity_z", "size", "texture_name"
-        ]
-        for key in required:
+        for key in REQUIRED_KEYS:
             if key not in state:
                 errors.append(f"Missing key: {key}")
                 return False, errors
 
-        numeric_keys = [
-            "position_x", "position_y", "position_z",
-            "velocity_x", "velocity_y", "velocity_z", "size"
-        ]
-        for key in numeric_keys:
+        for key in NUMERIC_KEYS:
             val = state[key]
             if not np.isfinite(val):
                 errors.append(f"{key} is not finite: {val}")
@@ -50,7 +62,7 @@ class PhysicsValidator:
                 errors.append(f"{key} is Inf")
 
         v2 = (state["velocity_x"]**2 + state["velocity_y"]**2 + state["velocity_z"]**2)
-        if v2 > 1e6:  # 1000 m/s limit
+        if v2 > MAX_SPEED**2:
             errors.append(f"Velocity magnitude too high: {np.sqrt(v2)} m/s")
 
         if state["size"] <= 0:
@@ -59,12 +71,130 @@ class PhysicsValidator:
         return len(errors) == 0, errors
 
     @staticmethod
-    def validate_frame(particles: list[dict[str, Any]]) -> tuple[bool, list[dict]]:
+    def validate_frame(particles: Sequence[Mapping[str, Any]]) -> tuple[bool, list[dict]]:
         """Validate all particles in a frame.
 
+        The numeric checks run as array masks over the whole frame (see
+        validate_columns). Frames where some particle lacks a required key
+        are validated particle by particle, as validate_particle_state does.
+
         Returns:
             (all_valid, per_particle_errors)
         """
+        if not particles:
+            return True, []
+        try:
+            values = np.array(list(map(_numeric_values, particles)), dtype=np.float64)
+            complete = all("particle_id" in p and "texture_name" in p for p in particles)
+        except KeyError:
+            complete = False
+        if not complete:
+            return PhysicsValidator._validate_frame_per_particle(particles)
+
+        errors = [
+            {"particle_index": idx, "particle_id": particles[idx].get("particle_id", -1), "errors": errs}
+            for idx, errs in PhysicsValidator._failing_rows(values)
+        ]
+        return not errors, errors
+
+    @staticmethod
+    def validate_columns(
+        position: np.ndarray,
+        velocity: np.ndarray,
+        size: np.ndarray,
+        particle_id: np.ndarray,
+    ) -> tuple[bool, list[dict]]:
+        """Validate a frame held as columns ((n, 3) position/velocity, (n,) size/ids).
+
+        Same checks and result as validate_frame, without building any
+        per-particle records (e.g. straight from a FrameState).
+        """
+        values = np.column_stack((position, velocity, size)).astype(np.float64, copy=False)
+        errors = [
+            {"particle_index": idx, "particle_id": int(particle_id[idx]), "errors": errs}
+            for idx, errs in PhysicsValidator._failing_rows(values)
+        ]
+        return not errors, errors
+
+    @staticmethod
+    def validate_births(births: ParticleBirthArray, gravity: float, water_level: float) -> tuple[bool, list[dict]]:
+        """Validate every particle's whole trajectory from its birth record.
+
+        Motion is ballistic, so one pass over the births covers every frame:
+        all birth columns finite, peak speed over the lifetime (at birth or
+        at impact) within the limit, positive size, and impact_time matching
+        the time the trajectory reaches the water plane (NaN only for
+        particles that never do). A job whose births pass needs no
+        per-frame validation.
+
+        Returns:
+            (all_valid, per_birth_errors)
+        """
+        if not len(births):
+            return True, []
+        values = np.column_stack([getattr(births, key).astype(np.float64, copy=False) for key in BIRTH_KEYS])
+        birth_time, y0, vx, vy, vz = values[:, 0], values[:, 2], values[:, 4], values[:, 5], values[:, 6]
+        impact = births.impact_time.astype(np.float64, copy=False)
+        finite = np.isfinite(values)
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            # |v|^2 is convex in time, so its maximum is at birth or impact;
+            # particles that never hit fall (or rise) forever.
+            lifetime = np.where(np.isnan(impact), np.inf, impact - birth_time)
+            vy_end = np.where(lifetime > 0, vy - gravity * lifetime, vy)
+            peak2 = vx**2 + vz**2 + np.fmax(vy**2, vy_end**2)
+            expected = birth_time + impact_times(y0, vy, gravity, water_level)
+        too_fast = peak2 > MAX_SPEED**2
+        bad_size = values[:, 7] <= 0
+        consistent = np.isclose(impact, expected, rtol=IMPACT_RTOL, atol=IMPACT_ATOL, equal_nan=True)
+        failing = np.flatnonzero(~finite.all(axis=1) | too_fast | bad_size | ~consistent)
+
+        errors = []
+        for idx in failing.tolist():
+            row = values[idx].tolist()
+            errs = [f"{key} is not finite: {val}" for key, val, ok in zip(BIRTH_KEYS, row, finite[idx].tolist(), strict=True) if not ok]
+            if too_fast[idx]:
+                errs.append(f"Peak speed over lifetime too high: {np.sqrt(peak2[idx])} m/s")
+            if bad_size[idx]:
+                errs.append(f"Size must be positive: {row[7]}")
+            if not consistent[idx]:
+                errs.append(f"impact_time {float(impact[idx])} does not match trajectory (expected {float(expected[idx])})")
+            errors.append({"birth_index": idx, "particle_id": int(births.particle_id[idx]), "errors": errs})
+        return not errors, errors
+
+    @staticmethod
+    def _failing_rows(values: np.ndarray) -> list[tuple[int, list[str]]]:
+        """Error messages of the failing rows of an (n, 7) array in NUMERIC_KEYS order.
+
+        Finiteness, speed and size are evaluated as masks; messages (worded
+        and ordered as in validate_particle_state) are built only for rows
+        that fail.
+        """
+        finite = np.isfinite(values)
+        with np.errstate(over="ignore", invalid="ignore"):
+            v2 = values[:, 3]**2 + values[:, 4]**2 + values[:, 5]**2
+        too_fast = v2 > MAX_SPEED**2
+        bad_size = values[:, 6] <= 0
+        failing = np.flatnonzero(~finite.all(axis=1) | too_fast | bad_size)
+
+        rows = []
+        for idx in failing.tolist():
+            row = values[idx].tolist()
+            errs = []
+            for key, val, ok in zip(NUMERIC_KEYS, row, finite[idx].tolist(), strict=True):
+                if not ok:
+                    errs.append(f"{key} is not finite: {val}")
+                    errs.append(f"{key} is NaN" if math.isnan(val) else f"{key} is Inf")
+            if too_fast[idx]:
+                errs.append(f"Velocity magnitude too high: {np.sqrt(v2[idx])} m/s")
+            if bad_size[idx]:
+                errs.append(f"Size must be positive: {row[6]}")
+            rows.append((idx, errs))
+        return rows
+
+    @staticmethod
+    def _validate_frame_per_particle(particles: Sequence[Mapping[str, Any]]) -> tuple[bool, list[dict]]:
+        """Validate particle by particle (frames with incomplete states)."""
         all_valid = True
         errors = []
         for idx, p in enumerate(particles):
@@ -82,6 +212,9 @@ class PhysicsValidator:
     def compute_metrics(particles: list[dict[str, Any]], gravity: float = 9.81) -> dict[str, Any]:
         """Compute aggregate physics metrics for a frame.
 
+        The frame is taken in one piece; use MetricsAccumulator to build the
+        same metrics from chunks or shards.
+
         Returns dictionary with:
             - particle_count
             - min_x, max_x, min_y, max_y, min_z, max_z
@@ -91,63 +224,9 @@ class PhysicsValidator:
             - nan_count, inf_count
             - center_of_mass_x, y, z
         """
-        if not particles:
-            return {
-                "particle_count": 0,
-                "nan_count": 0,
-                "inf_count": 0,
-                "kinetic_energy": 0.0,
-                "potential_energy": 0.0,
-                "total_energy": 0.0,
-                "momentum_x": 0.0, "momentum_y": 0.0, "momentum_z": 0.0,
-                "avg_velocity": 0.0, "max_velocity": 0.0,
-            }
-
-        pos = np.array([[p["position_x"], p["position_y"], p["position_z"]] for p in particles])
-        vel = np.array([[p["velocity_x"], p["velocity_y"], p["velocity_z"]] for p in particles])
-        sizes = np.array([p["size"] for p in particles])
-
-        nan_count = int(np.isnan(pos).sum() + np.isnan(vel).sum())
-        inf_count = int(np.isinf(pos).sum() + np.isinf(vel).sum())
-
-        speed2 = np.sum(vel**2, axis=1)
-        speed = np.sqrt(speed2)
-
-        mass = sizes
-        ke = 0.5 * np.sum(mass * speed2)
-        pe = np.sum(mass * gravity * pos[:, 1])
-        total_energy = ke + pe
-        momentum = np.sum(mass[:, np.newaxis] * vel, axis=0)
-
-        total_mass = np.sum(mass)
-        if total_mass > 0:
-            com = np.sum(pos * mass[:, np.newaxis], axis=0) / total_mass
-        else:
-            com = np.array([0, 0, 0])
-
-        return {
-            "particle_count": len(particles),
-            "min_x": float(pos[:, 0].min()),
-            "max_x": float(pos[:, 0].max()),
-            "min_y": float(pos[:, 1].min()),
-            "max_y": float(pos[:, 1].max()),
-            "min_z": float(pos[:, 2].min()),
-            "max_z": float(pos[:, 2].max()),
-            "avg_velocity": float(np.mean(speed)),
-            "max_velocity": float(np.max(speed)),
-            "velocity_std": float(np.std(speed)),
-            "kinetic_energy": float(ke),
-            "potential_energy": float(pe),
-            "total_energy": float(total_energy),
-            "momentum_x": float(momentum[0]),
-            "momentum_y": float(momentum[1]),
-            "momentum_z": float(momentum[2]),
-            "center_of_mass_x": float(com[0]),
-            "center_of_mass_y": float(com[1]),
-            "center_of_mass_z": float(com[2]),
-            "nan_count": nan_count,
-            "inf_count": inf_count,
-        }
+        acc = MetricsAccumulator(gravity)
+        acc.update_particles(particles)
+        return acc.result()
 
     @staticmethod
     def detect_energy_spike(
@@ -156,22 +235,17 @@ class PhysicsValidator:
     ) -> list[int]:
         """Detect frames where total_energy spikes relative to moving average.
 
+        Compares each interior point with the mean of its two neighbours; see
+        sim.anomaly for the windowed detectors.
+
         Returns list of frame indices (or times) that exceeded threshold.
         """
-        if not metrics_series:
-            return []
-        energies = [m["total_energy"] for m in metrics_series]
-        if len(energies) < 3:
+        if len(metrics_series) < 3:
             return []
-        spikes = []
-        for i in range(1, len(energies) - 1):
-            # Use average of neighbours, not including the current point
-            avg_neighbors = (energies[i - 1] + energies[i + 1]) / 2.0
-            if avg_neighbors > 0:
-                if energies[i] > avg_neighbors * threshold_factor:
-                    spikes.append(i)
-            else:
-                # If neighbours average is zero, any positive spike is infinite ratio
-                if energies[i] > 0:
-                    spikes.append(i)
-        return spikes
+        energies = np.array([m["total_energy"] for m in metrics_series], dtype=np.float64)
+        current = energies[1:-1]
+        # Average of neighbours, not including the current point
+        avg_neighbors = (energies[:-2] + energies[2:]) / 2.0
+        # If the neighbours average is not positive, any positive value is a spike
+        spikes = np.where(avg_neighbors > 0, current > avg_neighbors * threshold_factor, current > 0)
+        return (np.flatnonzero(spikes) + 1).tolist()
@@ -0,0 +1,92 @@
+# src/storage/births_cache.py
+"""In-process LRU cache of job births.
+
+A render node renders many frames of the same job in a row; without a
+cache every frame re-fetches (or regenerates) the job's births. The cache
+keeps the columnar ParticleBirthArray of recently used jobs, bounded by
+the total bytes of their columns, and evicts the least recently used job
+first. ClusterManager only caches a job's births once they are completely
+written, and drops an entry whose length no longer matches the job's
+births_count or whose births this process changes.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sim.particles import ParticleBirthArray
+
+
+@dataclass
+class BirthsCacheStats:
+    """Lookup and eviction counters of a BirthsCache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class BirthsCache:
+    """Births of recently used jobs, keyed by job_id, within max_bytes."""
+
+    def __init__(self, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.stats = BirthsCacheStats()
+        self._entries: OrderedDict[int, ParticleBirthArray] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._entries
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of all cached columns."""
+        return self._bytes
+
+    def get(self, job_id: int) -> ParticleBirthArray | None:
+        """Return a job's cached births (marking them most recently used), or None."""
+        births = self._entries.get(job_id)
+        if births is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(job_id)
+        self.stats.hits += 1
+        return births
+
+    def put(self, job_id: int, births: ParticleBirthArray) -> bool:
+        """Cache a job's births, evicting least recently used jobs to make room.
+
+        Births larger than max_bytes are not cached; returns whether they were.
+        """
+        self.invalidate(job_id)
+        size = births.nbytes
+        if size > self.max_bytes:
+            return False
+        while self._bytes + size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.stats.evictions += 1
+        self._entries[job_id] = births
+        self._bytes += size
+        return True
+
+    def invalidate(self, job_id: int) -> None:
+        """Drop a job's births (e.g. after they were rewritten)."""
+        births = self._entries.pop(job_id, None)
+        if births is not None:
+            self._bytes -= births.nbytes
+
+    def clear(self) -> None:
+        """Drop every job."""
+        self._entries.clear()
+        self._bytes = 0
@@ -11,14 +11,107 @@ IMPORTANT: This layer contains NO physics constants.
 Physics constants are read from the job config (database).
 """
 
+import contextlib
+import dataclasses
 import json
+import math
+import shutil
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 from DBCore.base import DatabaseProvider
 from DBCore.ir import IRBulkInsert, IRInsert, IRSelect, IRUpdate
 from DBCore.ir.conditions import Condition, LogicalExpression
 
-from sim.particles import ParticleBirth
+from lib.camera import CameraFrustum, CullStats, cull_frame
+from lib.lod import LOD_MODES
+from sim.anomaly import DEFAULT_THRESHOLD, DEFAULT_WINDOW, AnomalyResult, detect_anomalies
+from sim.metrics import MetricsAccumulator, accumulate_frames
+from sim.particles import (
+    BirthsChecksum,
+    ConicalFountain,
+    FountainSimulator,
+    FrameState,
+    ParticleBirth,
+    ParticleBirthArray,
+    ParticleState,
+    evaluate_births,
+    evaluate_births_at_times,
+    shutter_offsets,
+    state_dtype,
+)
+from sim.sweep import SweepEvaluator
+from sim.temporal import TemporalIndex
+from sim.timeline import Timeline, compute_timeline, frame_times
+from sim.validator import PhysicsValidator
+from storage.births_cache import BirthsCache
+from storage.shared_births import SharedBirthsCache
+
+# Per-job verdict of PhysicsValidator.validate_births (render_jobs.births_validation).
+BIRTHS_VALIDATION = ("unchecked", "valid", "invalid")
+
+# Rows per IRBulkInsert statement when storing births.
+INSERT_BATCH_SIZE = 50_000
+
+# Rows per INSERT ... ON DUPLICATE KEY UPDATE statement for simulation_metrics.
+METRICS_BATCH_SIZE = 1_000
+
+# Value columns of simulation_metrics (besides job_id and time).
+SIMULATION_METRIC_COLUMNS = (
+    "particle_count",
+    "min_x", "max_x", "min_y", "max_y", "min_z", "max_z",
+    "avg_velocity", "max_velocity",
+    "kinetic_energy", "potential_energy", "total_energy",
+    "momentum_x", "momentum_y", "momentum_z",
+    "nan_count", "inf_count",
+)
+
+# Emitter types that procedural jobs can store (job_emitters.emitter_type).
+EMITTER_TYPES: dict[str, type[ConicalFountain]] = {"conical_fountain": ConicalFountain}
+
+
+def _births_from_rows(rows: list[dict[str, Any]], precision: str = "float64") -> ParticleBirthArray:
+    """Convert particle_births rows (joined with texture_name) into columns."""
+    dtype = state_dtype(precision)
+    textures: dict[str, int] = {}
+    codes = [textures.setdefault(r["texture_name"], len(textures)) for r in rows]
+    return ParticleBirthArray(
+        particle_id=np.array([r["particle_id"] for r in rows], dtype=np.int64),
+        texture_code=np.array(codes, dtype=np.int32),
+        seed=np.array([r["seed"] for r in rows], dtype=np.int64),
+        textures=list(textures),
+        **{
+            name: np.array(
+                [np.nan if r[name] is None else r[name] for r in rows],
+                dtype=dtype if name in ParticleBirthArray.STATE_COLUMNS else np.float64,
+            )
+            for name in ParticleBirthArray.FLOAT_COLUMNS
+        },
+    )
+
+
+def _round_float32(particle: dict[str, Any]) -> dict[str, Any]:
+    """Replace float values by the shortest decimal that round-trips through float32."""
+    return {k: float(str(np.float32(v))) if isinstance(v, float) else v for k, v in particle.items()}
+
+
+def metrics_rows(times: np.ndarray, accumulators: Sequence[MetricsAccumulator]) -> list[dict[str, Any]]:
+    """simulation_metrics rows (every column) from per-time accumulators.
+
+    Columns without a value (bounds of empty frames) and non-finite values,
+    which FLOAT columns cannot hold, are stored as NULL.
+    """
+    rows = []
+    for t, acc in zip(times.tolist(), accumulators, strict=True):
+        metrics = acc.result()
+        row = {"time": t}
+        for column in SIMULATION_METRIC_COLUMNS:
+            value = metrics.get(column)
+            row[column] = value if value is None or math.isfinite(value) else None
+        rows.append(row)
+    return rows
 
 
 class ClusterManager:
@@ -27,8 +120,38 @@ class ClusterManager:
     Uses DBCore IR for all database operations.
     """
 
-    def __init__(self, db: DatabaseProvider):
+    def __init__(
+        self,
+        db: DatabaseProvider,
+        precision: str = "float64",
+        shared_births: SharedBirthsCache | None = None,
+        births_bundle_dir: str | Path | None = None,
+        births_cache_bytes: int = 0,
+    ):
         self.db = db
+        # Precision of the births' state columns held in memory ("float32"
+        # matches the DB's FLOAT columns and halves births and frames)
+        self.precision = state_dtype(precision).name
+        # Births regenerated for the most recent procedural job (job_id, births)
+        self._procedural_births: tuple[int, ParticleBirthArray] | None = None
+        # Kept/culled counts of the last frustum-culled get_particles_at_time
+        self.last_cull_stats: CullStats | None = None
+        # Births shared with the other render workers on this node, and the
+        # job this manager currently holds a reference to
+        self.shared_births = shared_births
+        self._shared_job: int | None = None
+        # Directory (e.g. on the NFS mount) holding memory-mappable births
+        # bundles of stored jobs, one per job and births_count, written by
+        # the first reader of the complete births
+        self.births_bundle_dir = None if births_bundle_dir is None else Path(births_bundle_dir)
+        # LRU cache of recently used jobs' births (disabled when 0 bytes),
+        # and jobs whose births were too large to cache
+        self.births_cache = BirthsCache(births_cache_bytes) if births_cache_bytes > 0 else None
+        self._uncached_jobs: set[int] = set()
+        # Sweep over the births of the job whose frames were last evaluated
+        # from memory (job_id, sweep); render nodes mostly ask for a job's
+        # frames in increasing time order
+        self._sweep: tuple[int, SweepEvaluator] | None = None
 
     # --------------------------------------------------------------------------
     # Texture and Preset Management
@@ -128,11 +251,23 @@ class ClusterManager:
         gravity: float = 9.81,
         water_level: float = 0.0,
         preset_id: int | None = None,
+        generation_mode: str = "stored",
+        lod_mode: str = "off",
+        lod_min_pixels: float = 0.5,
     ) -> int:
         """Create a new render job with physics constants and optional preset.
 
+        generation_mode is "stored" (births in particle_births) or "procedural"
+        (emitter definitions in job_emitters, births regenerated on demand).
+        lod_mode ("off", "drop" or "merge") and lod_min_pixels control the
+        render-time screen-space LOD (see lib.lod).
+
         Returns job_id.
         """
+        if generation_mode not in ("stored", "procedural"):
+            raise ValueError(f"Unknown generation_mode '{generation_mode}'")
+        if lod_mode not in LOD_MODES:
+            raise ValueError(f"Unknown lod_mode '{lod_mode}'")
         insert = IRInsert(
             table="render_jobs",
             values={
@@ -145,20 +280,31 @@ class ClusterManager:
                 "gravity": gravity,
                 "water_level": water_level,
                 "preset_id": preset_id,
+                "generation_mode": generation_mode,
+                "lod_mode": lod_mode,
+                "lod_min_pixels": lod_min_pixels,
             },
         )
         await self.db.execute_ir(insert)
         return await self._last_insert_id()
 
     async def get_job_config(self, job_id: int) -> dict[str, Any]:
-        """Retrieve gravity and water_level for a job."""
+        """Retrieve gravity, water_level, generation_mode and births_count for a job.
+
+        births_count is None while the job's births are still being written.
+        """
         rows = await self.db.fetch_all(
-            "SELECT gravity, water_level FROM render_jobs WHERE job_id = %s",
+            "SELECT gravity, water_level, generation_mode, births_count FROM render_jobs WHERE job_id = %s",
             (job_id,),
         )
         if not rows:
             raise ValueError(f"Job {job_id} not found")
-        return {"gravity": rows[0]["gravity"], "water_level": rows[0]["water_level"]}
+        return {
+            "gravity": rows[0]["gravity"],
+            "water_level": rows[0]["water_level"],
+            "generation_mode": rows[0].get("generation_mode") or "stored",
+            "births_count": rows[0].get("births_count"),
+        }
 
     async def update_job_status(self, job_id: int, status: str) -> None:
         """Update job status (pending, in progress, completed)."""
@@ -169,121 +315,486 @@ class ClusterManager:
         )
         await self.db.execute_ir(update)
 
+    async def set_births_validation(self, job_id: int, verdict: str) -> None:
+        """Record a job's birth validation verdict ("unchecked", "valid" or "invalid").
+
+        Render nodes skip per-frame validation for jobs marked "valid".
+        """
+        if verdict not in BIRTHS_VALIDATION:
+            raise ValueError(f"Unknown births validation verdict '{verdict}'")
+        update = IRUpdate(
+            table="render_jobs",
+            set_values={"births_validation": verdict},
+            where=Condition("job_id", "=", job_id),
+        )
+        await self.db.execute_ir(update)
+
+    async def complete_births(self, job_id: int) -> int:
+        """Mark a job's births as completely written; returns their count.
+
+        The count (stored rows, or the particles of all emitter definitions
+        of a procedural job) is recorded in render_jobs.births_count. Births
+        are only ever appended, so the count also identifies the birth set:
+        copies of a job's births are kept only while their length matches it.
+        """
+        config = await self.get_job_config(job_id)
+        if config["generation_mode"] == "procedural":
+            sql = "SELECT COALESCE(SUM(num_particles), 0) AS births FROM job_emitters WHERE job_id = %s"
+        else:
+            sql = "SELECT COUNT(*) AS births FROM particle_births WHERE job_id = %s"
+        rows = await self.db.fetch_all(sql, (job_id,))
+        count = int(rows[0]["births"]) if rows else 0
+        await self._set_births_count(job_id, count)
+        return count
+
+    async def validate_job_births(self, job_id: int) -> tuple[bool, list[dict]]:
+        """Validate a job's births (PhysicsValidator.validate_births) and record the verdict."""
+        config = await self.get_job_config(job_id)
+        births = await self.load_births(job_id, config)
+        valid, errors = PhysicsValidator.validate_births(births, config["gravity"], config["water_level"])
+        await self.set_births_validation(job_id, "valid" if valid else "invalid")
+        return valid, errors
+
     # --------------------------------------------------------------------------
     # Particle Births (Initial Conditions)
     # --------------------------------------------------------------------------
 
-    async def insert_particle_births(self, job_id: int, births: list[ParticleBirth]) -> None:
+    async def insert_particle_births(
+        self,
+        job_id: int,
+        births: Sequence[ParticleBirth] | ParticleBirthArray,
+        batch_size: int = INSERT_BATCH_SIZE,
+    ) -> None:
         """Bulk insert particle birth records.
 
         Stores only initial conditions - the physics is evaluated at query time.
+        Accepts ParticleBirth records or a columnar ParticleBirthArray; rows are
+        built and sent in batches of batch_size so memory stays bounded.
         """
-        if not births:
+        if not len(births):
             return
+        await self._set_births_count(job_id, None)
+        self.invalidate_births(job_id)
+        if not isinstance(births, ParticleBirthArray):
+            births = ParticleBirthArray.from_births(births)
 
         # Ensure all textures exist (they should, but just in case)
-        texture_names = {b.texture for b in births}
-        for name in texture_names:
+        for name in births.textures:
             await self.ensure_texture(name)
 
         # Get texture map
         texture_map = await self._get_texture_id_map()
-
-        rows = []
-        for b in births:
-            tex_id = texture_map.get(b.texture)
+        code_to_id = []
+        for name in births.textures:
+            tex_id = texture_map.get(name)
             if tex_id is None:
-                raise RuntimeError(f"Texture '{b.texture}' not found after ensure.")
-            rows.append([
-                job_id,
-                b.particle_id,
-                b.birth_time,
-                b.x0, b.y0, b.z0,
-                b.vx0, b.vy0, b.vz0,
-                b.size,
-                tex_id,
-                b.seed,
-                b.impact_time,
-            ])
-
-        bulk = IRBulkInsert(
-            table="particle_births",
-            columns=[
-                "job_id", "particle_id", "birth_time",
-                "x0", "y0", "z0",
-                "vx0", "vy0", "vz0",
-                "size", "texture_id", "seed", "impact_time",
-            ],
-            values=rows,
+                raise RuntimeError(f"Texture '{name}' not found after ensure.")
+            code_to_id.append(tex_id)
+        texture_ids = np.array(code_to_id, dtype=np.int64)[births.texture_code]
+
+        for start in range(0, len(births), batch_size):
+            sl = slice(start, start + batch_size)
+            impact = births.impact_time[sl]
+            rows = [
+                list(row)
+                for row in zip(
+                    [job_id] * len(impact),
+                    births.particle_id[sl].tolist(),
+                    births.birth_time[sl].tolist(),
+                    births.x0[sl].tolist(), births.y0[sl].tolist(), births.z0[sl].tolist(),
+                    births.vx0[sl].tolist(), births.vy0[sl].tolist(), births.vz0[sl].tolist(),
+                    births.size[sl].tolist(),
+                    texture_ids[sl].tolist(),
+                    births.seed[sl].tolist(),
+                    [None if np.isnan(v) else v for v in impact.tolist()],
+                    strict=True,
+                )
+            ]
+            bulk = IRBulkInsert(
+                table="particle_births",
+                columns=[
+                    "job_id", "particle_id", "birth_time",
+                    "x0", "y0", "z0",
+                    "vx0", "vy0", "vz0",
+                    "size", "texture_id", "seed", "impact_time",
+                ],
+                values=rows,
+            )
+            await self.db.bulk_insert_ir(bulk)
+
+    # --------------------------------------------------------------------------
+    # Procedural Jobs (Emitter Definitions)
+    # --------------------------------------------------------------------------
+
+    async def insert_job_emitter(
+        self,
+        job_id: int,
+        emitter_index: int,
+        emitter: ConicalFountain,
+        first_particle_id: int,
+        gravity: float,
+        water_level: float,
+        checksum: str,
+    ) -> None:
+        """Store an emitter definition for a procedural job.
+
+        gravity and water_level are stored as doubles because impact times
+        depend on them; the FLOAT copies in render_jobs would not reproduce
+        the same births. checksum is the BirthsChecksum digest of the births
+        generated from this definition.
+        """
+        emitter_type = next(name for name, cls in EMITTER_TYPES.items() if isinstance(emitter, cls))
+        await self.ensure_texture(emitter.texture)
+        await self._set_births_count(job_id, None)
+        insert = IRInsert(
+            table="job_emitters",
+            values={
+                "job_id": job_id,
+                "emitter_index": emitter_index,
+                "emitter_type": emitter_type,
+                "first_particle_id": first_particle_id,
+                "num_particles": emitter.num_particles,
+                "gravity": gravity,
+                "water_level": water_level,
+                "params": json.dumps(dataclasses.asdict(emitter)),
+                "checksum": checksum,
+            },
         )
-        await self.db.bulk_insert_ir(bulk)
+        await self.db.execute_ir(insert)
+        self.invalidate_births(job_id)
+
+    async def get_job_emitters(self, job_id: int) -> list[dict[str, Any]]:
+        """Fetch the emitter definitions of a procedural job, in emitter order."""
+        return await self.db.fetch_all(
+            """
+            SELECT emitter_index, emitter_type, first_particle_id, num_particles,
+                   gravity, water_level, params, checksum
+            FROM job_emitters
+            WHERE job_id = %s
+            ORDER BY emitter_index
+            """,
+            (job_id,),
+        )
+
+    async def regenerate_births(self, job_id: int) -> ParticleBirthArray:
+        """Regenerate a procedural job's births locally from its emitters.
+
+        Each emitter's births are checked against the stored checksum, so a
+        node that does not reproduce the generator bit for bit fails loudly
+        instead of rendering different particles.
+        """
+        parts = []
+        for row in await self.get_job_emitters(job_id):
+            emitter_cls = EMITTER_TYPES.get(row["emitter_type"])
+            if emitter_cls is None:
+                raise ValueError(f"Job {job_id}: unknown emitter type '{row['emitter_type']}'")
+            emitter = emitter_cls(**json.loads(row["params"]))
+            sim = FountainSimulator(gravity=row["gravity"], water_level=row["water_level"])
+            births = sim.emit(emitter, 0, emitter.num_particles, row["first_particle_id"])
+            if BirthsChecksum.of(births) != row["checksum"]:
+                raise RuntimeError(
+                    f"Job {job_id}: regenerated births of emitter {row['emitter_index']} "
+                    "do not match the stored checksum"
+                )
+            parts.append(births)
+        if not parts:
+            raise ValueError(f"Job {job_id} has no emitter definitions")
+
+        # Checksums cover the float64 births, so convert only after verifying.
+        return ParticleBirthArray.concat(parts).astype(self.precision)
+
+    async def load_births(self, job_id: int, config: dict[str, Any]) -> ParticleBirthArray:
+        """Return a job's births from storage or by regeneration, per its generation_mode.
+
+        With a shared births cache, births another worker on this node has
+        already loaded are mapped from shared memory; otherwise they are
+        loaded and published for the others. Moving to another job releases
+        the previous one. Without one, the in-process births cache (if
+        enabled) and the last regenerated procedural job serve jobs loaded
+        before.
+
+        Births are kept or shared only once the job's births are complete
+        (config's births_count is set) and match that count; until then
+        every call loads them afresh.
+        """
+        count = config.get("births_count")
+        procedural = config.get("generation_mode") == "procedural"
+        shared = self.shared_births
+        if shared is not None and self._shared_job not in (None, job_id):
+            shared.release(self._shared_job)
+            self._shared_job = None
+        if count is not None:
+            births = self._kept_births(job_id, count)
+            if births is not None:
+                return births
+
+        if procedural:
+            births = await self.regenerate_births(job_id)
+        else:
+            births = await self.load_stored_births(job_id, count)
+
+        if count is None or len(births) != count:
+            # Still being written, or changed since the config was read
+            return births
+        if shared is not None:
+            self._shared_job = job_id
+            return shared.publish(job_id, births)
+        if procedural:
+            self._procedural_births = (job_id, births)
+        if self.births_cache is not None and not self.births_cache.put(job_id, births):
+            self._uncached_jobs.add(job_id)
+        return births
+
+    def invalidate_births(self, job_id: int) -> None:
+        """Forget any births of a job held in memory, so the next load fetches them again."""
+        if self.births_cache is not None:
+            self.births_cache.invalidate(job_id)
+        self._uncached_jobs.discard(job_id)
+        if self._procedural_births is not None and self._procedural_births[0] == job_id:
+            self._procedural_births = None
+        if self._sweep is not None and self._sweep[0] == job_id:
+            self._sweep = None
+
+    def bundle_path(self, job_id: int, births_count: int) -> Path | None:
+        """Births bundle directory of a job's complete births, or None without a births_bundle_dir.
+
+        The name carries births_count, so a bundle written before more births
+        were appended is never mapped for the new birth set.
+        """
+        if self.births_bundle_dir is None:
+            return None
+        return self.births_bundle_dir / f"job_{job_id}_n{births_count}"
+
+    async def load_stored_births(self, job_id: int, births_count: int | None = None) -> ParticleBirthArray:
+        """Return a stored job's births, memory-mapped from its bundle when one is configured.
+
+        The first node to need a job runs the particle_births query once and
+        writes the bundle; every later load maps the columns lazily instead.
+        Bundles are only written and read for complete births (births_count
+        from the job config), and only when they hold exactly that many
+        births; otherwise the births are queried.
+        """
+        bundle = None if births_count is None else self.bundle_path(job_id, births_count)
+        if bundle is None:
+            return await self.get_births_array(job_id)
+        if bundle.exists():
+            births = ParticleBirthArray.load(bundle)
+            if len(births) == births_count:
+                return births.astype(self.precision)
+            return await self.get_births_array(job_id)
+        births = await self.get_births_array(job_id)
+        if len(births) != births_count:
+            # Births changed since the job config was read
+            return births
+        # Another node may have written the same bundle in the meantime.
+        with contextlib.suppress(FileExistsError):
+            births.save(bundle)
+        self._remove_stale_bundles(job_id, bundle)
+        return ParticleBirthArray.load(bundle).astype(self.precision)
 
     # --------------------------------------------------------------------------
     # Time-Based Particle Queries (Core API)
     # --------------------------------------------------------------------------
 
+    async def get_births_array(self, job_id: int) -> ParticleBirthArray:
+        """Fetch all birth records of a job as a columnar ParticleBirthArray."""
+        rows = await self.db.fetch_all(
+            """
+            SELECT particle_id, birth_time, x0, y0, z0,
+                   vx0, vy0, vz0, size, texture_name, seed, impact_time
+            FROM particle_births pb
+            JOIN textures tx ON pb.texture_id = tx.texture_id
+            WHERE job_id = %s
+            """,
+            (job_id,),
+        )
+        return _births_from_rows(rows, self.precision)
+
+    async def get_alive_births_array(self, job_id: int, t: float) -> ParticleBirthArray:
+        """Fetch only the birth records of a stored job that are alive at time t.
+
+        The alive window (birth_time <= t < impact_time, a NULL impact_time
+        never dies) is filtered by the database on the job_alive index, so
+        transfer and conversion scale with the alive set, not the job.
+        """
+        rows = await self.db.fetch_all(
+            """
+            SELECT particle_id, birth_time, x0, y0, z0,
+                   vx0, vy0, vz0, size, texture_name, seed, impact_time
+            FROM particle_births pb
+            JOIN textures tx ON pb.texture_id = tx.texture_id
+            WHERE job_id = %s AND birth_time <= %s AND (impact_time IS NULL OR impact_time > %s)
+            """,
+            (job_id, t, t),
+        )
+        return _births_from_rows(rows, self.precision)
+
     async def get_particles_at_time(
         self,
         job_id: int,
         t: float,
-    ) -> list[dict[str, Any]]:
-        """Return alive particle states at absolute simulation time t.
+        frustum: CameraFrustum | None = None,
+        shutter: float = 0.0,
+        samples: int = 1,
+    ) -> list[ParticleState]:
+        """Return alive particle states at absolute simulation time t, as ParticleState records.
 
         This is the primary API for the renderer.
         Physics is evaluated analytically from stored initial conditions.
         No frame semantics are exposed - t is absolute time.
+
+        The records are read-only mappings with the keys of the state dicts
+        (and equal to them); dict(state) gives a mutable copy.
+
+        With a frustum, particles the camera cannot see are dropped before
+        the records are built; the counts are left in last_cull_stats.
+
+        With samples > 1 each record also carries a "trail" of samples
+        positions over [t - shutter, t] for motion blur.
+
+        Stored jobs without a local copy of their births (shared cache,
+        bundle or in-process cache) fetch only the births alive at t;
+        otherwise the whole job is loaded once and a SweepEvaluator moves
+        its alive set from the previously requested time to t. The records
+        come in no particular order.
         """
         config = await self.get_job_config(job_id)
-        gravity = config["gravity"]
-        water_level = config["water_level"]
+        offsets = shutter_offsets(shutter, samples) if samples > 1 else None
+        if self._loads_whole_job(job_id, config):
+            births = await self.load_births(job_id, config)
+            state = self._job_sweep(job_id, births, config).evaluate(t, offsets)
+        else:
+            births = await self.get_alive_births_array(job_id, t)
+            state = evaluate_births(births, t, config["gravity"], config["water_level"], offsets=offsets)
+        if frustum is not None:
+            state, self.last_cull_stats = cull_frame(state, frustum)
+        return state.to_states()
+
+    async def iter_frame_states(self, job_id: int, times: Iterable[float]) -> AsyncIterator[FrameState]:
+        """Yield a FrameState for each absolute time, fetching the births once.
+
+        Evaluation is batched over times (see evaluate_births_at_times) and
+        driven by a TemporalIndex built once per call, so a whole clip costs
+        one fetch and one sweep instead of one full scan per frame.
+        """
+        config = await self.get_job_config(job_id)
+        births = await self.load_births(job_id, config)
+        index = TemporalIndex.from_births(births)
+        for state in evaluate_births_at_times(births, times, config["gravity"], config["water_level"], index=index):
+            yield state
 
-        births = await self.db.fetch_all(
-            """
-            SELECT particle_id, birth_time, x0, y0, z0,
-                   vx0, vy0, vz0, size, texture_name, impact_time
-            FROM particle_births pb
-            JOIN textures tx ON pb.texture_id = tx.texture_id
-            WHERE job_id = %s
-            """,
+    # --------------------------------------------------------------------------
+    # Simulation Metrics
+    # --------------------------------------------------------------------------
+
+    async def upsert_simulation_metrics(
+        self,
+        job_id: int,
+        rows: Sequence[dict[str, Any]],
+        batch_size: int = METRICS_BATCH_SIZE,
+    ) -> None:
+        """Insert or update simulation_metrics rows keyed by (job_id, time).
+
+        Every row must carry "time" and the same metric keys; only those
+        columns are written, so partial rows leave other columns untouched.
+        Rows are sent as multi-row statements of batch_size rows.
+        """
+        if not rows:
+            return
+        columns = ["time", *(c for c in SIMULATION_METRIC_COLUMNS if c in rows[0])]
+        placeholders = "(" + ", ".join(["%s"] * (len(columns) + 1)) + ")"
+        updates = ", ".join(f"{c} = VALUES({c})" for c in columns[1:])
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            sql = (
+                f"INSERT INTO simulation_metrics (job_id, {', '.join(columns)}) VALUES "
+                + ", ".join([placeholders] * len(batch))
+                + f" ON DUPLICATE KEY UPDATE {updates}"
+            )
+            params = tuple(v for row in batch for v in (job_id, *(row.get(c) for c in columns)))
+            await self.db.execute_raw(sql, params, unsafe=True)
+
+    async def get_simulation_metrics(self, job_id: int) -> list[dict[str, Any]]:
+        """All simulation_metrics rows of a job, ordered by time."""
+        return await self.db.fetch_all(
+            f"SELECT time, {', '.join(SIMULATION_METRIC_COLUMNS)} FROM simulation_metrics "
+            "WHERE job_id = %s ORDER BY time",
             (job_id,),
         )
 
-        states = []
-        for b in births:
-            if t < b["birth_time"]:
-                continue
-            if b["impact_time"] is not None and t >= b["impact_time"]:
-                continue
-
-            dt = t - b["birth_time"]
-            x = b["x0"] + b["vx0"] * dt
-            y = b["y0"] + b["vy0"] * dt - 0.5 * gravity * dt * dt
-            z = b["z0"] + b["vz0"] * dt
-
-            if y <= water_level:
-                continue
-
-            states.append({
-                "particle_id": b["particle_id"],
-                "position_x": float(x),
-                "position_y": float(y),
-                "position_z": float(z),
-                "velocity_x": float(b["vx0"]),
-                "velocity_y": float(b["vy0"] - gravity * dt),
-                "velocity_z": float(b["vz0"]),
-                "size": float(b["size"]),
-                "texture_name": b["texture_name"],
-                "status": "alive",
-            })
-
-        return states
+    async def detect_job_anomalies(
+        self,
+        job_id: int,
+        window: int = DEFAULT_WINDOW,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> dict[str, AnomalyResult]:
+        """Run the sim.anomaly detectors over a job's stored metrics series.
+
+        Indices in the results refer to the rows of get_simulation_metrics.
+        """
+        return detect_anomalies(await self.get_simulation_metrics(job_id), window, threshold)
+
+    async def store_job_timeline(self, job_id: int, births: ParticleBirthArray | None = None) -> Timeline:
+        """Compute a job's analytic per-frame timeline and store it in simulation_metrics.
+
+        Alive counts, energies and momentum for every frame come from one
+        pass over the births (see sim.timeline); no frame is evaluated.
+        births may be passed when the caller already holds them.
+        """
+        config = await self.get_job_config(job_id)
+        rows = await self.db.fetch_all(
+            "SELECT fps, total_frames FROM render_jobs WHERE job_id = %s",
+            (job_id,),
+        )
+        if births is None:
+            births = await self.load_births(job_id, config)
+        times = frame_times(rows[0]["total_frames"], rows[0]["fps"])
+        timeline = compute_timeline(births, times, config["gravity"])
+        await self.upsert_simulation_metrics(job_id, timeline.to_metrics())
+        return timeline
+
+    async def store_job_metrics(
+        self,
+        job_id: int,
+        births: ParticleBirthArray | None = None,
+        batch_size: int = METRICS_BATCH_SIZE,
+    ) -> list[dict[str, Any]]:
+        """Evaluate every frame of a job and store full simulation_metrics rows.
+
+        Unlike store_job_timeline this fills every column (bounds and
+        velocities too), from batched frame evaluation; rows are written
+        with chunked upserts of batch_size rows. Returns the rows.
+        """
+        config = await self.get_job_config(job_id)
+        rows = await self.db.fetch_all(
+            "SELECT fps, total_frames FROM render_jobs WHERE job_id = %s",
+            (job_id,),
+        )
+        if births is None:
+            births = await self.load_births(job_id, config)
+        times = frame_times(rows[0]["total_frames"], rows[0]["fps"])
+        accumulators = [MetricsAccumulator(config["gravity"]) for _ in times]
+        accumulate_frames(
+            accumulators, births, times, config["gravity"], config["water_level"],
+            index=TemporalIndex.from_births(births),
+        )
+        metrics = metrics_rows(times, accumulators)
+        await self.upsert_simulation_metrics(job_id, metrics, batch_size)
+        return metrics
 
     # --------------------------------------------------------------------------
     # Frame Cache (Optional, for Render Performance)
     # --------------------------------------------------------------------------
 
-    async def cache_frame_particles(self, job_id: int, frame: int, particle_data: list[dict]) -> None:
-        """Cache pre-computed particle data for a specific frame."""
+    async def cache_frame_particles(self, job_id: int, frame: int, particle_data: Sequence[Mapping[str, Any]]) -> None:
+        """Cache pre-computed particle data for a specific frame.
+
+        In float32 precision floats are written with their shortest float32
+        representation, which roughly halves the cached JSON.
+        """
+        particle_data = [dict(p) for p in particle_data]
+        if self.precision == "float32":
+            particle_data = [_round_float32(p) for p in particle_data]
         data_json = json.dumps(particle_data)
         await self.db.execute_raw(
             """
@@ -309,6 +820,50 @@ class ClusterManager:
     # Helper Methods
     # --------------------------------------------------------------------------
 
+    async def _set_births_count(self, job_id: int, count: int | None) -> None:
+        """Set render_jobs.births_count (None while births are being written)."""
+        update = IRUpdate(
+            table="render_jobs",
+            set_values={"births_count": count},
+            where=Condition("job_id", "=", job_id),
+        )
+        await self.db.execute_ir(update)
+
+    def _remove_stale_bundles(self, job_id: int, current: Path) -> None:
+        """Delete the job's bundles for other births counts (best effort)."""
+        for bundle in self.births_bundle_dir.glob(f"job_{job_id}_n*"):
+            if bundle != current:
+                shutil.rmtree(bundle, ignore_errors=True)
+
+    def _job_sweep(self, job_id: int, births: ParticleBirthArray, config: dict[str, Any]) -> SweepEvaluator:
+        """The sweep over a job's births, replacing the sweep of other jobs or birth counts.
+
+        Births are only appended, so a sweep over as many births of the job
+        still holds the same birth set.
+        """
+        if self._sweep is None or self._sweep[0] != job_id or len(self._sweep[1].births) != len(births):
+            self._sweep = (job_id, SweepEvaluator(births, config["gravity"], config["water_level"]))
+        return self._sweep[1]
+
+    def _kept_births(self, job_id: int, count: int) -> ParticleBirthArray | None:
+        """A job's count births shared on this node or held in this process, if any."""
+        if self.shared_births is not None:
+            births = self.shared_births.get(job_id, count)
+            if births is None:
+                return None
+            self._shared_job = job_id
+            return births.astype(self.precision)
+        if self._procedural_births is not None and self._procedural_births[0] == job_id:
+            births = self._procedural_births[1]
+        elif self.births_cache is not None:
+            births = self.births_cache.get(job_id)
+        else:
+            return None
+        if births is not None and len(births) != count:
+            self.invalidate_births(job_id)
+            return None
+        return births
+
     async def _last_insert_id(self) -> int:
         """Fetch last auto-increment ID."""
         rows = await self.db.fetch_all("SELECT LAST_INSERT_ID()")
@@ -316,6 +871,22 @@ class ClusterManager:
             return rows[0]["LAST_INSERT_ID()"]
         raise RuntimeError("Could not retrieve last insert ID")
 
+    def _loads_whole_job(self, job_id: int, config: dict[str, Any]) -> bool:
+        """Whether frame queries should use the job's full births (load_births).
+
+        Procedural births are regenerated, and shared, bundled or cached
+        births are local after the first frame; other stored jobs (also
+        those too large for the births cache, and jobs whose births are
+        still being written) are filtered in SQL.
+        """
+        if config.get("generation_mode") == "procedural":
+            return True
+        return config.get("births_count") is not None and (
+            self.shared_births is not None
+            or self.births_bundle_dir is not None
+            or (self.births_cache is not None and job_id not in self._uncached_jobs)
+        )
+
     # --------------------------------------------------------------------------
     # Frame Management (for render loop)
     # --------------------------------------------------------------------------
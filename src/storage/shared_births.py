@@ -0,0 +1,268 @@
+# src/storage/shared_births.py
+"""Node-local births shared between render worker processes.
+
+Without this every render process on a machine fetches and holds its own
+copy of a job's births. The first worker to load a job publishes the
+columns in a ``multiprocessing.shared_memory`` segment named after the job
+and its number of births; the other workers map the same segment
+zero-copy. Births are only ever appended to a job, so a segment never
+serves a different birth set. Each segment records the caches (PID and
+a per-cache token) using it and is unlinked when the last one releases it; holders
+that died without releasing are dropped whenever the table is updated,
+and remove_orphans unlinks segments no live process holds (e.g. at node
+start). All workers sharing segments must share a PID namespace.
+
+Segment layout: int64 header length, int64 holder slot count, an int64
+PID and token per holder slot (PID 0 when free), a JSON header (textures, column dtypes
+and offsets), then the columns, each aligned to 64 bytes. Holder tables
+and segment creation are serialised with an ``flock`` on a lock file
+shared by all workers using the same prefix.
+"""
+
+import fcntl
+import itertools
+import json
+import os
+import re
+import struct
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+
+from sim.particles import ParticleBirthArray
+
+_PREFIX = struct.Struct("<qq")  # header length, holder slots
+_ALIGN = 64
+
+# Caches that can hold one segment at the same time.
+HOLDER_SLOTS = 256
+_SLOT_SIZE = 16  # PID, token
+
+# Tokens telling apart the caches of one process.
+_TOKENS = itertools.count(1)
+
+# Where POSIX shared memory segments appear as files (Linux).
+SHM_DIR = "/dev/shm"
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _alive(pid: int) -> bool:
+    """Whether a process with this PID exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedBirthsCache:
+    """Births of render jobs published in shared memory, keyed by job_id.
+
+    A process holds one reference per job it has loaded through get or
+    publish, until release (or close) drops it; loading another birth count
+    of the same job releases the previous one.
+    """
+
+    def __init__(self, prefix: str = "psim_births", lock_path: str | None = None):
+        self.prefix = prefix
+        self.lock_path = lock_path or os.path.join(tempfile.gettempdir(), f"{prefix}.lock")
+        self._segments: dict[int, tuple[SharedMemory, ParticleBirthArray]] = {}
+        self._holder = (os.getpid(), next(_TOKENS))
+        # Segments whose mappings are still exported to callers' arrays
+        self._unclosed: list[SharedMemory] = []
+
+    def segment_name(self, job_id: int, count: int) -> str:
+        """Shared memory name of the segment of a job's births when it has count births."""
+        return f"{self.prefix}_{job_id}_n{count}"
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def get(self, job_id: int, count: int) -> ParticleBirthArray | None:
+        """Map a job's count births if some worker on this node has published them.
+
+        Returns None when there is no segment of that many births yet.
+        """
+        if self._held(job_id, count):
+            return self._segments[job_id][1]
+        with self._locked():
+            try:
+                shm = SharedMemory(name=self.segment_name(job_id, count), track=False)
+            except FileNotFoundError:
+                return None
+            self._add_holder(shm)
+        return self._attach(job_id, shm)
+
+    def publish(self, job_id: int, births: ParticleBirthArray) -> ParticleBirthArray:
+        """Copy births into a new segment and return the shared, read-only view.
+
+        If another worker published the same births first its segment is used instead.
+        """
+        if self._held(job_id, len(births)):
+            return self._segments[job_id][1]
+        header, data_size = self._layout(births)
+        header_bytes = json.dumps(header).encode()
+        data_start = _aligned(_PREFIX.size + _SLOT_SIZE * HOLDER_SLOTS + len(header_bytes))
+        name = self.segment_name(job_id, len(births))
+        with self._locked():
+            try:
+                shm = SharedMemory(name=name, create=True, size=data_start + data_size, track=False)
+            except FileExistsError:
+                shm = SharedMemory(name=name, track=False)
+            else:
+                _PREFIX.pack_into(shm.buf, 0, len(header_bytes), HOLDER_SLOTS)
+                header_start = _PREFIX.size + _SLOT_SIZE * HOLDER_SLOTS
+                shm.buf[header_start:header_start + len(header_bytes)] = header_bytes
+                for column_name, column in header["columns"].items():
+                    values = getattr(births, column_name)
+                    start = data_start + column["offset"]
+                    shm.buf[start:start + values.nbytes] = np.ascontiguousarray(values).view(np.uint8)
+            self._add_holder(shm)
+        return self._attach(job_id, shm)
+
+    def release(self, job_id: int) -> None:
+        """Drop this process's reference; the last live holder unlinks the segment."""
+        entry = self._segments.pop(job_id, None)
+        if entry is None:
+            return
+        shm = entry[0]
+        del entry
+        with self._locked():
+            if not self._remove_holder(shm):
+                shm.unlink()
+        self._unclosed.append(shm)
+        self._close_unused()
+
+    def remove_orphans(self) -> list[str]:
+        """Unlink this prefix's segments that no live process holds; returns their names.
+
+        Segments outlive processes that die without releasing them; run this
+        when a node starts. Only Linux exposes the segments (under SHM_DIR),
+        elsewhere nothing is removed.
+        """
+        try:
+            names = os.listdir(SHM_DIR)
+        except FileNotFoundError:
+            return []
+        pattern = re.compile(rf"{re.escape(self.prefix)}_\d+_n\d+")
+        removed = []
+        for name in sorted(n for n in names if pattern.fullmatch(n)):
+            with self._locked():
+                try:
+                    shm = SharedMemory(name=name, track=False)
+                except FileNotFoundError:
+                    continue
+                if not self._live_holders(shm):
+                    shm.unlink()
+                    removed.append(name)
+            shm.close()
+        return removed
+
+    def close(self) -> None:
+        """Release every job this process holds."""
+        for job_id in list(self._segments):
+            self.release(job_id)
+
+    @property
+    def job_ids(self) -> list[int]:
+        """Jobs this process currently holds a reference to."""
+        return list(self._segments)
+
+    # --------------------------------------------------------------------------
+    # Helper Methods
+    # --------------------------------------------------------------------------
+
+    @staticmethod
+    def _layout(births: ParticleBirthArray) -> tuple[dict[str, Any], int]:
+        """Header describing births' columns, and the bytes the columns need."""
+        columns = {}
+        offset = 0
+        for name in ParticleBirthArray.COLUMNS:
+            values = getattr(births, name)
+            columns[name] = {"dtype": values.dtype.str, "offset": offset}
+            offset = _aligned(offset + values.nbytes)
+        return {"count": len(births), "textures": births.textures, "columns": columns}, max(offset, 1)
+
+    def _held(self, job_id: int, count: int) -> bool:
+        """Whether this process maps the job's count births; releases another count."""
+        entry = self._segments.get(job_id)
+        if entry is None:
+            return False
+        if len(entry[1]) == count:
+            return True
+        del entry
+        self.release(job_id)
+        return False
+
+    @staticmethod
+    def _read_holders(shm: SharedMemory) -> list[tuple[int, int]]:
+        """The segment's holder slots as (pid, token), with dead holders freed."""
+        _, slots = _PREFIX.unpack_from(shm.buf, 0)
+        values = struct.unpack_from(f"<{2 * slots}q", shm.buf, _PREFIX.size)
+        holders = list(zip(values[::2], values[1::2], strict=True))
+        return [(pid, token) if pid and _alive(pid) else (0, 0) for pid, token in holders]
+
+    @staticmethod
+    def _write_holders(shm: SharedMemory, holders: list[tuple[int, int]]) -> int:
+        """Store the holder slots; returns the number of holders."""
+        struct.pack_into(f"<{2 * len(holders)}q", shm.buf, _PREFIX.size, *itertools.chain(*holders))
+        return sum(1 for pid, _ in holders if pid)
+
+    def _add_holder(self, shm: SharedMemory) -> None:
+        """Record this cache as a holder of the segment (caller holds the lock)."""
+        holders = self._read_holders(shm)
+        if self._holder not in holders:
+            if (0, 0) not in holders:
+                raise RuntimeError(f"Shared births segment {shm.name} has no free holder slot")
+            holders[holders.index((0, 0))] = self._holder
+        self._write_holders(shm, holders)
+
+    def _remove_holder(self, shm: SharedMemory) -> int:
+        """Drop this cache as a holder (caller holds the lock); returns the live holders left."""
+        holders = [(0, 0) if h == self._holder else h for h in self._read_holders(shm)]
+        return self._write_holders(shm, holders)
+
+    def _live_holders(self, shm: SharedMemory) -> int:
+        """Number of live holders of the segment (caller holds the lock)."""
+        return self._write_holders(shm, self._read_holders(shm))
+
+    def _attach(self, job_id: int, shm: SharedMemory) -> ParticleBirthArray:
+        """Build read-only column views over a segment."""
+        header_length, slots = _PREFIX.unpack_from(shm.buf, 0)
+        header_start = _PREFIX.size + _SLOT_SIZE * slots
+        header = json.loads(bytes(shm.buf[header_start:header_start + header_length]))
+        data_start = _aligned(header_start + header_length)
+        columns = {}
+        for name, column in header["columns"].items():
+            values = np.ndarray(header["count"], dtype=np.dtype(column["dtype"]), buffer=shm.buf,
+                                offset=data_start + column["offset"])
+            values.flags.writeable = False
+            columns[name] = values
+        births = ParticleBirthArray(textures=header["textures"], **columns)
+        self._segments[job_id] = (shm, births)
+        return births
+
+    def _close_unused(self) -> None:
+        """Unmap released segments once no arrays view them any more."""
+        still_exported = []
+        for shm in self._unclosed:
+            try:
+                shm.close()
+            except BufferError:
+                still_exported.append(shm)
+        self._unclosed = still_exported
@@ -190,6 +190,11 @@ async def cluster_with_schema(db_provider):
             gravity FLOAT NOT NULL DEFAULT 9.81,
             water_level FLOAT NOT NULL DEFAULT 0.0,
             preset_id INTEGER,
+            generation_mode VARCHAR(20) NOT NULL DEFAULT 'stored',
+            lod_mode VARCHAR(10) NOT NULL DEFAULT 'off',
+            lod_min_pixels FLOAT NOT NULL DEFAULT 0.5,
+            births_validation ENUM('unchecked','valid','invalid') NOT NULL DEFAULT 'unchecked',
+            births_count INTEGER DEFAULT NULL,
             status VARCHAR(20) DEFAULT 'pending',
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
@@ -263,6 +268,22 @@ async def cluster_with_schema(db_provider):
         )
     """, unsafe=True)
 
+    await db_provider.execute_raw("""
+        CREATE TABLE IF NOT EXISTS job_emitters (
+            job_id INTEGER NOT NULL,
+            emitter_index INTEGER NOT NULL,
+            emitter_type VARCHAR(64) NOT NULL DEFAULT 'conical_fountain',
+            first_particle_id INTEGER NOT NULL,
+            num_particles INTEGER NOT NULL,
+            gravity DOUBLE NOT NULL,
+            water_level DOUBLE NOT NULL,
+            params LONGTEXT NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            PRIMARY KEY (job_id, emitter_index),
+            FOREIGN KEY (job_id) REFERENCES render_jobs(job_id) ON DELETE CASCADE
+        )
+    """, unsafe=True)
+
     await db_provider.execute_raw("""
         CREATE TABLE IF NOT EXISTS simulation_metrics (
             id INTEGER PRIMARY KEY AUTO_INCREMENT,
@@ -69,3 +69,54 @@ async def test_render_loop_with_real_db(cluster_with_schema, tmp_path):
         output_dir = Path("output") / "RenderTest"
         pov_files = list(output_dir.glob("*.pov"))
         assert len(pov_files) == 3
+
+
+async def test_render_loop_skips_frame_validation_for_valid_job(cluster_with_schema, tmp_path):
+    """Frames of a job whose births were validated are not validated again."""
+    sim = FountainSimulator(gravity=9.81, water_level=0.0)
+    sim.add_conical_fountain(
+        num_particles=10,
+        apex_x=0, apex_y=1.5, apex_z=14,
+        cone_height=2.0,
+        cone_angle_rad=3.14159 / 6,
+        base_radius=1.75,
+        speed_min=3.0, speed_max=8.0,
+        birth_start=0.0, birth_end=0.5,
+        size_min=0.01, size_max=0.03,
+        seed_offset=42,
+    )
+
+    job_id = await cluster_with_schema.create_job(
+        job_name="ValidatedRenderTest",
+        num_frames=2,
+        width=320,
+        height=240,
+        fps=10,
+        gravity=9.81,
+        water_level=0.0,
+    )
+    await cluster_with_schema.insert_particle_births(job_id, sim.particles)
+    valid, _ = await cluster_with_schema.validate_job_births(job_id)
+    assert valid
+    await cluster_with_schema.insert_frames(job_id, 2)
+
+    template = tmp_path / "template.pov"
+    template.write_text("//PARTICLE_SYSTEM")
+
+    with patch("render.run_povray", new_callable=AsyncMock) as mock_povray, \
+            patch("render.PhysicsValidator.validate_frame") as mock_validate:
+        mock_povray.return_value = 0
+
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                render_loop(
+                    cluster_with_schema,
+                    template,
+                    poll_interval=0.01,
+                    job_id=job_id,
+                ),
+                timeout=1.0,
+            )
+
+        assert mock_povray.await_count == 2
+        mock_validate.assert_not_called()
@@ -0,0 +1,45 @@
+# tests/unit/conftest.py
+"""Shared fixtures for the unit tests (no database needed)."""
+
+import dataclasses
+
+import pytest
+
+from sim.particles import ConicalFountain, FountainSimulator
+
+# ----------------------------------------------------------------------------
+# Fountain Fixtures
+# ----------------------------------------------------------------------------
+
+# A small fountain: particles are born and hit the water throughout [0, 3] s.
+FOUNTAIN = ConicalFountain(
+    num_particles=200,
+    apex_x=0, apex_y=1.5, apex_z=14,
+    cone_height=2, cone_angle_rad=0.5, base_radius=1.75,
+    speed_min=3, speed_max=8,
+    birth_start=0, birth_end=2,
+    size_min=0.01, size_max=0.03,
+    seed_offset=42,
+)
+
+
+@pytest.fixture
+def make_fountain():
+    """Factory of simulators (gravity 9.81, water at 0) holding FOUNTAIN.
+
+    Keyword arguments override FOUNTAIN's fields. With bursts > 1 the
+    fountain is emitted that many times, each burst starting burst_every
+    seconds after the previous one with its own seeds.
+    """
+    def make(bursts: int = 1, burst_every: float = 1.5, **emitter) -> FountainSimulator:
+        fountain = dataclasses.replace(FOUNTAIN, **emitter)
+        sim = FountainSimulator(gravity=9.81, water_level=0.0)
+        for k in range(bursts):
+            sim.add_emitter(dataclasses.replace(
+                fountain,
+                birth_start=fountain.birth_start + k * burst_every,
+                birth_end=fountain.birth_end + k * burst_every,
+                seed_offset=fountain.seed_offset + 1000 * k,
+            ))
+        return sim
+    return make
@@ -0,0 +1,60 @@
+# tests/unit/lib/test_camera.py
+"""Unit tests for camera frustum culling."""
+
+import numpy as np
+import pytest
+
+from lib.camera import POV_DEFAULT_ANGLE, CameraFrustum, cull_frame
+from sim.particles import FrameState
+
+FRUSTUM = CameraFrustum(location=(0.0, 0.0, 0.0), look_at=(0.0, 0.0, 1.0), angle=90.0, aspect=2.0)
+
+
+def test_pov_default_angle():
+    """POV-Ray's default camera spans 2 * atan(2/3) horizontally."""
+    assert abs(POV_DEFAULT_ANGLE - 67.38) < 0.01
+
+
+def test_visible_points():
+    """Points are kept inside the view volume and dropped behind or beside it."""
+    pos = np.array([
+        [0.0, 0.0, 5.0],    # centre
+        [4.9, 0.0, 5.0],    # inside horizontal half-angle of 45 degrees
+        [5.5, 0.0, 5.0],    # outside horizontally
+        [0.0, 2.4, 5.0],    # inside vertical (tan = 0.5)
+        [0.0, 2.6, 5.0],    # outside vertically
+        [0.0, 0.0, -1.0],   # behind the camera
+    ])
+    mask = FRUSTUM.visible(pos, np.zeros(len(pos)))
+    assert mask.tolist() == [True, True, False, True, False, False]
+
+
+def test_visible_spheres_touching_the_edge():
+    """A sphere whose centre is outside but whose surface crosses a plane is kept."""
+    pos = np.array([[5.5, 0.0, 5.0], [0.0, 0.0, -0.5]])
+    assert FRUSTUM.visible(pos, np.array([0.5, 0.6])).tolist() == [True, True]
+    assert FRUSTUM.visible(pos, np.array([0.3, 0.4])).tolist() == [False, False]
+
+
+def test_invalid_camera():
+    """Degenerate camera setups are rejected."""
+    with pytest.raises(ValueError):
+        CameraFrustum(location=(0, 0, 0), look_at=(0, 0, 0)).basis()
+    with pytest.raises(ValueError):
+        CameraFrustum(location=(0, 0, 0), look_at=(0, 1, 0)).basis()
+
+
+def test_cull_frame_counts():
+    """Culling keeps visible particles and reports the counts."""
+    state = FrameState(
+        time=1.0,
+        particle_id=np.array([0, 1, 2]),
+        position=np.array([[0.0, 0.0, 5.0], [0.0, 0.0, -5.0], [1.0, 0.5, 3.0]]),
+        velocity=np.zeros((3, 3)),
+        size=np.full(3, 0.01),
+        texture_code=np.zeros(3, dtype=np.int32),
+        textures=["WaterTexture"],
+    )
+    visible, stats = cull_frame(state, FRUSTUM)
+    assert visible.particle_id.tolist() == [0, 2]
+    assert (stats.kept, stats.culled, stats.total) == (2, 1, 3)
@@ -0,0 +1,69 @@
+# tests/unit/lib/test_lod.py
+"""Unit tests for screen-space level of detail."""
+
+import math
+
+import numpy as np
+import pytest
+
+from lib.camera import CameraFrustum
+from lib.lod import apply_lod, projected_radius
+
+# 90 degree horizontal field of view: focal length is half the image width.
+CAMERA = CameraFrustum(location=(0.0, 0.0, 0.0), look_at=(0.0, 0.0, 1.0), angle=90.0, aspect=1.0)
+
+
+def particle(pid: int, x: float, y: float, z: float, size: float, texture: str = "WaterTexture") -> dict:
+    """Build a particle dict in the get_particles_at_time format."""
+    return {
+        "particle_id": pid,
+        "position_x": x, "position_y": y, "position_z": z,
+        "velocity_x": 1.0, "velocity_y": 0.0, "velocity_z": 0.0,
+        "size": size, "texture_name": texture, "status": "alive",
+    }
+
+
+def test_projected_radius():
+    """Projected radius is size * focal / depth; points behind never count as small."""
+    pos = np.array([[0.0, 0.0, 10.0], [1.0, 0.0, 100.0], [0.0, 0.0, -1.0]])
+    radius, screen = projected_radius(pos, np.array([0.1, 0.1, 0.1]), CAMERA, image_width=200)
+    assert radius[0] == pytest.approx(0.1 * 100 / 10)
+    assert radius[1] == pytest.approx(0.1 * 100 / 100)
+    assert math.isinf(radius[2])
+    assert abs(screen[1, 0]) == pytest.approx(1.0)
+
+
+def test_lod_off_and_drop():
+    """Drop mode removes sub-pixel particles and reports the savings."""
+    particles = [particle(0, 0, 0, 10, 0.1), particle(1, 0, 0, 100, 0.001), particle(2, 0, 0, 200, 0.001)]
+    same, stats = apply_lod(particles, CAMERA, 200, min_pixels=0.5, mode="off")
+    assert same is particles and stats.saved_fraction == 0.0
+
+    kept, stats = apply_lod(particles, CAMERA, 200, min_pixels=0.5, mode="drop")
+    assert [p["particle_id"] for p in kept] == [0]
+    assert (stats.spheres_in, stats.spheres_out, stats.dropped) == (3, 1, 2)
+    assert stats.saved_fraction == pytest.approx(2 / 3)
+
+    with pytest.raises(ValueError):
+        apply_lod(particles, CAMERA, 200, min_pixels=0.5, mode="blur")
+
+
+def test_lod_merge_clusters_neighbours():
+    """Merge mode combines sub-pixel neighbours per texture and keeps lone ones."""
+    particles = [
+        particle(0, 0.0, 0.0, 10.0, 0.1),              # visible, untouched
+        particle(5, 0.001, 0.0, 100.0, 0.003),         # cluster of two ...
+        particle(3, 0.002, 0.0, 100.0, 0.004),         # ... same cell and slice
+        particle(4, 0.0015, 0.0, 100.0, 0.004, "Jade"),  # lone (other texture)
+    ]
+    out, stats = apply_lod(particles, CAMERA, 200, min_pixels=0.5, mode="merge")
+    assert (stats.merged, stats.clusters, stats.spheres_out) == (2, 1, 3)
+    assert [p["particle_id"] for p in out[:2]] == [0, 4]
+
+    merged = out[2]
+    assert merged["particle_id"] == 3
+    assert merged["merged_count"] == 2
+    assert merged["size"] == pytest.approx(math.sqrt(0.003**2 + 0.004**2))
+    expected_x = (0.003**2 * 0.001 + 0.004**2 * 0.002) / (0.003**2 + 0.004**2)
+    assert merged["position_x"] == pytest.approx(expected_x)
+    assert merged["texture_name"] == "WaterTexture"
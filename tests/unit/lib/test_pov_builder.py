@@ -0,0 +1,47 @@
+# tests/unit/lib/test_pov_builder.py
+"""Tests for motion-blur trails in the POV-Ray scene builder."""
+
+import pytest
+from vapory import Sphere, SphereSweep
+
+from lib.pov_builder import build_particle_ghosts, build_particle_trail, build_scene
+
+PRESET = {"pigment_r": 0.7, "pigment_g": 0.9, "pigment_b": 1.0, "pigment_t": 0.2}
+
+
+def _particle(trail):
+    x, y, z = trail[-1]
+    return {"particle_id": 1, "position_x": x, "position_y": y, "position_z": z, "size": 0.02, "trail": trail}
+
+
+def test_build_particle_trail_sweeps_distinct_points():
+    """Clamped repeats are dropped and centres/radii are comma separated."""
+    sweep = build_particle_trail(_particle([[0, 1, 0], [0, 1, 0], [0.1, 1.2, 0], [0.2, 1.3, 0]]), PRESET)
+    assert isinstance(sweep, SphereSweep)
+    assert sweep.args[:2] == ["linear_spline", 3]
+    assert sweep.args[2:14] == [",", [0, 1, 0], ",", 0.02, ",", [0.1, 1.2, 0], ",", 0.02, ",", [0.2, 1.3, 0], ",", 0.02]
+
+    # A particle that has not moved yet is a plain sphere
+    assert isinstance(build_particle_trail(_particle([[0, 1, 0], [0, 1, 0]]), PRESET), Sphere)
+
+
+def test_build_particle_ghosts_split_opacity():
+    """Each ghost carries an equal share of the preset opacity."""
+    ghosts = build_particle_ghosts(_particle([[0, 1, 0], [0.1, 1.2, 0], [0.2, 1.3, 0], [0.3, 1.4, 0]]), PRESET)
+    assert len(ghosts) == 4
+    assert [g.args[0] for g in ghosts][-1] == [0.3, 1.4, 0]
+    pigment = ghosts[0].args[2].args[0]
+    assert pigment.args[1][3] == pytest.approx(1.0 - 0.8 / 4)
+
+
+def test_build_scene_motion_blur_modes():
+    """Only particles with a trail are expanded; unknown modes are rejected."""
+    still = {"particle_id": 2, "position_x": 0, "position_y": 1, "position_z": 0, "size": 0.02}
+    moving = _particle([[0, 1, 0], [0.1, 1.2, 0], [0.2, 1.3, 0]])
+    for mode, count in (("off", 2), ("sweep", 2), ("ghost", 4)):
+        scene = build_scene([still, moving], PRESET, motion_blur=mode)
+        assert len(scene.objects) == 1 + count  # light source first
+    assert isinstance(build_scene([moving], PRESET, motion_blur="sweep").objects[1], SphereSweep)
+
+    with pytest.raises(ValueError):
+        build_scene([still], PRESET, motion_blur="smear")
@@ -0,0 +1,77 @@
+# tests/unit/sim/test_anomaly.py
+"""Unit tests for the rolling anomaly detectors."""
+
+import numpy as np
+import pytest
+
+from sim.anomaly import count_jump, detect_anomalies, energy_mad, energy_zscore, momentum_drift
+from sim.metrics import MetricsAccumulator, accumulate_frames
+from sim.timeline import compute_timeline, frame_times
+
+
+@pytest.fixture
+def clean_metrics(make_fountain):
+    """Analytic metrics rows (600 frames) of a clean fountain job."""
+    sim = make_fountain(num_particles=20_000, birth_end=8)
+    return compute_timeline(sim.births, frame_times(600, 60), sim.gravity).to_metrics()
+
+
+def test_clean_job_has_no_level_anomalies(clean_metrics):
+    """A physically consistent job raises no energy, count or momentum flags."""
+    results = detect_anomalies(clean_metrics)
+    assert set(results) == {"energy_mad", "energy_zscore", "count_jump", "momentum_drift"}
+    for name in ("energy_mad", "energy_zscore", "count_jump", "momentum_drift"):
+        assert len(results[name]) == 0, name
+        assert len(results[name].scores) == 600
+
+
+def test_generator_default_job_has_no_anomalies(make_fountain):
+    """Emission stopping and the first impacts of the generator's default job raise no flags."""
+    sim = make_fountain(num_particles=10_000, cone_angle_rad=np.radians(30), birth_end=0.5)
+    times = frame_times(1000, 60)
+    accumulators = [MetricsAccumulator(sim.gravity) for _ in times]
+    accumulate_frames(accumulators, sim.births, times, sim.gravity, sim.water_level)
+    evaluated = [{"time": t, **acc.result()} for t, acc in zip(times.tolist(), accumulators, strict=True)]
+    analytic = compute_timeline(sim.births, times, sim.gravity).to_metrics()
+
+    for rows in (analytic, evaluated):
+        results = detect_anomalies(rows)
+        assert set(results) == {"energy_mad", "energy_zscore", "count_jump", "momentum_drift"}
+        for name, result in results.items():
+            assert len(result) == 0, (name, result.indices)
+
+
+def test_injected_faults_are_flagged(clean_metrics):
+    """Energy spikes, count jumps and momentum kicks are found at their index."""
+    rows = clean_metrics
+    rows[200]["total_energy"] *= 5.0
+    rows[300]["particle_count"] += 2_000
+    for row in rows[400:]:
+        row["momentum_x"] += 50.0
+
+    results = detect_anomalies(rows[::-1])  # order is restored by time
+    assert 200 in results["energy_mad"].indices
+    assert 200 in results["energy_zscore"].indices
+    # The count jumps up at 300 and back down at 301
+    assert results["count_jump"].indices.tolist() == [300, 301]
+    assert results["momentum_drift"].indices.tolist() == [400]
+
+
+def test_detectors_on_arrays():
+    """Detectors score plain arrays; short windows and flat series score 0."""
+    flat = np.full(50, 3.0)
+    assert len(energy_mad(flat)) == 0
+    assert len(energy_zscore(flat)) == 0
+    assert not energy_zscore(flat).scores.any()
+
+    steps = np.arange(50) * 10.0
+    steps[25:] += 500.0
+    jump = count_jump(steps, threshold=8.0)
+    assert jump.indices.tolist() == [25]
+    assert jump.scores[0] == 0.0
+
+    times = np.arange(50) / 10.0
+    momentum = np.zeros((50, 3))
+    momentum[:, 1] = -9.81 * times
+    assert len(momentum_drift(times, momentum)) == 0
+    assert detect_anomalies([]) == {}
@@ -0,0 +1,102 @@
+# tests/unit/sim/test_metrics.py
+"""Unit tests for MetricsAccumulator."""
+
+import numpy as np
+import pytest
+
+from sim.metrics import MetricsAccumulator, accumulate_frames
+from sim.particles import ConicalFountain, FountainSimulator, evaluate_births
+from sim.timeline import frame_times
+from sim.validator import PhysicsValidator
+
+
+def make_particles(n, seed=0):
+    """Random particle dicts with a spread of speeds and sizes."""
+    rng = np.random.default_rng(seed)
+    pos = rng.normal(size=(n, 3)) * 5.0
+    vel = rng.normal(size=(n, 3)) * 3.0
+    size = rng.uniform(0.01, 0.05, n)
+    return [
+        {
+            "particle_id": i,
+            "position_x": pos[i, 0], "position_y": pos[i, 1], "position_z": pos[i, 2],
+            "velocity_x": vel[i, 0], "velocity_y": vel[i, 1], "velocity_z": vel[i, 2],
+            "size": size[i],
+            "texture_name": "WaterTexture",
+        }
+        for i in range(n)
+    ]
+
+
+def assert_metrics_close(actual, expected):
+    """Every metric matches to floating-point rounding."""
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, rel=1e-12, abs=1e-12), key
+
+
+def test_chunks_match_compute_metrics():
+    """Metrics accumulated over uneven chunks equal the whole-frame metrics."""
+    particles = make_particles(1000)
+    acc = MetricsAccumulator(gravity=9.81)
+    for start, stop in [(0, 1), (1, 250), (250, 250), (250, 999), (999, 1000)]:
+        acc.update_particles(particles[start:stop])
+    assert_metrics_close(acc.result(), PhysicsValidator.compute_metrics(particles, gravity=9.81))
+
+
+def test_merged_shards_match_single_pass():
+    """Shards accumulated separately and merged equal one accumulator over everything."""
+    particles = make_particles(600, seed=1)
+    shards = [MetricsAccumulator(), MetricsAccumulator(), MetricsAccumulator()]
+    for i, shard in enumerate(shards):
+        shard.update_particles(particles[i * 200:(i + 1) * 200])
+    merged = MetricsAccumulator().merge(shards[2]).merge(shards[0]).merge(shards[1])
+    assert merged.count == 600
+    assert_metrics_close(merged.result(), PhysicsValidator.compute_metrics(particles))
+
+    with pytest.raises(ValueError):
+        MetricsAccumulator(gravity=1.62).merge(shards[0])
+
+
+def test_nan_and_empty():
+    """NaNs propagate like compute_metrics; an empty accumulator gives the empty metrics."""
+    particles = make_particles(10, seed=2)
+    particles[3]["velocity_y"] = np.nan
+    particles[7]["position_x"] = np.inf
+    acc = MetricsAccumulator()
+    acc.update_particles(particles[:5])
+    acc.update_particles(particles[5:])
+    metrics = acc.result()
+    assert metrics["nan_count"] == 1
+    assert metrics["inf_count"] == 1
+    assert np.isnan(metrics["max_velocity"])
+    assert metrics["max_x"] == np.inf
+
+    assert MetricsAccumulator().result() == PhysicsValidator.compute_metrics([])
+
+
+def test_accumulate_frames_matches_compute_metrics():
+    """Batched frame metrics, fed in birth chunks, equal compute_metrics per frame."""
+    sim = FountainSimulator(gravity=9.81, water_level=0.0)
+    sim.add_emitter(ConicalFountain(
+        num_particles=300,
+        apex_x=0, apex_y=1.5, apex_z=14,
+        cone_height=2, cone_angle_rad=0.5, base_radius=1.75,
+        speed_min=3, speed_max=8,
+        birth_start=0, birth_end=1,
+        size_min=0.01, size_max=0.03,
+        seed_offset=7,
+    ))
+    times = frame_times(90, 60)
+    accumulators = [MetricsAccumulator(sim.gravity) for _ in times]
+    births = sim.births
+    for start in range(0, len(births), 120):
+        chunk = births.take(slice(start, start + 120))
+        accumulate_frames(accumulators, chunk, times, sim.gravity, sim.water_level)
+
+    for t, acc in zip(times, accumulators, strict=True):
+        frame = evaluate_births(births, t, sim.gravity, sim.water_level).to_states()
+        assert_metrics_close(acc.result(), PhysicsValidator.compute_metrics(frame, gravity=sim.gravity))
+
+    with pytest.raises(ValueError):
+        accumulate_frames(accumulators[:-1], births, times, sim.gravity, sim.water_level)
@@ -1,9 +1,25 @@
 # tests/unit/sim/test_particles.py
 """Unit tests for FountainSimulator and RNG functions."""
 
+import pickle
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+
 import numpy as np
+import pytest
 
-from sim.particles import FountainSimulator, ParticleBirth, rng_float
+from sim.particles import (
+    BirthsChecksum,
+    ConicalFountain,
+    FountainSimulator,
+    FrameState,
+    ParticleBirth,
+    ParticleBirthArray,
+    ParticleState,
+    rng_float,
+    rng_float_array,
+)
 
 
 def test_rng_float_determinism():
@@ -22,6 +38,23 @@ def test_rng_float_bounds():
         assert 5.0 <= val <= 10.0
 
 
+def test_rng_float_array_matches_scalar():
+    """Batched RNG is bit-for-bit identical to the scalar version."""
+    seeds = np.array([0, 1, 42, 10**6, 2**62, 2**63 - 1, -1, -(2**63)], dtype=np.int64)
+    for idx in range(8):
+        batch = rng_float_array(seeds, idx, -2.0, 7.5)
+        scalar = [rng_float(int(s), idx, -2.0, 7.5) for s in seeds]
+        assert batch.dtype == np.float64
+        assert batch.tolist() == scalar
+
+
+def test_rng_float_array_bounds():
+    """Batched values stay within [min, max]."""
+    vals = rng_float_array(np.arange(10000), 3, 5.0, 10.0)
+    assert vals.shape == (10000,)
+    assert np.all((vals >= 5.0) & (vals <= 10.0))
+
+
 def test_fountain_simulator_initial():
     """Check simulator initialises correctly."""
     sim = FountainSimulator(gravity=9.81, water_level=0.0)
@@ -79,13 +112,359 @@ def test_evaluate_at_time_after_impact():
         seed=1,
         impact_time=1.428
     )
-    sim._particles = [birth]
+    sim.births = ParticleBirthArray.from_births([birth])
     states = sim.evaluate_at_time(1.0)
     assert len(states) == 1
     states = sim.evaluate_at_time(2.0)
     assert len(states) == 0
 
 
+def test_particle_birth_array_round_trip():
+    """ParticleBirth records survive a round trip through the columnar store."""
+    births = [
+        ParticleBirth(0, 0.0, 0, 10, 0, 0, 0, 0, 0.02, "WaterTexture", 1, 1.428),
+        ParticleBirth(1, 0.5, 1, 9, 2, 1, 2, 3, 0.03, "Jade", 2, None),
+    ]
+    arr = ParticleBirthArray.from_births(births)
+    assert len(arr) == 2
+    assert arr.textures == ["WaterTexture", "Jade"]
+    assert np.isnan(arr.impact_time[1])
+    assert arr.to_births() == births
+    assert arr.take(np.array([1])).to_births() == births[1:]
+
+
+def test_particle_birth_array_concat_merges_textures():
+    """Concatenation remaps texture codes onto a merged texture table."""
+    a = ParticleBirthArray.from_births([ParticleBirth(0, 0, 0, 1, 0, 0, 0, 0, 0.02, "Jade", 0)])
+    b = ParticleBirthArray.from_births([
+        ParticleBirth(1, 0, 0, 1, 0, 0, 0, 0, 0.02, "WaterTexture", 1),
+        ParticleBirth(2, 0, 0, 1, 0, 0, 0, 0, 0.02, "Jade", 2),
+    ])
+    merged = ParticleBirthArray.concat([a, b])
+    assert merged.textures == ["Jade", "WaterTexture"]
+    assert merged.texture.tolist() == ["Jade", "WaterTexture", "Jade"]
+    assert merged.particle_id.tolist() == [0, 1, 2]
+
+
+def test_particle_birth_array_concat_of_empty_parts_keeps_precision():
+    """Concatenating only empty stores keeps their precision."""
+    empty = ParticleBirthArray.empty("float32")
+    merged = ParticleBirthArray.concat([empty, empty])
+    assert len(merged) == 0
+    assert merged.precision == "float32"
+    assert ParticleBirthArray.concat([]).precision == "float64"
+
+
+def test_simulator_stores_births_columnar():
+    """Simulator keeps births as columns and exposes a lazy record view."""
+    sim = FountainSimulator()
+    for texture in ("WaterTexture", "FireTexture"):
+        sim.add_conical_fountain(
+            num_particles=5,
+            apex_x=0, apex_y=1.5, apex_z=0,
+            cone_height=1, cone_angle_rad=0.1, base_radius=0.5,
+            speed_min=1, speed_max=2,
+            birth_start=0, birth_end=1,
+            size_min=0.01, size_max=0.02,
+            texture=texture,
+        )
+    assert isinstance(sim.births, ParticleBirthArray)
+    assert sim.births.particle_id.tolist() == list(range(10))
+    assert sim.births.textures == ["WaterTexture", "FireTexture"]
+    assert len(sim.particles) == 10
+    assert sim.particles[-1].texture == "FireTexture"
+    assert sim.particles[7] == sim.births.birth(7)
+
+    sim.clear()
+    assert len(sim.births) == 0
+    assert sim.particles == []
+
+
+def test_iter_emitter_chunks_match_single_emit():
+    """Streaming an emitter in chunks yields the same births as emitting it at once."""
+    emitter = ConicalFountain(
+        num_particles=25,
+        apex_x=0, apex_y=1.5, apex_z=0,
+        cone_height=1, cone_angle_rad=0.3, base_radius=0.5,
+        speed_min=1, speed_max=4,
+        birth_start=0, birth_end=1,
+        size_min=0.01, size_max=0.02,
+        seed_offset=100,
+    )
+    whole = FountainSimulator()
+    whole.add_emitter(emitter)
+
+    streamed = FountainSimulator()
+    chunks = list(streamed.iter_emitter(emitter, chunk_size=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert len(streamed.births) == 0
+
+    merged = ParticleBirthArray.concat(chunks)
+    for name in ParticleBirthArray.COLUMNS:
+        np.testing.assert_array_equal(getattr(merged, name), getattr(whole.births, name))
+    assert merged.seed.tolist() == list(range(100, 125))
+
+    # Ids stay unique across subsequent emitters
+    streamed.add_emitter(emitter)
+    assert streamed.births.particle_id[0] == 25
+
+    with pytest.raises(ValueError):
+        streamed.iter_emitter(emitter, chunk_size=0)
+
+
+def test_births_checksum_ignores_chunking():
+    """The checksum depends on the births, not on how they were chunked."""
+    emitter = ConicalFountain(
+        num_particles=25,
+        apex_x=0, apex_y=1.5, apex_z=0,
+        cone_height=1, cone_angle_rad=0.3, base_radius=0.5,
+        speed_min=1, speed_max=4,
+        birth_start=0, birth_end=1,
+        size_min=0.01, size_max=0.02,
+    )
+    sim = FountainSimulator()
+    sim.add_emitter(emitter)
+    whole = BirthsChecksum.of(sim.births)
+
+    chunked = BirthsChecksum()
+    for chunk in FountainSimulator().iter_emitter(emitter, chunk_size=7):
+        chunked.update(chunk)
+    assert chunked.hexdigest() == whole
+    assert chunked.count == 25
+
+    sim.births.x0[3] = np.nextafter(sim.births.x0[3], np.inf)
+    assert BirthsChecksum.of(sim.births) != whole
+
+
+def test_births_bundle_round_trip(tmp_path):
+    """Births saved as a .npy bundle load back memory-mapped and identical."""
+    sim = FountainSimulator()
+    sim.add_conical_fountain(
+        num_particles=50,
+        apex_x=0, apex_y=1.5, apex_z=0,
+        cone_height=1, cone_angle_rad=0.3, base_radius=0.5,
+        speed_min=1, speed_max=4,
+        birth_start=0, birth_end=1,
+        size_min=0.01, size_max=0.02,
+        texture="Jade",
+    )
+    path = sim.save_births(tmp_path / "job_1")
+    assert sorted(p.name for p in path.iterdir()) == sorted(
+        ["meta.json", *(f"{name}.npy" for name in ParticleBirthArray.COLUMNS)]
+    )
+    with pytest.raises(FileExistsError):
+        sim.save_births(path)
+    (tmp_path / "job_2").mkdir()
+    with pytest.raises(FileExistsError):
+        sim.save_births(tmp_path / "job_2")  # an empty directory is not replaced either
+    assert not any((tmp_path / "job_2").iterdir())
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["job_1", "job_2"]  # no temporary left behind
+
+    loaded = FountainSimulator()
+    loaded.load_births(path)
+    assert isinstance(loaded.births.x0, np.memmap)
+    assert loaded.births.textures == ["Jade"]
+    for name in ParticleBirthArray.COLUMNS:
+        np.testing.assert_array_equal(getattr(loaded.births, name), getattr(sim.births, name))
+    np.testing.assert_array_equal(loaded.evaluate_at_time_arrays(0.8).position, sim.evaluate_at_time_arrays(0.8).position)
+
+    in_memory = ParticleBirthArray.load(path, mmap=False)
+    assert not isinstance(in_memory.x0, np.memmap)
+
+
+def test_births_bundle_concurrent_writers(tmp_path, monkeypatch):
+    """Two writers of the same bundle never remove each other's partial bundle."""
+    sim = FountainSimulator()
+    sim.add_conical_fountain(
+        num_particles=20_000,
+        apex_x=0, apex_y=1.5, apex_z=0,
+        cone_height=1, cone_angle_rad=0.3, base_radius=0.5,
+        speed_min=1, speed_max=4,
+        birth_start=0, birth_end=1,
+        size_min=0.01, size_max=0.02,
+    )
+    save = np.save
+    for attempt in range(5):
+        path = tmp_path / f"job_{attempt}"
+        barrier = threading.Barrier(2)
+        results = []
+
+        # Both writers are halfway through their bundle before either goes on
+        def save_in_step(file, arr, barrier=barrier, **kwargs):
+            if str(file).endswith("particle_id.npy"):
+                barrier.wait(timeout=10)
+            save(file, arr, **kwargs)
+
+        def write(results=results, path=path):
+            try:
+                results.append(sim.births.save(path))
+            except Exception as e:
+                results.append(e)
+
+        monkeypatch.setattr(np, "save", save_in_step)
+        writers = [threading.Thread(target=write) for _ in range(2)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        assert len(results) == 2
+        assert sum(isinstance(r, Path) for r in results) == 1
+        assert all(isinstance(r, (Path, FileExistsError)) for r in results)
+        loaded = ParticleBirthArray.load(path, mmap=False)
+        np.testing.assert_array_equal(loaded.x0, sim.births.x0)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"job_{i}" for i in range(5)]
+
+
+def test_evaluate_at_time_arrays():
+    """Columnar evaluation applies the alive mask and ballistic equations."""
+    sim = FountainSimulator(gravity=9.81, water_level=0.0)
+    sim.births = ParticleBirthArray.from_births([
+        ParticleBirth(0, 0.0, 0, 10, 0, 1, 0, 2, 0.02, "WaterTexture", 1, 1.428),
+        ParticleBirth(1, 2.0, 0, 10, 0, 0, 0, 0, 0.02, "WaterTexture", 2, 3.428),  # not born yet
+        ParticleBirth(2, 0.0, 5, 10, 0, 0, 3, 0, 0.03, "Jade", 3, None),
+    ])
+    frame = sim.evaluate_at_time_arrays(0.5)
+    assert isinstance(frame, FrameState)
+    assert frame.particle_id.tolist() == [0, 2]
+    assert frame.position.shape == (2, 3)
+    assert frame.velocity.shape == (2, 3)
+    assert frame.position[0].tolist() == [0.5, 10 - 0.5 * 9.81 * 0.25, 1.0]
+    assert frame.velocity[1].tolist() == [0.0, 3 - 9.81 * 0.5, 0.0]
+    assert [frame.textures[c] for c in frame.texture_code] == ["WaterTexture", "Jade"]
+
+    dicts = sim.evaluate_at_time(0.5)
+    assert dicts == frame.to_dicts()
+    assert dicts[1]["texture"] == "Jade"
+    assert dicts[1]["status"] == "alive"
+
+
+def test_particle_records_are_compact():
+    """ParticleBirth is frozen and slotted; ParticleState reads like the state dicts."""
+    birth = ParticleBirth(0, 0.0, 0, 10, 0, 1, 0, 2, 0.02, "WaterTexture", 1, 1.428)
+    assert not hasattr(birth, "__dict__")
+    with pytest.raises(AttributeError):
+        birth.size = 0.5
+
+    sim = FountainSimulator(gravity=9.81, water_level=0.0)
+    sim.births = ParticleBirthArray.from_births([birth, ParticleBirth(1, 0.0, 5, 10, 0, 0, 3, 0, 0.03, "Jade", 3, None)])
+    frame = sim.evaluate_at_time_arrays(0.5)
+    states = frame.to_states()
+    assert [dict(s) for s in states] == frame.to_dicts(texture_key="texture_name")
+    assert all(isinstance(s, ParticleState) for s in states)
+
+    state = states[1]
+    assert isinstance(state, Mapping)
+    assert state == frame.to_dicts(texture_key="texture_name")[1]
+    assert state["texture_name"] == state.texture_name == "Jade"
+    assert len(state) == len(state.keys()) == len(dict(state))
+    assert "position_y" in state and "trail" not in state and "texture" not in state
+    assert state.get("trail") is None and state.get("texture", "none") == "none" and state.get("size") == 0.03
+    for key in ("texture", "trail", "count", "__class__", 0):
+        with pytest.raises(KeyError):
+            state[key]
+    assert not hasattr(state, "__dict__")
+    with pytest.raises(AttributeError):
+        state.size = 3
+    with pytest.raises(AttributeError):
+        del state.size
+    with pytest.raises(AttributeError):
+        state.extra = 1
+    assert state["size"] == state.size == 0.03
+    assert pickle.loads(pickle.dumps(state)) == state
+
+    blurred = sim.evaluate_subframes(0.5, shutter=0.1, samples=3).to_states()
+    assert "trail" in blurred[0] and len(blurred[0]["trail"]) == 3
+    assert list(blurred[0].keys())[-1] == "trail"
+    assert len(blurred[0]) == len(states[0]) + 1
+    assert sim.births.to_births()[1] == sim.births.birth(1)
+
+
+def test_evaluate_at_times_matches_single_time_queries():
+    """Batched multi-time evaluation equals per-time evaluation, in input order."""
+    sim = FountainSimulator(gravity=9.81, water_level=0.0)
+    sim.add_conical_fountain(
+        num_particles=500,
+        apex_x=0, apex_y=1.5, apex_z=14,
+        cone_height=2.0, cone_angle_rad=np.pi / 6, base_radius=1.75,
+        speed_min=3.0, speed_max=8.0,
+        birth_start=0.0, birth_end=2.0,
+        size_min=0.01, size_max=0.03,
+        seed_offset=42,
+    )
+    times = [2.5, 0.0, 0.1, 1.0, 1.7, 3.0, 0.5]
+    # A tiny element budget forces one time per chunk; the default batches them all.
+    for max_elements in (1, 10**6):
+        frames = list(sim.evaluate_at_times(times, max_elements=max_elements))
+        assert [f.time for f in frames] == times
+        for frame, t in zip(frames, times, strict=True):
+            expected = sim.evaluate_at_time_arrays(t)
+            assert np.array_equal(frame.particle_id, expected.particle_id)
+            assert np.array_equal(frame.position, expected.position)
+            assert np.array_equal(frame.velocity, expected.velocity)
+            assert np.array_equal(frame.size, expected.size)
+
+
+def test_evaluate_subframes_trails():
+    """Sub-frame trails match single-time evaluation and are clamped at birth."""
+    sim = FountainSimulator(gravity=9.81, water_level=0.0)
+    sim.births = ParticleBirthArray.from_births([
+        ParticleBirth(0, 0.0, 0, 10, 0, 1, 0, 2, 0.02, "WaterTexture", 1, 1.428),
+        ParticleBirth(1, 0.95, 1, 10, 0, 0, 5, 0, 0.02, "WaterTexture", 2, None),  # born mid-shutter
+    ])
+    frame = sim.evaluate_subframes(1.0, shutter=0.1, samples=5)
+    assert frame.trail.shape == (2, 5, 3)
+    np.testing.assert_array_equal(frame.trail[:, -1], frame.position)
+
+    for k, offset in enumerate(np.linspace(0.1, 0.0, 5)):
+        expected = sim.evaluate_at_time_arrays(1.0 - offset).position[0]
+        np.testing.assert_allclose(frame.trail[0, k], expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(frame.trail[1, :3], [[1, 10, 0]] * 3)
+
+    dicts = frame.take(np.array([1])).to_dicts()
+    assert len(dicts[0]["trail"]) == 5
+    assert "trail" not in sim.evaluate_at_time(1.0)[0]
+
+    with pytest.raises(ValueError):
+        sim.evaluate_subframes(1.0, shutter=0.1, samples=0)
+
+
+def test_float32_precision_bounds_position_error():
+    """float32 state columns halve the births and stay within micrometres of float64."""
+    sims = {}
+    for precision in ("float64", "float32"):
+        sims[precision] = FountainSimulator(precision=precision)
+        sims[precision].add_conical_fountain(
+            num_particles=5000,
+            apex_x=0, apex_y=1.5, apex_z=14,
+            cone_height=2.0, cone_angle_rad=np.pi / 6, base_radius=1.75,
+            speed_min=3.0, speed_max=8.0,
+            birth_start=0.0, birth_end=2.0,
+            size_min=0.01, size_max=0.03,
+            seed_offset=42,
+        )
+    exact, single = sims["float64"].births, sims["float32"].births
+    assert single.precision == "float32"
+    assert single.x0.dtype == np.float32 and single.birth_time.dtype == np.float64
+    assert single.nbytes < exact.nbytes
+    np.testing.assert_array_equal(exact.astype("float32").x0, single.x0)
+
+    times = [0.1, 0.5, 1.0, 2.0, 2.9]
+    for t, batched in zip(times, sims["float32"].evaluate_at_times(times), strict=True):
+        ref = sims["float64"].evaluate_at_time_arrays(t)
+        got = sims["float32"].evaluate_at_time_arrays(t)
+        assert got.position.dtype == np.float32 and got.velocity.dtype == np.float32
+        np.testing.assert_array_equal(batched.position, got.position)
+
+        # Times stay float64, so only the water-plane check can differ near y = 0.
+        common, i, j = np.intersect1d(ref.particle_id, got.particle_id, return_indices=True)
+        assert len(common) >= len(ref) - 1
+        assert np.abs(ref.position[i] - got.position[j]).max() < 1e-5
+        assert np.abs(ref.velocity[i] - got.velocity[j]).max() < 1e-5
+
+    with pytest.raises(ValueError):
+        FountainSimulator(precision="float16")
+
+
 def test_impact_time_math():
     """Verify analytic impact time calculation."""
     sim = FountainSimulator(gravity=9.81, water_level=0.0)
@@ -109,6 +488,56 @@ def test_impact_time_math():
     assert abs(impact - expected) < 1e-6
 
 
+def test_impact_times_vectorized_matches_scalar():
+    """Vectorized impact solver agrees with the scalar one, including edge cases."""
+    sim = FountainSimulator(gravity=9.81, water_level=0.5)
+    y0 = np.array([10.0, 10.0, 10.0, 0.5, 0.2, 3.0])
+    vy0 = np.array([0.0, 5.0, -5.0, 1.0, 2.0, 40.0])
+    impacts = sim._compute_impact_times(y0, vy0)
+    for i in range(len(y0)):
+        assert impacts[i] == sim._compute_impact_time(y0[i], vy0[i])
+    assert impacts[3] == 0.0 and impacts[4] == 0.0  # born at/below water
+
+    never = FountainSimulator(gravity=-1.0, water_level=0.0)._compute_impact_times(np.array([1.0]), np.array([1.0]))
+    assert np.isnan(never[0])
+
+
+def test_add_conical_fountain_matches_scalar_reference():
+    """Vectorized emission reproduces the per-particle scalar recipe exactly."""
+    params = {
+        "apex_x": 0.5, "apex_y": 1.5, "apex_z": 14.0,
+        "cone_height": 2.0, "cone_angle_rad": np.pi / 6, "base_radius": 1.75,
+        "speed_min": 3.0, "speed_max": 8.0,
+        "birth_start": 0.0, "birth_end": 0.5,
+        "size_min": 0.01, "size_max": 0.03,
+    }
+    sim = FountainSimulator()
+    sim.add_conical_fountain(num_particles=25, seed_offset=7, **params)
+
+    for i, p in enumerate(sim.particles):
+        seed = 7 + i
+        height = rng_float(seed, 1, 0.0, params["cone_height"])
+        angle = rng_float(seed, 2, 0.0, 2.0 * np.pi)
+        radius = params["base_radius"] * (1.0 - height / params["cone_height"]) * rng_float(seed, 3, 0.0, 1.0)
+        vel_angle = rng_float(seed, 4, -params["cone_angle_rad"], params["cone_angle_rad"])
+        vel_mag = rng_float(seed, 5, params["speed_min"], params["speed_max"])
+        az_angle = rng_float(seed, 6, 0.0, 2.0 * np.pi)
+        birth_time = rng_float(seed, 0, params["birth_start"], params["birth_end"])
+        y0 = params["apex_y"] + height
+        vy0 = vel_mag * np.sin(vel_angle)
+
+        assert p.particle_id == i
+        assert p.birth_time == birth_time
+        assert p.x0 == params["apex_x"] + radius * np.cos(angle)
+        assert p.y0 == y0
+        assert p.z0 == params["apex_z"] + radius * np.sin(angle)
+        assert p.vx0 == vel_mag * np.cos(vel_angle) * np.cos(az_angle)
+        assert p.vy0 == vy0
+        assert p.vz0 == vel_mag * np.cos(vel_angle) * np.sin(az_angle)
+        assert p.size == rng_float(seed, 7, params["size_min"], params["size_max"])
+        assert p.impact_time == birth_time + sim._compute_impact_time(y0, vy0)
+
+
 def test_energy_conservation_without_collision():
     """Energy should be conserved for analytic trajectories."""
     sim = FountainSimulator(gravity=9.81, water_level=-10)
@@ -0,0 +1,75 @@
+"""Unit tests for the TemporalIndex."""
+
+import numpy as np
+
+from sim.particles import FountainSimulator, ParticleBirth, ParticleBirthArray
+from sim.temporal import TemporalIndex
+
+
+def brute_force_alive(birth, impact, t):
+    """Reference alive set: birth <= t < impact (NaN impact never dies)."""
+    return np.flatnonzero((t >= birth) & ~(t >= impact))
+
+
+def make_intervals(n=2000, seed=0):
+    """Random staggered intervals with mixed lifetimes, immortals and born-dead."""
+    rng = np.random.default_rng(seed)
+    birth = rng.uniform(0.0, 100.0, n)
+    life = rng.choice([0.01, 0.3, 1.5, 7.0, 40.0], n) * rng.uniform(0.5, 1.0, n)
+    impact = birth + life
+    impact[::97] = np.nan          # never hits
+    impact[5::101] = birth[5::101]  # born dead
+    return birth, impact
+
+
+def test_query_matches_brute_force():
+    """Index queries return exactly the brute-force alive set, sorted."""
+    birth, impact = make_intervals()
+    index = TemporalIndex(birth, impact)
+    assert index.num_classes > 1
+    for t in np.linspace(-1.0, 150.0, 301):
+        assert np.array_equal(index.query(t), brute_force_alive(birth, impact, t))
+    # Exact boundaries: alive at birth, dead at impact
+    i = 3
+    assert i in index.query(birth[i])
+    assert i not in index.query(impact[i])
+
+
+def test_candidates_window():
+    """Window candidates are the particles alive anywhere in [t_lo, t_hi]."""
+    birth, impact = make_intervals(seed=1)
+    index = TemporalIndex(birth, impact)
+    t_lo, t_hi = 40.0, 42.5
+    expected = np.flatnonzero((birth <= t_hi) & ~(impact <= t_lo))
+    born_dead = expected[impact[expected] == birth[expected]]
+    assert np.array_equal(index.candidates(t_lo, t_hi), np.setdiff1d(expected, born_dead))
+
+
+def test_empty_index():
+    """An empty index answers queries with no particles."""
+    index = TemporalIndex(np.empty(0), np.empty(0))
+    assert index.query(1.0).size == 0
+    assert index.alive_count(1.0) == 0
+
+
+def test_simulator_uses_index():
+    """Simulator evaluation through the index matches the full scan."""
+    sim = FountainSimulator(gravity=9.81, water_level=0.0)
+    for k in range(5):
+        sim.add_conical_fountain(
+            num_particles=200,
+            apex_x=k, apex_y=1.5, apex_z=14,
+            cone_height=2.0, cone_angle_rad=np.pi / 6, base_radius=1.75,
+            speed_min=3.0, speed_max=8.0,
+            birth_start=2.0 * k, birth_end=2.0 * k + 0.5,
+            size_min=0.01, size_max=0.03,
+            seed_offset=1000 * k,
+        )
+    births = sim.births
+    for t in (0.2, 2.3, 4.9, 9.0, 20.0):
+        idx = sim.index.query(t)
+        assert np.array_equal(idx, brute_force_alive(births.birth_time, births.impact_time, t))
+        assert len(sim.evaluate_at_time(t)) <= len(idx)
+
+    sim.births = ParticleBirthArray.from_births([ParticleBirth(0, 0.0, 0, 10, 0, 0, 0, 0, 0.02, "WaterTexture", 1, None)])
+    assert sim.index.query(5.0).tolist() == [0]
@@ -0,0 +1,59 @@
+# tests/unit/sim/test_timeline.py
+"""Unit tests for the analytic alive-count and energy timeline."""
+
+import numpy as np
+import pytest
+
+from sim.particles import ParticleBirthArray
+from sim.timeline import Timeline, compute_timeline, frame_times
+from sim.validator import PhysicsValidator
+
+
+def test_frame_times():
+    """Frames are numbered from 1 and sampled at frame / fps."""
+    np.testing.assert_allclose(frame_times(3, 10), [0.1, 0.2, 0.3])
+
+
+def test_timeline_matches_frame_metrics(make_fountain):
+    """Closed-form sums match compute_metrics on evaluated frames."""
+    sim = make_fountain(num_particles=500)
+    times = frame_times(180, 60)
+    timeline = compute_timeline(sim.births, times, sim.gravity)
+
+    for i, t in enumerate(times):
+        particles = sim.evaluate_at_time_arrays(t).to_dicts(texture_key="texture_name")
+        metrics = PhysicsValidator.compute_metrics(particles, gravity=sim.gravity)
+        assert timeline.alive_count[i] == metrics["particle_count"]
+        if not particles:
+            continue
+        assert timeline.kinetic_energy[i] == pytest.approx(metrics["kinetic_energy"], rel=1e-9)
+        assert timeline.potential_energy[i] == pytest.approx(metrics["potential_energy"], rel=1e-9, abs=1e-12)
+        assert timeline.total_energy[i] == pytest.approx(metrics["total_energy"], rel=1e-9, abs=1e-12)
+        for axis, key in enumerate(("momentum_x", "momentum_y", "momentum_z")):
+            assert timeline.momentum[i, axis] == pytest.approx(metrics[key], rel=1e-9, abs=1e-12)
+
+
+def test_timeline_is_additive_over_chunks(make_fountain):
+    """Timelines of disjoint chunks sum to the timeline of all births."""
+    sim = make_fountain(num_particles=500)
+    times = frame_times(120, 60)
+    whole = compute_timeline(sim.births, times, sim.gravity)
+
+    total = Timeline.zeros(times)
+    for start in range(0, len(sim.births), 128):
+        total += compute_timeline(sim.births.take(slice(start, start + 128)), times, sim.gravity)
+
+    np.testing.assert_array_equal(total.alive_count, whole.alive_count)
+    np.testing.assert_allclose(total.kinetic_energy, whole.kinetic_energy, rtol=1e-9)
+    np.testing.assert_allclose(total.momentum, whole.momentum, rtol=1e-9, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        whole + Timeline.zeros(times[:-1])
+
+
+def test_timeline_empty_and_metric_rows():
+    """Empty births give zero curves; rows carry simulation_metrics keys."""
+    timeline = compute_timeline(ParticleBirthArray.empty(), frame_times(2, 10), 9.81)
+    rows = timeline.to_metrics()
+    assert [r["time"] for r in rows] == [0.1, 0.2]
+    assert all(r["particle_count"] == 0 and r["total_energy"] == 0.0 for r in rows)
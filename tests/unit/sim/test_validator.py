@@ -3,6 +3,7 @@
 
 import numpy as np
 
+from sim.particles import impact_times
 from sim.validator import PhysicsValidator
 
 
@@ -158,3 +159,82 @@ def test_detect_energy_spike():
     spikes = PhysicsValidator.detect_energy_spike(series, threshold_factor=10.0)
     # Should detect index 5 because 100 > 1*10
     assert spikes == [5]
+
+
+def test_validate_frame_matches_per_particle_checks():
+    """Vectorized frame validation reports exactly what per-particle validation does."""
+    particles = [make_particle(x=float(i)) for i in range(10)]
+    particles[1]["position_y"] = float("nan")
+    particles[3]["velocity_x"] = float("inf")
+    particles[4]["size"] = -0.5
+    particles[6]["velocity_z"] = 2000.0
+    particles[8] = make_particle(vx=float("-inf"), size=0.0)
+    for i, p in enumerate(particles):
+        p["particle_id"] = 100 + i
+
+    valid, errors = PhysicsValidator.validate_frame(particles)
+    expected = []
+    for i, p in enumerate(particles):
+        ok, errs = PhysicsValidator.validate_particle_state(p)
+        if not ok:
+            expected.append({"particle_index": i, "particle_id": 100 + i, "errors": errs})
+    assert valid is False
+    assert errors == expected
+    assert [e["particle_index"] for e in errors] == [1, 3, 4, 6, 8]
+
+
+def test_validate_frame_missing_key_falls_back():
+    """Incomplete states still produce a missing-key error for that particle."""
+    particles = [make_particle(), make_particle()]
+    del particles[1]["texture_name"]
+    valid, errors = PhysicsValidator.validate_frame(particles)
+    assert valid is False
+    assert errors == [{"particle_index": 1, "particle_id": 1, "errors": ["Missing key: texture_name"]}]
+
+
+def test_validate_columns():
+    """Column validation flags the same particles as validate_frame."""
+    position = np.array([[0.0, 1.0, 0.0], [0.0, np.nan, 0.0], [1.0, 2.0, 3.0]], dtype=np.float32)
+    velocity = np.zeros((3, 3), dtype=np.float32)
+    size = np.array([0.02, 0.02, -1.0], dtype=np.float32)
+    ids = np.array([7, 8, 9])
+    valid, errors = PhysicsValidator.validate_columns(position, velocity, size, ids)
+    assert valid is False
+    assert [(e["particle_index"], e["particle_id"]) for e in errors] == [(1, 8), (2, 9)]
+    assert errors[0]["errors"] == ["position_y is not finite: nan", "position_y is NaN"]
+    assert errors[1]["errors"] == ["Size must be positive: -1.0"]
+    assert PhysicsValidator.validate_columns(position[:1], velocity[:1], size[:1], ids[:1]) == (True, [])
+
+
+def test_validate_births_valid(make_fountain):
+    """Generated births pass, also at float32 and FLOAT-column resolution."""
+    births = make_fountain().births
+    assert PhysicsValidator.validate_births(births, 9.81, 0.0) == (True, [])
+    assert PhysicsValidator.validate_births(births.astype("float32"), 9.81, 0.0) == (True, [])
+    births.impact_time[:] = births.impact_time.astype(np.float32)
+    assert PhysicsValidator.validate_births(births, 9.81, 0.0) == (True, [])
+
+
+def test_validate_births_invalid(make_fountain):
+    """Each lifetime check reports the offending birth."""
+    births = make_fountain().births
+    births.x0[3] = np.nan
+    births.size[5] = -0.01
+    births.impact_time[7] += 0.5
+    births.impact_time[9] = np.nan
+    births.y0[11] = 100.0
+    births.impact_time[11] = births.birth_time[11] + impact_times(births.y0[11:12], births.vy0[11:12], 9.81, 0.0)[0]
+    births.vx0[11] = 999.5  # within the limit at birth, beyond it at impact
+
+    valid, errors = PhysicsValidator.validate_births(births, 9.81, 0.0)
+    assert valid is False
+    by_index = {e["birth_index"]: e["errors"] for e in errors}
+    assert sorted(by_index) == [3, 5, 7, 9, 11]
+    assert by_index[3][0] == "x0 is not finite: nan"
+    assert by_index[5] == ["Size must be positive: -0.01"]
+    assert by_index[7][0].startswith("impact_time ")
+    # Never hitting the water means falling forever
+    assert by_index[9][0].startswith("Peak speed over lifetime too high: inf")
+    assert len(by_index[11]) == 1
+    assert by_index[11][0].startswith("Peak speed over lifetime too high")
+    assert errors[0]["particle_id"] == int(births.particle_id[3])
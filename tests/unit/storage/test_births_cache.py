@@ -0,0 +1,99 @@
+# tests/unit/storage/test_births_cache.py
+"""Tests for the in-process LRU births cache."""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from storage.births_cache import BirthsCache
+from storage.cluster import ClusterManager
+
+
+def test_lru_eviction_by_bytes(make_fountain):
+    """Least recently used jobs are evicted once the byte budget is exceeded."""
+    births = make_fountain(num_particles=100).births
+    cache = BirthsCache(max_bytes=2 * births.nbytes)
+    assert cache.put(1, births) and cache.put(2, births)
+    assert cache.get(1) is births  # job 2 is now least recently used
+    assert cache.put(3, births)
+
+    assert 2 not in cache and 1 in cache and 3 in cache
+    assert cache.nbytes == 2 * births.nbytes
+    assert cache.get(2) is None
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (1, 1, 1)
+    assert cache.stats.hit_rate == 0.5
+
+    cache.invalidate(1)
+    assert len(cache) == 1 and cache.nbytes == births.nbytes
+    assert not cache.put(4, make_fountain(num_particles=300).births)  # larger than the whole cache
+    assert 4 not in cache
+
+    with pytest.raises(ValueError):
+        BirthsCache(0)
+
+
+@pytest.mark.asyncio
+async def test_cluster_fetches_stored_births_once(make_fountain):
+    """Consecutive frames of a stored job fetch its births once; new births invalidate them."""
+    db = Mock()
+    db.bulk_insert_ir = AsyncMock()
+    db.execute_ir = AsyncMock()
+    db.fetch_all = AsyncMock(return_value=[{"gravity": 9.81, "water_level": 0.0, "births_count": 50}])
+    cluster = ClusterManager(db, births_cache_bytes=2**20)
+    births = make_fountain(num_particles=50).births
+    cluster.get_births_array = AsyncMock(return_value=births)
+    cluster.get_alive_births_array = AsyncMock()
+
+    first = await cluster.get_particles_at_time(1, 0.5)
+    second = await cluster.get_particles_at_time(1, 0.5)
+    assert first == second
+    cluster.get_births_array.assert_awaited_once_with(1)
+    cluster.get_alive_births_array.assert_not_awaited()
+    assert (cluster.births_cache.stats.hits, cluster.births_cache.stats.misses) == (1, 1)
+
+    cluster._get_texture_id_map = AsyncMock(return_value={"WaterTexture": 1})
+    cluster.ensure_texture = AsyncMock(return_value=1)
+    await cluster.insert_particle_births(1, births)
+    assert 1 not in cluster.births_cache
+
+
+@pytest.mark.asyncio
+async def test_cluster_filters_jobs_too_large_to_cache(make_fountain):
+    """A job larger than the cache is loaded once, then queried with the SQL alive filter."""
+    db = Mock()
+    db.fetch_all = AsyncMock(return_value=[{"gravity": 9.81, "water_level": 0.0, "births_count": 50}])
+    births = make_fountain(num_particles=50).births
+    cluster = ClusterManager(db, births_cache_bytes=births.nbytes - 1)
+    cluster.get_births_array = AsyncMock(return_value=births)
+    cluster.get_alive_births_array = AsyncMock(return_value=births)
+
+    await cluster.get_particles_at_time(1, 0.5)
+    await cluster.get_particles_at_time(1, 0.6)
+    cluster.get_births_array.assert_awaited_once_with(1)
+    cluster.get_alive_births_array.assert_awaited_once_with(1, 0.6)
+    assert len(cluster.births_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cluster_caches_only_complete_births(make_fountain):
+    """Births still being written are never cached; a stale entry is dropped."""
+    config = {"gravity": 9.81, "water_level": 0.0, "births_count": None}
+    db = Mock()
+    db.fetch_all = AsyncMock(side_effect=lambda sql, params=None: [config])
+    births = make_fountain(num_particles=50).births
+    cluster = ClusterManager(db, births_cache_bytes=2**20)
+    cluster.get_births_array = AsyncMock(return_value=births.take(slice(0, 20)))
+    cluster.get_alive_births_array = AsyncMock(return_value=births.take(slice(0, 20)))
+
+    # Partial births: frames filter in SQL and whole-job loads are not kept
+    await cluster.get_particles_at_time(1, 0.5)
+    cluster.get_alive_births_array.assert_awaited_once_with(1, 0.5)
+    await cluster.load_births(1, config)
+    assert 1 not in cluster.births_cache
+
+    # Complete births are cached; an entry shorter than births_count is reloaded
+    cluster.births_cache.put(1, births.take(slice(0, 20)))
+    config["births_count"] = 50
+    cluster.get_births_array.return_value = births
+    assert len(await cluster.load_births(1, config)) == 50
+    assert len(cluster.births_cache.get(1)) == 50
@@ -1,14 +1,17 @@
 # tests/unit/storage/test_cluster.py
 """Unit tests for ClusterManager - mocks the DatabaseProvider."""
 
+import dataclasses
 import json
 from unittest.mock import AsyncMock, Mock, patch
 
+import numpy as np
 import pytest
 from DBCore.ir import IRSelect, IRUpdate
 from DBCore.ir.conditions import LogicalExpression
 
-from sim.particles import ParticleBirth
+from lib.camera import CameraFrustum
+from sim.particles import BirthsChecksum, ConicalFountain, FountainSimulator, ParticleBirth, ParticleBirthArray
 from storage.cluster import ClusterManager
 
 
@@ -189,6 +192,24 @@ async def test_get_job_config_not_found(cluster, mock_db):
         await cluster.get_job_config(99)
 
 
+@pytest.mark.asyncio
+async def test_complete_births_records_count(cluster, mock_db):
+    """Test that completing a job's births stores their count, and new births clear it."""
+    mock_db.fetch_all.side_effect = [
+        [{"gravity": 9.81, "water_level": 0.0, "generation_mode": "stored"}],
+        [{"births": 1500}],
+    ]
+    assert await cluster.complete_births(3) == 1500
+    assert "FROM particle_births" in mock_db.fetch_all.call_args[0][0]
+    update = mock_db.execute_ir.call_args[0][0]
+    assert update.table == "render_jobs"
+    assert update.set_values == {"births_count": 1500}
+
+    with patch.object(cluster, "ensure_texture", new_callable=AsyncMock):
+        await cluster.insert_job_emitter(3, 0, EMITTER, 0, 9.81, 0.0, "abc")
+    assert mock_db.execute_ir.call_args_list[-2][0][0].set_values == {"births_count": None}
+
+
 @pytest.mark.asyncio
 async def test_update_job_status(cluster, mock_db):
     """Test updating job status."""
@@ -249,6 +270,34 @@ async def test_insert_particle_births_ensures_textures(cluster, mock_db):
             assert bulk.values[1][10] == 2
 
 
+@pytest.mark.asyncio
+async def test_insert_particle_births_array_batches(cluster, mock_db):
+    """Columnar births are sent in batches; a missing impact is stored as NULL."""
+    births = ParticleBirthArray.from_births([
+        ParticleBirth(
+            particle_id=i,
+            birth_time=0.1 * i,
+            x0=0, y0=10, z0=0,
+            vx0=0, vy0=0, vz0=0,
+            size=0.02,
+            texture="WaterTexture",
+            seed=i,
+            impact_time=None if i == 2 else 1.5,
+        )
+        for i in range(3)
+    ])
+    with patch.object(cluster, "ensure_texture", new_callable=AsyncMock), patch.object(cluster, "_get_texture_id_map", new_callable=AsyncMock) as mock_map:
+        mock_map.return_value = {"WaterTexture": 1}
+
+        await cluster.insert_particle_births(1, births, batch_size=2)
+
+        assert mock_db.bulk_insert_ir.await_count == 2
+        first, second = (c[0][0] for c in mock_db.bulk_insert_ir.call_args_list)
+        assert [row[1] for row in first.values] == [0, 1]
+        assert [row[1] for row in second.values] == [2]
+        assert second.values[0][12] is None
+
+
 @pytest.mark.asyncio
 async def test_insert_particle_births_empty(cluster, mock_db):
     """Test empty births list does nothing."""
@@ -273,6 +322,7 @@ async def test_get_particles_at_time(cluster, mock_db):
                 "vx0": 0.0, "vy0": 0.0, "vz0": 0.0,
                 "size": 0.02,
                 "texture_name": "WaterTexture",
+                "seed": 42,
                 "impact_time": 1.428,
             },
             {
@@ -282,6 +332,7 @@ async def test_get_particles_at_time(cluster, mock_db):
                 "vx0": 0.0, "vy0": 1.0, "vz0": 0.0,
                 "size": 0.025,
                 "texture_name": "Jade",
+                "seed": 43,
                 "impact_time": None,
             },
         ],
@@ -301,6 +352,58 @@ async def test_get_particles_at_time(cluster, mock_db):
     assert abs(p1["position_y"] - expected_y) < 1e-6
 
 
+@pytest.mark.asyncio
+async def test_get_particles_at_time_filters_alive_in_sql(cluster, mock_db):
+    """Test that stored jobs fetch only the births alive at t."""
+    mock_db.fetch_all.side_effect = [
+        [{"gravity": 9.81, "water_level": 0.0}],
+        [],
+    ]
+    assert await cluster.get_particles_at_time(4, 0.75) == []
+    sql, params = mock_db.fetch_all.call_args[0]
+    assert "birth_time <= %s AND (impact_time IS NULL OR impact_time > %s)" in sql
+    assert params == (4, 0.75, 0.75)
+
+@pytest.mark.asyncio
+async def test_get_particles_at_time_motion_blur_trail(cluster, mock_db):
+    """Test that sub-frame samples come back as a trail ending at the frame position."""
+    mock_db.fetch_all.side_effect = [
+        [{"gravity": 9.81, "water_level": 0.0}],
+        [
+            {
+                "particle_id": 0, "birth_time": 0.0,
+                "x0": 0.0, "y0": 10.0, "z0": 0.0,
+                "vx0": 2.0, "vy0": 0.0, "vz0": 0.0,
+                "size": 0.02, "texture_name": "WaterTexture", "seed": 42,
+                "impact_time": 1.428,
+            },
+        ],
+    ]
+    states = await cluster.get_particles_at_time(1, 0.5, shutter=0.1, samples=3)
+    trail = states[0]["trail"]
+    assert len(trail) == 3
+    assert trail[-1] == [states[0]["position_x"], states[0]["position_y"], states[0]["position_z"]]
+    assert trail[0][0] == pytest.approx(2.0 * 0.4)
+
+
+@pytest.mark.asyncio
+async def test_get_particles_at_time_frustum(cluster, mock_db):
+    """Test that particles outside the camera frustum are culled and counted."""
+    row = {
+        "birth_time": 0.0, "y0": 10.0, "z0": 0.0,
+        "vx0": 0.0, "vy0": 0.0, "vz0": 0.0,
+        "size": 0.02, "texture_name": "WaterTexture", "seed": 42, "impact_time": None,
+    }
+    mock_db.fetch_all.side_effect = [
+        [{"gravity": 9.81, "water_level": 0.0}],
+        [{**row, "particle_id": 0, "x0": 0.0}, {**row, "particle_id": 1, "x0": 50.0}],
+    ]
+    frustum = CameraFrustum(location=(0.0, 10.0, -5.0), look_at=(0.0, 10.0, 0.0))
+    states = await cluster.get_particles_at_time(1, 0.1, frustum=frustum)
+    assert [s["particle_id"] for s in states] == [0]
+    assert (cluster.last_cull_stats.kept, cluster.last_cull_stats.culled) == (1, 1)
+
+
 @pytest.mark.asyncio
 async def test_get_particles_at_time_dead_particle(cluster, mock_db):
     """Test that dead particles (impact_time passed) are filtered out."""
@@ -314,6 +417,7 @@ async def test_get_particles_at_time_dead_particle(cluster, mock_db):
                 "vx0": 0.0, "vy0": 0.0, "vz0": 0.0,
                 "size": 0.02,
                 "texture_name": "WaterTexture",
+                "seed": 42,
                 "impact_time": 1.428,
             },
         ],
@@ -336,6 +440,7 @@ async def test_get_particles_at_time_not_born(cluster, mock_db):
                 "vx0": 0.0, "vy0": 0.0, "vz0": 0.0,
                 "size": 0.02,
                 "texture_name": "WaterTexture",
+                "seed": 42,
                 "impact_time": None,
             },
         ],
@@ -345,6 +450,313 @@ async def test_get_particles_at_time_not_born(cluster, mock_db):
     assert len(states) == 0
 
 
+@pytest.mark.asyncio
+async def test_get_births_array(cluster, mock_db):
+    """Test that birth rows are converted into columns with texture codes."""
+    mock_db.fetch_all.return_value = [
+        {
+            "particle_id": 0, "birth_time": 0.0,
+            "x0": 0.0, "y0": 10.0, "z0": 0.0,
+            "vx0": 0.0, "vy0": 0.0, "vz0": 0.0,
+            "size": 0.02, "texture_name": "WaterTexture", "seed": 42,
+            "impact_time": 1.428,
+        },
+        {
+            "particle_id": 1, "birth_time": 0.5,
+            "x0": 2.0, "y0": 10.0, "z0": 0.0,
+            "vx0": 0.0, "vy0": 1.0, "vz0": 0.0,
+            "size": 0.025, "texture_name": "Jade", "seed": 43,
+            "impact_time": None,
+        },
+    ]
+    births = await cluster.get_births_array(1)
+    assert births.particle_id.tolist() == [0, 1]
+    assert births.textures == ["WaterTexture", "Jade"]
+    assert births.texture_code.tolist() == [0, 1]
+    assert births.seed.tolist() == [42, 43]
+    assert births.impact_time[0] == 1.428
+    assert np.isnan(births.impact_time[1])
+
+
+@pytest.mark.asyncio
+async def test_load_stored_births_bundle(mock_db, tmp_path):
+    """Test that the first load writes a births bundle and later loads map it instead of querying."""
+    rows = [
+        {
+            "particle_id": 0, "birth_time": 0.0,
+            "x0": 0.0, "y0": 10.0, "z0": 0.0,
+            "vx0": 0.0, "vy0": 0.0, "vz0": 0.0,
+            "size": 0.02, "texture_name": "WaterTexture", "seed": 42,
+            "impact_time": 1.428,
+        },
+    ]
+    mock_db.fetch_all.return_value = rows
+    config = {"generation_mode": "stored", "births_count": 1}
+    first = ClusterManager(mock_db, births_bundle_dir=tmp_path)
+    births = await first.load_births(5, config)
+    assert (tmp_path / "job_5_n1" / "meta.json").exists()
+    assert isinstance(births.x0, np.memmap)
+    assert mock_db.fetch_all.await_count == 1
+
+    second = ClusterManager(mock_db, precision="float32", births_bundle_dir=tmp_path)
+    births = await second.load_births(5, config)
+    assert mock_db.fetch_all.await_count == 1
+    assert births.precision == "float32"
+    assert births.particle_id.tolist() == [0]
+    assert ClusterManager(mock_db).bundle_path(5, 1) is None
+
+
+@pytest.mark.asyncio
+async def test_load_stored_births_bundle_requires_complete_births(mock_db, tmp_path):
+    """Test that partial births write no bundle and a bundle of an older birth set is replaced."""
+    rows = [
+        {
+            "particle_id": i, "birth_time": 0.0,
+            "x0": 0.0, "y0": 10.0, "z0": 0.0,
+            "vx0": 0.0, "vy0": 0.0, "vz0": 0.0,
+            "size": 0.02, "texture_name": "WaterTexture", "seed": i,
+            "impact_time": 1.428,
+        }
+        for i in range(2)
+    ]
+    mock_db.fetch_all.return_value = rows[:1]
+    cluster = ClusterManager(mock_db, births_bundle_dir=tmp_path)
+    assert len(await cluster.load_births(5, {"generation_mode": "stored", "births_count": None})) == 1
+    assert not any(tmp_path.iterdir())
+
+    await cluster.load_births(5, {"generation_mode": "stored", "births_count": 1})
+    assert [p.name for p in tmp_path.iterdir()] == ["job_5_n1"]
+
+    # Births were appended: the count no longer matches the rows read
+    mock_db.fetch_all.return_value = rows
+    assert len(await cluster.load_births(5, {"generation_mode": "stored", "births_count": 3})) == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["job_5_n1"]
+
+    births = await cluster.load_births(5, {"generation_mode": "stored", "births_count": 2})
+    assert births.particle_id.tolist() == [0, 1]
+    assert [p.name for p in tmp_path.iterdir()] == ["job_5_n2"]
+
+
+@pytest.mark.asyncio
+async def test_iter_frame_states(cluster, mock_db):
+    """Test that many times are evaluated from a single births fetch."""
+    mock_db.fetch_all.side_effect = [
+        [{"gravity": 9.81, "water_level": 0.0}],
+        [
+            {
+                "particle_id": 0, "birth_time": 0.0,
+                "x0": 0.0, "y0": 10.0, "z0": 0.0,
+                "vx0": 0.0, "vy0": 0.0, "vz0": 0.0,
+                "size": 0.02, "texture_name": "WaterTexture", "seed": 42,
+                "impact_time": 1.428,
+            },
+        ],
+    ]
+    states = [s async for s in cluster.iter_frame_states(1, [0.5, 1.0, 2.0])]
+    assert mock_db.fetch_all.await_count == 2
+    assert [len(s) for s in states] == [1, 1, 0]
+    expected_y = 10.0 - 0.5 * 9.81 * 1.0
+    assert abs(states[1].position[0, 1] - expected_y) < 1e-9
+
+
+# ----------------------------------------------------------------------------
+# Procedural Job Tests
+# ----------------------------------------------------------------------------
+
+EMITTER = ConicalFountain(
+    num_particles=20,
+    apex_x=0, apex_y=1.5, apex_z=14,
+    cone_height=2, cone_angle_rad=0.5, base_radius=1.75,
+    speed_min=3, speed_max=8,
+    birth_start=0, birth_end=0.5,
+    size_min=0.01, size_max=0.03,
+    seed_offset=42,
+)
+
+
+def _emitter_row(checksum: str) -> dict:
+    return {
+        "emitter_index": 0, "emitter_type": "conical_fountain",
+        "first_particle_id": 0, "num_particles": EMITTER.num_particles,
+        "gravity": 9.81, "water_level": 0.0,
+        "params": json.dumps(dataclasses.asdict(EMITTER)), "checksum": checksum,
+    }
+
+
+@pytest.mark.asyncio
+async def test_insert_job_emitter(cluster, mock_db):
+    """Test that the emitter definition and checksum are stored as one row."""
+    with patch.object(cluster, "ensure_texture", new_callable=AsyncMock) as mock_ensure:
+        await cluster.insert_job_emitter(7, 0, EMITTER, 0, 9.81, 0.0, "abc")
+        mock_ensure.assert_awaited_once_with("WaterTexture")
+
+    insert = mock_db.execute_ir.call_args[0][0]
+    assert insert.table == "job_emitters"
+    assert insert.values["emitter_type"] == "conical_fountain"
+    assert insert.values["num_particles"] == 20
+    assert insert.values["checksum"] == "abc"
+    assert ConicalFountain(**json.loads(insert.values["params"])) == EMITTER
+
+
+@pytest.mark.asyncio
+async def test_procedural_job_regenerates_births(cluster, mock_db):
+    """Test that procedural jobs regenerate births once and never read particle_births."""
+    sim = FountainSimulator(gravity=9.81, water_level=0.0)
+    sim.add_emitter(EMITTER)
+    mock_db.fetch_all.side_effect = [
+        [{"gravity": 9.81, "water_level": 0.0, "generation_mode": "procedural", "births_count": 20}],
+        [_emitter_row(BirthsChecksum.of(sim.births))],
+        [{"gravity": 9.81, "water_level": 0.0, "generation_mode": "procedural", "births_count": 20}],
+    ]
+    first = await cluster.get_particles_at_time(7, 0.4)
+    second = await cluster.get_particles_at_time(7, 0.4)
+    by_id = sorted(first, key=lambda p: p["particle_id"])
+    assert first == second
+    assert by_id == sim.evaluate_at_time_arrays(0.4).to_states()
+    assert mock_db.fetch_all.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_sequential_frames_advance_one_sweep(cluster, mock_db):
+    """Test that in-memory frames in time order reuse one sweep over the job's births."""
+    sim = FountainSimulator(gravity=9.81, water_level=0.0)
+    sim.add_emitter(EMITTER)
+    config = {"gravity": 9.81, "water_level": 0.0, "generation_mode": "procedural", "births_count": 20}
+    mock_db.fetch_all.side_effect = [[config], [_emitter_row(BirthsChecksum.of(sim.births))]] + [[config]] * 9
+    for frame in range(10):
+        t = frame / 20
+        states = await cluster.get_particles_at_time(7, t)
+        expected = sim.evaluate_at_time_arrays(t).to_states()
+        assert sorted(states, key=lambda p: p["particle_id"]) == expected
+    sweep = cluster._sweep[1]
+    assert sweep.resets == 1
+    assert sweep.births_applied > 0
+
+    cluster.invalidate_births(7)
+    assert cluster._sweep is None
+
+
+@pytest.mark.asyncio
+async def test_procedural_job_checksum_mismatch(cluster, mock_db):
+    """Test that births that do not reproduce the stored checksum are rejected."""
+    mock_db.fetch_all.return_value = [_emitter_row("0" * 64)]
+    with pytest.raises(RuntimeError, match="checksum"):
+        await cluster.regenerate_births(7)
+
+
+# ----------------------------------------------------------------------------
+# Simulation Metrics Tests
+# ----------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_upsert_simulation_metrics_batches(cluster, mock_db):
+    """Test that metric rows are upserted in multi-row batches."""
+    rows = [{"time": 0.1 * i, "particle_count": i, "total_energy": 1.0} for i in range(5)]
+    await cluster.upsert_simulation_metrics(3, rows, batch_size=2)
+
+    assert mock_db.execute_raw.await_count == 3
+    sql, params = mock_db.execute_raw.call_args_list[0][0]
+    assert sql.startswith("INSERT INTO simulation_metrics (job_id, time, particle_count, total_energy)")
+    assert "ON DUPLICATE KEY UPDATE particle_count = VALUES(particle_count)" in sql
+    assert params == (3, 0.0, 0, 1.0, 3, 0.1, 1, 1.0)
+    assert len(mock_db.execute_raw.call_args_list[2][0][1]) == 4
+
+
+@pytest.mark.asyncio
+async def test_store_job_timeline(cluster, mock_db):
+    """Test that a job's frames get analytic rows without evaluating frames."""
+    births = ParticleBirthArray.from_births([
+        ParticleBirth(
+            particle_id=0, birth_time=0.0,
+            x0=0, y0=10, z0=0, vx0=1, vy0=0, vz0=0,
+            size=0.5, texture="WaterTexture", seed=0, impact_time=0.15,
+        ),
+    ])
+    mock_db.fetch_all.side_effect = [
+        [{"gravity": 10.0, "water_level": 0.0}],
+        [{"fps": 10, "total_frames": 2}],
+    ]
+    timeline = await cluster.store_job_timeline(3, births)
+
+    assert timeline.alive_count.tolist() == [1, 0]
+    # KE = 0.5 m (vx^2 + (g t)^2) at t = 0.1
+    assert timeline.kinetic_energy[0] == pytest.approx(0.5 * 0.5 * (1.0 + 1.0))
+    mock_db.execute_raw.assert_awaited_once()
+    params = mock_db.execute_raw.call_args[0][1]
+    assert params[:3] == (3, 0.1, 1)
+
+
+
+@pytest.mark.asyncio
+async def test_store_job_metrics(cluster, mock_db):
+    """Test that every frame gets a full metrics row, upserted in batches."""
+    births = ParticleBirthArray.from_births([
+        ParticleBirth(
+            particle_id=0, birth_time=0.0,
+            x0=0, y0=10, z0=0, vx0=1, vy0=0, vz0=0,
+            size=0.5, texture="WaterTexture", seed=0, impact_time=0.25,
+        ),
+    ])
+    mock_db.fetch_all.side_effect = [
+        [{"gravity": 10.0, "water_level": 0.0}],
+        [{"fps": 10, "total_frames": 3}],
+    ]
+    rows = await cluster.store_job_metrics(3, births, batch_size=2)
+
+    assert [r["particle_count"] for r in rows] == [1, 1, 0]
+    assert rows[0]["min_x"] == pytest.approx(0.1)
+    assert rows[0]["max_y"] == pytest.approx(10 - 0.5 * 10 * 0.01)
+    assert rows[0]["max_velocity"] == pytest.approx(np.sqrt(2.0))
+    # Empty frames have no bounds
+    assert rows[2]["min_x"] is None
+    assert rows[2]["total_energy"] == 0.0
+    assert mock_db.execute_raw.await_count == 2
+    sql, params = mock_db.execute_raw.call_args_list[0][0]
+    assert sql.startswith("INSERT INTO simulation_metrics (job_id, time, particle_count, min_x")
+    assert len(params) == 2 * (2 + 17)
+
+@pytest.mark.asyncio
+async def test_detect_job_anomalies(cluster, mock_db):
+    """Test that the stored metrics series is fetched in time order and scored."""
+    rows = [{"time": 0.1 * i, "particle_count": 100, "total_energy": 50.0 + 0.1 * i} for i in range(40)]
+    rows[20]["total_energy"] = 500.0
+    mock_db.fetch_all.return_value = rows
+    results = await cluster.detect_job_anomalies(3)
+
+    sql, params = mock_db.fetch_all.call_args[0]
+    assert "ORDER BY time" in sql
+    assert params == (3,)
+    assert results["energy_mad"].indices.tolist() == [20]
+    assert len(results["count_jump"]) == 0
+
+
+@pytest.mark.asyncio
+async def test_validate_job_births_records_verdict(cluster, mock_db):
+    """Test that a job's births are validated once and the verdict stored on the job."""
+    births = ParticleBirthArray.from_births([
+        ParticleBirth(
+            particle_id=0, birth_time=0.0,
+            x0=0, y0=10, z0=0, vx0=1, vy0=0, vz0=0,
+            size=0.5, texture="WaterTexture", seed=0, impact_time=np.sqrt(2.0),
+        ),
+    ])
+    mock_db.fetch_all.return_value = [{"gravity": 10.0, "water_level": 0.0}]
+    cluster.load_births = AsyncMock(return_value=births)
+
+    assert await cluster.validate_job_births(3) == (True, [])
+    update = mock_db.execute_ir.call_args[0][0]
+    assert update.table == "render_jobs"
+    assert update.set_values == {"births_validation": "valid"}
+
+    births.impact_time[0] = 1.0
+    valid, errors = await cluster.validate_job_births(3)
+    assert not valid
+    assert errors[0]["particle_id"] == 0
+    assert mock_db.execute_ir.call_args[0][0].set_values == {"births_validation": "invalid"}
+
+    with pytest.raises(ValueError):
+        await cluster.set_births_validation(3, "maybe")
+
 # ----------------------------------------------------------------------------
 # Frame Cache Tests
 # ----------------------------------------------------------------------------
@@ -361,6 +773,34 @@ async def test_cache_frame_particles(cluster, mock_db):
     assert json.loads(args[2]) == particles
 
 
+@pytest.mark.asyncio
+async def test_float32_precision_births_and_frame_cache(mock_db):
+    """A float32 manager loads float32 state columns and caches shortest float32 floats."""
+    cluster = ClusterManager(mock_db, precision="float32")
+    mock_db.fetch_all.return_value = [
+        {
+            "particle_id": 0, "birth_time": 0.1,
+            "x0": 0.1, "y0": 10.0, "z0": 0.0,
+            "vx0": 0.0, "vy0": 0.0, "vz0": 0.0,
+            "size": 0.02, "texture_name": "WaterTexture", "seed": 42,
+            "impact_time": None,
+        },
+    ]
+    births = await cluster.get_births_array(1)
+    assert births.precision == "float32"
+    assert births.birth_time.dtype == np.float64
+    assert births.birth_time[0] == 0.1
+
+    particles = [{"particle_id": 1, "position_x": float(births.x0[0]), "size": float(births.size[0])}]
+    assert particles[0]["position_x"] != 0.1
+    await cluster.cache_frame_particles(1, 10, particles)
+    data_json = mock_db.execute_raw.call_args[0][1][2]
+    assert json.loads(data_json) == [{"particle_id": 1, "position_x": 0.1, "size": 0.02}]
+
+    with pytest.raises(ValueError):
+        ClusterManager(mock_db, precision="half")
+
+
 @pytest.mark.asyncio
 async def test_get_cached_frame(cluster, mock_db):
     """Test retrieving cached frame data."""
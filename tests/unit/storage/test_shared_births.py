@@ -0,0 +1,145 @@
+# tests/unit/storage/test_shared_births.py
+"""Tests for the node-local shared-memory births cache."""
+
+import os
+import subprocess
+import sys
+import uuid
+from multiprocessing.shared_memory import SharedMemory
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+
+from sim.particles import ParticleBirthArray
+from storage.cluster import ClusterManager
+from storage.shared_births import SharedBirthsCache
+
+
+@pytest.fixture
+def prefix():
+    """Unique segment prefix so tests never see each other's segments."""
+    return f"psim_test_{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def births(make_fountain):
+    """A few hundred births with an immortal particle and two textures."""
+    births = make_fountain(num_particles=300).births
+    births.textures = ["WaterTexture", "Jade"]
+    births.texture_code[::2] = 1
+    births.impact_time[0] = np.nan
+    return births
+
+
+def _segment_exists(name: str) -> bool:
+    try:
+        SharedMemory(name=name, track=False).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def test_publish_and_map_from_another_worker(prefix, births, tmp_path):
+    """A second cache maps the published births read-only; the last release unlinks."""
+    lock = str(tmp_path / "births.lock")
+    publisher = SharedBirthsCache(prefix, lock)
+    worker = SharedBirthsCache(prefix, lock)
+    assert worker.get(7, len(births)) is None
+
+    published = publisher.publish(7, births)
+    mapped = worker.get(7, len(births))
+    assert mapped.textures == ["WaterTexture", "Jade"]
+    for name in ParticleBirthArray.COLUMNS:
+        np.testing.assert_array_equal(getattr(mapped, name), getattr(births, name))
+        assert getattr(mapped, name).dtype == getattr(births, name).dtype
+    assert not mapped.x0.flags.writeable
+    assert worker.get(7, len(births)) is mapped
+
+    # Publishing the same births again maps the first publisher's segment
+    late = SharedBirthsCache(prefix, lock)
+    assert late.get(7, len(births) + 1) is None  # no segment of that birth set yet
+    changed = births.take(slice(None))
+    changed.x0 = np.zeros_like(births.x0)
+    np.testing.assert_array_equal(late.publish(7, changed).x0, births.x0)
+
+    del published, mapped, changed
+    name = publisher.segment_name(7, len(births))
+    publisher.release(7)
+    late.close()
+    assert _segment_exists(name)
+    worker.release(7)
+    assert not _segment_exists(name)
+    assert worker.job_ids == []
+
+
+@pytest.mark.asyncio
+async def test_cluster_managers_share_births(prefix, births, tmp_path):
+    """Only the first manager on the node fetches births; moving on releases them."""
+    lock = str(tmp_path / "births.lock")
+    rows = [
+        {
+            "particle_id": int(births.particle_id[i]), "birth_time": float(births.birth_time[i]),
+            "x0": float(births.x0[i]), "y0": float(births.y0[i]), "z0": float(births.z0[i]),
+            "vx0": float(births.vx0[i]), "vy0": float(births.vy0[i]), "vz0": float(births.vz0[i]),
+            "size": float(births.size[i]), "texture_name": births.textures[births.texture_code[i]],
+            "seed": int(births.seed[i]),
+            "impact_time": None if np.isnan(births.impact_time[i]) else float(births.impact_time[i]),
+        }
+        for i in range(len(births))
+    ]
+    config = [{"gravity": 9.81, "water_level": 0.0, "births_count": len(births)}]
+    managers = []
+    for _ in range(2):
+        db = Mock()
+        db.fetch_all = AsyncMock(side_effect=lambda sql, params=None: config if "gravity" in sql else rows)
+        managers.append(ClusterManager(db, shared_births=SharedBirthsCache(prefix, lock)))
+
+    first = await managers[0].get_particles_at_time(3, 0.5)
+    second = await managers[1].get_particles_at_time(3, 0.5)
+    assert first == second
+    assert managers[0].db.fetch_all.await_count == 2
+    assert managers[1].db.fetch_all.await_count == 1  # job config only
+
+    for manager in managers:
+        await manager.load_births(4, {"gravity": 9.81, "water_level": 0.0, "births_count": len(births)})
+        assert manager.shared_births.job_ids == [4]
+    assert not _segment_exists(managers[0].shared_births.segment_name(3, len(births)))
+
+    # Births still being written are never published
+    await managers[0].load_births(5, {"gravity": 9.81, "water_level": 0.0, "births_count": None})
+    assert managers[0].shared_births.job_ids == []
+    assert not _segment_exists(managers[0].shared_births.segment_name(5, len(births)))
+    for manager in managers:
+        manager.shared_births.close()
+
+
+def test_remove_orphans_of_dead_holders(prefix, births, tmp_path):
+    """Segments held only by processes that died are unlinked; live segments stay."""
+    lock = str(tmp_path / "births.lock")
+    crashed = (
+        "import os\n"
+        "from sim.particles import ParticleBirthArray\n"
+        "from storage.shared_births import SharedBirthsCache\n"
+        f"cache = SharedBirthsCache({prefix!r}, {lock!r})\n"
+        "cache.publish(1, ParticleBirthArray.empty())\n"
+        "cache.publish(2, ParticleBirthArray.empty())\n"
+        "os._exit(0)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    subprocess.run([sys.executable, "-c", crashed], env=env, check=True)
+    cache = SharedBirthsCache(prefix, lock)
+    names = [cache.segment_name(job_id, 0) for job_id in (1, 2)]
+    assert all(_segment_exists(name) for name in names)
+
+    # The last live holder unlinks a segment despite the dead holder
+    assert len(cache.get(2, 0)) == 0
+    cache.release(2)
+    assert not _segment_exists(names[1])
+
+    live = cache.publish(3, births)
+    assert cache.remove_orphans() == [names[0]]
+    assert not _segment_exists(names[0])
+    assert _segment_exists(cache.segment_name(3, len(births)))
+    del live
+    cache.close()
@@ -6,6 +6,8 @@ from unittest.mock import AsyncMock, Mock, patch
 import pytest
 
 from generator import main  # import async main
+from sim.particles import ParticleBirthArray
+from sim.timeline import Timeline, frame_times
 
 
 @pytest.mark.asyncio
@@ -43,15 +45,19 @@ async def test_generator_main_flow():
             mock_cluster = AsyncMock()
             mock_cluster.ensure_preset = AsyncMock(return_value=99)
             mock_cluster.create_job = AsyncMock(return_value=42)
-            mock_cluster.insert_frames = AsyncMock()
-            mock_cluster.insert_particle_births = AsyncMock()
+            calls = []
+            mock_cluster.insert_frames = AsyncMock(side_effect=lambda *a: calls.append("frames"))
+            mock_cluster.insert_particle_births = AsyncMock(side_effect=lambda *a: calls.append("births"))
+            mock_cluster.complete_births = AsyncMock(side_effect=lambda *a: calls.append("complete"))
             mock_cluster.update_job_status = AsyncMock()
             mock_cluster.get_particles_at_time = AsyncMock(return_value=[])
+            mock_cluster.store_job_timeline = AsyncMock(return_value=Timeline.zeros(frame_times(5, 30)))
             mock_cls.return_value = mock_cluster
 
             with patch("generator.FountainSimulator") as mock_sim_cls:
                 mock_sim = Mock()
                 mock_sim.particles = [Mock()]
+                mock_sim.births = [Mock()]
                 mock_sim.add_conical_fountain = Mock()
                 mock_sim_cls.return_value = mock_sim
 
@@ -75,10 +81,77 @@ async def test_generator_main_flow():
                     gravity=9.81,
                     water_level=0.0,
                     preset_id=99,
+                    generation_mode="stored",
+                    lod_mode="off",
+                    lod_min_pixels=0.5,
                 )
 
                 mock_cluster.insert_frames.assert_awaited_once()
                 mock_cluster.insert_particle_births.assert_awaited_once()
+                # Render nodes only see frames once the births are complete
+                assert calls == ["births", "complete", "frames"]
                 mock_cluster.update_job_status.assert_awaited_with(42, "pending")
                 mock_db.initialize.assert_awaited_once()
                 mock_db.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_generator_procedural_mode():
+    """Test that procedural jobs store the emitter definition instead of births."""
+    with patch.dict("os.environ", {
+        "DB_BACKEND": "sqlite",
+        "NUM_PARTICLES": "50",
+        "NUM_FRAMES": "5",
+        "FPS": "30",
+        "RUN_VALIDATION": "true",
+        "GENERATION_MODE": "procedural",
+        "CHUNK_SIZE": "20",
+        "GEN_WORKERS": "1",
+    }), patch("generator.create_database_provider") as mock_create:
+        mock_create.return_value = AsyncMock()
+
+        with patch("generator.ClusterManager") as mock_cls:
+            mock_cluster = AsyncMock()
+            mock_cluster.create_job = AsyncMock(return_value=42)
+            mock_cls.return_value = mock_cluster
+
+            await main()
+
+            assert mock_cluster.create_job.call_args.kwargs["generation_mode"] == "procedural"
+            mock_cluster.insert_particle_births.assert_not_awaited()
+            mock_cluster.insert_job_emitter.assert_awaited_once()
+            job_id, index, emitter, first_id, *_, checksum = mock_cluster.insert_job_emitter.call_args.args
+            assert (job_id, index, first_id) == (42, 0, 0)
+            assert emitter.num_particles == 50
+            assert len(checksum) == 64
+
+            mock_cluster.upsert_simulation_metrics.assert_awaited_once()
+            rows = mock_cluster.upsert_simulation_metrics.call_args.args[1]
+            assert len(rows) == 5
+            assert rows[0]["particle_count"] > 0
+
+
+@pytest.mark.asyncio
+async def test_generator_inserts_columnar_births():
+    """Test that stored jobs pass the simulator's columnar births to the insert."""
+    with patch.dict("os.environ", {
+        "DB_BACKEND": "sqlite",
+        "NUM_PARTICLES": "30",
+        "NUM_FRAMES": "5",
+        "FPS": "30",
+        "RUN_VALIDATION": "false",
+    }), patch("generator.create_database_provider") as mock_create:
+        mock_create.return_value = AsyncMock()
+
+        with patch("generator.ClusterManager") as mock_cls:
+            mock_cluster = AsyncMock()
+            mock_cluster.create_job = AsyncMock(return_value=42)
+            mock_cluster.store_job_timeline = AsyncMock(return_value=Timeline.zeros(frame_times(5, 30)))
+            mock_cls.return_value = mock_cluster
+
+            await main()
+
+            job_id, births = mock_cluster.insert_particle_births.call_args.args
+            assert job_id == 42
+            assert isinstance(births, ParticleBirthArray)
+            assert len(births) == 30
@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from lib.camera import POV_DEFAULT_ASPECT
 from render import detect_povray_path, render_loop, run_povray
 
 
@@ -122,3 +123,79 @@ async def test_render_loop_with_job_filter(tmp_path):
             await asyncio.wait_for(render_loop(mock_cluster, template, poll_interval=0.01, job_id=10), timeout=0.5)
         assert mock_cluster.db.fetch_all.call_count >= 1
         mock_run.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_render_frame_with_frustum_culling(tmp_path):
+    """Test that CULL_FRUSTUM culls with the camera the scene is rendered with."""
+    mock_cluster = AsyncMock()
+    mock_cluster.db.fetch_all = AsyncMock(side_effect=[[{'frame_id': 1, 'job_id': 10}], [{'fps': 30, 'width': 1600, 'height': 900, 'quality': 11, 'antialias': 'off', 'antialias_depth': 5}], [{'job_name': 'test_job'}]])
+    mock_cluster.get_particles_at_time = AsyncMock(return_value=[])
+    mock_cluster.get_preset_for_job = AsyncMock(return_value=None)
+    mock_cluster.last_cull_stats = Mock(kept=3, culled=7)
+    template = tmp_path / 'template.pov'
+    template.write_text('//PARTICLE_SYSTEM')
+    with patch.dict('os.environ', {'CULL_FRUSTUM': 'true', 'CAMERA_ANGLE': '50'}), patch('render.build_scene') as mock_build_scene, patch('render.write_pov_file'), patch('render.run_povray', new_callable=AsyncMock) as mock_run:
+        mock_run.return_value = 0
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(render_loop(mock_cluster, template, poll_interval=0.01, job_id=10), timeout=0.5)
+        frustum = mock_cluster.get_particles_at_time.call_args.kwargs['frustum']
+        assert frustum.angle == 50.0
+        assert frustum.aspect == POV_DEFAULT_ASPECT
+        scene_kwargs = mock_build_scene.call_args.kwargs
+        assert scene_kwargs['camera_angle'] == frustum.angle
+        assert 'aspect_ratio' not in scene_kwargs
+
+@pytest.mark.asyncio
+async def test_render_frame_applies_job_lod(tmp_path):
+    """Test that the job's LOD setting thins particles before the scene is built."""
+    near = {'particle_id': 0, 'position_x': 0.0, 'position_y': 2.5, 'position_z': 2.0, 'velocity_x': 0.0, 'velocity_y': 0.0, 'velocity_z': 0.0, 'size': 0.05, 'texture_name': 'WaterTexture'}
+    far = {**near, 'particle_id': 1, 'position_z': 500.0, 'size': 0.001}
+    mock_cluster = AsyncMock()
+    mock_cluster.db.fetch_all = AsyncMock(side_effect=[[{'frame_id': 1, 'job_id': 10}], [{'fps': 30, 'width': 640, 'height': 480, 'quality': 11, 'antialias': 'off', 'antialias_depth': 5, 'lod_mode': 'drop', 'lod_min_pixels': 0.5}], [{'job_name': 'test_job'}]])
+    mock_cluster.get_particles_at_time = AsyncMock(return_value=[near, far])
+    mock_cluster.get_preset_for_job = AsyncMock(return_value=None)
+    template = tmp_path / 'template.pov'
+    template.write_text('//PARTICLE_SYSTEM')
+    with patch('render.build_scene') as mock_build_scene, patch('render.write_pov_file'), patch('render.run_povray', new_callable=AsyncMock) as mock_run:
+        mock_run.return_value = 0
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(render_loop(mock_cluster, template, poll_interval=0.01, job_id=10), timeout=0.5)
+        mock_cluster.get_particles_at_time.assert_awaited_once_with(10, 1 / 30)
+        scene_kwargs = mock_build_scene.call_args.kwargs
+        assert [p['particle_id'] for p in scene_kwargs['particles']] == [0]
+        # LOD does not pin the scene camera
+        assert 'camera_angle' not in scene_kwargs and 'aspect_ratio' not in scene_kwargs
+
+@pytest.mark.asyncio
+async def test_render_frame_with_motion_blur(tmp_path):
+    """Test that MOTION_BLUR requests sub-frame trails over the shutter and draws them."""
+    mock_cluster = AsyncMock()
+    mock_cluster.db.fetch_all = AsyncMock(side_effect=[[{'frame_id': 1, 'job_id': 10}], [{'fps': 50, 'width': 640, 'height': 480, 'quality': 11, 'antialias': 'off', 'antialias_depth': 5}], [{'job_name': 'test_job'}]])
+    mock_cluster.get_particles_at_time = AsyncMock(return_value=[])
+    mock_cluster.get_preset_for_job = AsyncMock(return_value=None)
+    template = tmp_path / 'template.pov'
+    template.write_text('//PARTICLE_SYSTEM')
+    with patch.dict('os.environ', {'MOTION_BLUR': 'sweep', 'SHUTTER': '0.5', 'MOTION_BLUR_SAMPLES': '6'}), patch('render.build_scene') as mock_build_scene, patch('render.write_pov_file'), patch('render.run_povray', new_callable=AsyncMock) as mock_run:
+        mock_run.return_value = 0
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(render_loop(mock_cluster, template, poll_interval=0.01, job_id=10), timeout=0.5)
+        mock_cluster.get_particles_at_time.assert_awaited_once_with(10, 1 / 50, shutter=0.01, samples=6)
+        assert mock_build_scene.call_args.kwargs['motion_blur'] == 'sweep'
+
+@pytest.mark.asyncio
+async def test_render_frame_skips_validation_for_validated_job(tmp_path):
+    """Test that per-frame validation runs only for jobs whose births are not validated."""
+    particle = {'particle_id': 0, 'position_x': 0.0, 'position_y': 2.5, 'position_z': 2.0, 'velocity_x': 0.0, 'velocity_y': 0.0, 'velocity_z': 0.0, 'size': 0.05, 'texture_name': 'WaterTexture'}
+    for verdict, validations in (('valid', 0), ('unchecked', 1)):
+        mock_cluster = AsyncMock()
+        mock_cluster.db.fetch_all = AsyncMock(side_effect=[[{'frame_id': 1, 'job_id': 10}], [{'fps': 30, 'width': 640, 'height': 480, 'quality': 11, 'antialias': 'off', 'antialias_depth': 5, 'births_validation': verdict}], [{'job_name': 'test_job'}]])
+        mock_cluster.get_particles_at_time = AsyncMock(return_value=[particle])
+        mock_cluster.get_preset_for_job = AsyncMock(return_value=None)
+        template = tmp_path / 'template.pov'
+        template.write_text('//PARTICLE_SYSTEM')
+        with patch('render.PhysicsValidator') as mock_validator_cls, patch('render.build_scene'), patch('render.write_pov_file'), patch('render.run_povray', new_callable=AsyncMock) as mock_run:
+            mock_validator_cls.return_value.validate_frame.return_value = (True, [])
+            mock_run.return_value = 0
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(render_loop(mock_cluster, template, poll_interval=0.01, job_id=10), timeout=0.5)
+            assert mock_validator_cls.return_value.validate_frame.call_count == validations